@@ -1,197 +1,183 @@
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, g, jsonify, request, send_from_directory
 import pandas as pd
 from flask_cors import CORS
 import io
 import sys
+import time
+from urllib.parse import urlencode
+
+import metrics
 
 app = Flask(__name__)
 CORS(app)
 
-@app.route('/api/elo', methods=['GET'])
-def elo_table():
-    """Vraća trenutne ELO ratinge timova"""
-    df = pd.read_csv('current_elo.csv')
-    elo_dict = df.set_index(df.columns[0]).to_dict(orient='index')
-    return jsonify(elo_dict)
+# ---- METRICS ----
+def _route_label():
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
 
-@app.route('/api/simulation-text', methods=['GET'])
-def simulation_text():
-    """Vraća strukturirani JSON s rezultatima simulacije lige"""
-    from runELO import (
-        teams, fixtures, initial_points, k, num_simulations,
-        run_multiple_simulations, simulate_league, generate_second_phase_fixtures,
-        print_results,
-    )
+@app.before_request
+def _start_request_timer():
+    g.metrics_start = time.perf_counter()
+    metrics.inc('elo_http_requests_in_flight', route=_route_label())
+
+@app.after_request
+def _record_status(response):
+    # after_request kuke idu obrnutim redom: _return_profile već je zapisao izvorni status
+    g.setdefault('metrics_status', response.status_code)
+    return response
 
-    # --- PRVA FAZA - Monte Carlo simulacija ---
-    position_probs, avg_points_dict, qual_top8_dict, qual_top24_dict = run_multiple_simulations(
-        teams, fixtures, initial_points, num_simulations=num_simulations, k=k
+@app.teardown_request
+def _record_request_latency(exc):
+    # teardown se poziva i kad view baci iznimku, pa se in-flight uvijek smanji
+    if 'metrics_start' not in g:
+        return
+    route = _route_label()
+    metrics.inc('elo_http_requests_in_flight', -1, route=route)
+    metrics.observe(
+        'elo_http_request_duration_seconds', time.perf_counter() - g.metrics_start,
+        route=route, method=request.method, status=str(g.get('metrics_status', 500)),
     )
-    
-    sorted_avg = sorted(avg_points_dict.items(), key=lambda x: x[1], reverse=True)
-    liga_prvaka = [t for t, _ in sorted_avg[:6]]
-    liga_ostanak = [t for t, _ in sorted_avg[6:]]
 
-    # ✅ ISPRAVKA: Računaj prosjek bodova i ELO-a nakon prve faze
-    # Simuliraj prvu fazu više puta da dobiješ reprezentativne početne uvjete za drugu fazu
-    total_points_after_phase1 = {team: 0 for team in teams}
-    total_elos_after_phase1 = {team: 0 for team in teams}
-    
-    phase1_simulations = 500  # Optimalno između brzine i preciznosti
-    
-    for _ in range(phase1_simulations):
-        pts_temp, elos_temp = simulate_league(teams, fixtures, initial_points, k)
-        for team in teams:
-            total_points_after_phase1[team] += pts_temp[team]
-            total_elos_after_phase1[team] += elos_temp[team]
-    
-    # Izračunaj prosjek nakon prve faze
-    avg_points_after_phase1 = {team: total_points_after_phase1[team] / phase1_simulations for team in teams}
-    avg_elos_after_phase1 = {team: total_elos_after_phase1[team] / phase1_simulations for team in teams}
+# ---- PROFILING ----
+# Profiliranje se uključuje po zahtjevu (X-Profile ili ?profile= uz admin token);
+# bez toga je cijeli trošak jedna provjera zaglavlja
+@app.before_request
+def _start_profiler():
+    fmt = request.headers.get('X-Profile') or request.args.get('profile')
+    if not fmt:
+        return None
 
-    # --- DRUGA FAZA: Liga za prvaka ---
-    fix_prvaka = generate_second_phase_fixtures(liga_prvaka)
-    teams_prv = {t: avg_elos_after_phase1[t] for t in liga_prvaka}  # ✅ Koristi prosjek ELO
-    pts_prv = {t: avg_points_after_phase1[t] for t in liga_prvaka}  # ✅ Koristi prosjek bodova
+    import profiling
+    if not profiling.authorized(request):
+        return jsonify({'error': 'Profiliranje zahtijeva ispravan admin token'}), 403
+    if fmt not in profiling.FORMATS:
+        return jsonify({'error': f'Nepoznat format profila: {fmt} (dostupno: {", ".join(profiling.FORMATS)})'}), 400
+    g.profile_format = fmt
+    g.profiler = profiling.StackSampler().start()
 
-    # --- DRUGA FAZA: Liga za ostanak ---
-    fix_ostanak = generate_second_phase_fixtures(liga_ostanak)
-    teams_ost = {t: avg_elos_after_phase1[t] for t in liga_ostanak}  # ✅ Koristi prosjek ELO
-    pts_ost = {t: avg_points_after_phase1[t] for t in liga_ostanak}  # ✅ Koristi prosjek bodova
+@app.after_request
+def _return_profile(response):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
 
-    # Simuliraj druge faze
-    pts_prv_final, elos_prv_final = simulate_league(teams_prv, fix_prvaka, pts_prv, k)
-    prob_prv, avg_prv, qual_top8_prv, qual_top24_prv = run_multiple_simulations(
-        teams_prv, fix_prvaka, pts_prv, num_simulations=num_simulations, k=k
-    )
-    
-    pts_ost_final, elos_ost_final = simulate_league(teams_ost, fix_ostanak, pts_ost, k)
-    prob_ost, avg_ost, qual_top8_ost, qual_top24_ost = run_multiple_simulations(
-        teams_ost, fix_ostanak, pts_ost, num_simulations=num_simulations, k=k
-    )
+    profiler.stop()
+    # Status i ime profila iz izvornog odgovora i zahtjeva (bez tokena i parametra profila)
+    g.metrics_status = response.status_code
+    query = urlencode([(key, value) for key, value in request.args.items(multi=True) if key not in ('token', 'profile')])
+    name = f"{request.method} {request.path}" + (f"?{query}" if query else '')
+    if g.profile_format == 'speedscope':
+        profiled = jsonify(profiler.speedscope(name))
+    else:
+        profiled = Response(profiler.collapsed(), mimetype='text/plain; charset=utf-8')
+    profiled.headers['X-Profiled-Status'] = str(response.status_code)
+    profiled.headers['X-Profile-Duration'] = f"{profiler.duration:.6f}"
+    return profiled
 
-    # --- FORMATIRANJE REZULTATA U STRUKTURIRANI JSON ---
-    
-    # Prva faza - bodovi timova
-    phase1_teams = []
-    for team, points in sorted_avg:
-        phase1_teams.append({
-            "team": team,
-            "projected_points": round(points, 2)
-        })
+@app.teardown_request
+def _stop_profiler(exc):
+    # Ako view baci iznimku, after_request se ne poziva, ali sampler se mora zaustaviti
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.stop()
 
-    # Liga za prvaka
-    liga_prvaka_results = []
-    sorted_prv = sorted(pts_prv_final.items(), key=lambda x: x[1], reverse=True)
-    for position, (team, _) in enumerate(sorted_prv, 1):
-        avg_pts = avg_prv[team]
-        probs = prob_prv[team][:6]
-        liga_prvaka_results.append({
-            "position": position,
-            "team": team,
-            "projected_points": round(avg_pts, 2),
-            "starting_points_phase2": round(pts_prv[team], 2),  # ✅ Dodano za debug
-            "position_probabilities": {
-                "1st": round(probs[0], 2),
-                "2nd": round(probs[1], 2),
-                "3rd": round(probs[2], 2),
-                "4th": round(probs[3], 2),
-                "5th": round(probs[4], 2),
-                "6th": round(probs[5], 2)
-            }
-        })
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Metrike API-ja i simulacija u Prometheus tekstualnom formatu"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
 
-    # Liga za ostanak
-    liga_ostanak_results = []
-    sorted_ost = sorted(pts_ost_final.items(), key=lambda x: x[1], reverse=True)
-    for position, (team, _) in enumerate(sorted_ost, 1):
-        avg_pts = avg_ost[team]
-        probs = prob_ost[team][:6]
-        liga_ostanak_results.append({
-            "position": position,
-            "team": team,
-            "projected_points": round(avg_pts, 2),
-            "starting_points_phase2": round(pts_ost[team], 2),  # ✅ Dodano za debug
-            "position_probabilities": {
-                "1st": round(probs[0], 2),
-                "2nd": round(probs[1], 2),
-                "3rd": round(probs[2], 2),
-                "4th": round(probs[3], 2),
-                "5th": round(probs[4], 2),
-                "6th": round(probs[5], 2)
-            }
-        })
+def league_from_request():
+    """Liga iz ?league= (zadana liga ako nije zadana). Vraća (liga, None) ili (None, odgovor s greškom)."""
+    from leagues import load_league, DEFAULT_LEAGUE
 
-    # Opća statistika (iz prve faze)
-    overall_stats = []
-    for team, avg_points in sorted_avg:
-        team_probs = position_probs[team]
-        champion_prob = team_probs[0] if len(team_probs) > 0 else 0
-        top6_prob = sum(team_probs[:6]) if len(team_probs) >= 6 else sum(team_probs)
-        
-        overall_stats.append({
-            "team": team,
-            "projected_points": round(avg_points, 2),
-            "champion_probability": round(champion_prob, 2),
-            "top6_probability": round(top6_prob, 2),
-            "all_position_probabilities": [round(p, 2) for p in team_probs[:12]]
-        })
+    league_id = request.args.get('league', DEFAULT_LEAGUE)
+    try:
+        return load_league(league_id), None
+    except KeyError:
+        return None, (jsonify({'error': f'Liga {league_id} ne postoji'}), 404)
 
-    # Finalni strukturirani JSON
-    result = {
-        "simulation_summary": {
-            "total_simulations": num_simulations,
-            "k_factor": k,
-            "phase1_simulations_for_avg": phase1_simulations,
-            "phase_structure": {
-                "phase1": "Svi timovi igraju međusobno (22 kola)",
-                "phase2_champions": "Top 6 timova se bore za prvaka (dodatnih 5 kola)",
-                "phase2_relegation": "Bottom 6 timova se bore protiv ispadanja (dodatnih 5 kola)"
-            }
-        },
-        "phase1_results": {
-            "description": "Projekcije bodova nakon prve faze (22 kola)",
-            "teams": phase1_teams
-        },
-        "champions_league": {
-            "description": "Liga za prvaka (Top 6 timova - ukupno 27 kola)",
-            "teams": liga_prvaka_results
-        },
-        "relegation_league": {
-            "description": "Liga za ostanak (Bottom 6 timova - ukupno 27 kola)",
-            "teams": liga_ostanak_results
-        },
-        "overall_statistics": {
-            "description": "Ukupne statistike i vjerojatnosti (prva faza)",
-            "teams": overall_stats
-        },
-        "phase_connection_info": {
-            "description": "Informacije o povezivanju faza",
-            "phase1_avg_points": {team: round(pts, 2) for team, pts in avg_points_after_phase1.items()},
-            "champions_starting_points": {team: round(pts_prv[team], 2) for team in liga_prvaka},
-            "relegation_starting_points": {team: round(pts_ost[team], 2) for team in liga_ostanak}
-        },
-        "metadata": {
-            "generated_at": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "total_teams": len(teams),
-            "simulation_type": "ELO-based Monte Carlo with connected phases"
-        }
-    }
+@app.route('/api/elo', methods=['GET'])
+def elo_table():
+    """Vraća trenutne ELO ratinge timova (?as_of=YYYY-MM-DD ili ?team=Tim za povijest)"""
+    from leagues import DEFAULT_LEAGUE
 
-    return jsonify(result)
+    league, error = league_from_request()
+    if error:
+        return error
+
+    as_of = request.args.get('as_of')
+    team_name = request.args.get('team')
+    if league['id'] != DEFAULT_LEAGUE:
+        # Povijest ratinga i current_elo.csv vode se samo za zadanu ligu
+        if as_of or team_name:
+            return jsonify({'error': f'Povijest ratinga ne postoji za ligu {league["id"]}'}), 404
+        return jsonify({team: {'ELO': elo} for team, elo in league['teams'].items()})
+
+    if as_of or team_name:
+        try:
+            from ledger import ensure_history
+            history = ensure_history()
+        except FileNotFoundError:
+            return jsonify({'error': 'Povijest ratinga se ne može izgraditi (nedostaje radna knjiga sezone)'}), 404
+
+        try:
+            if team_name:
+                if team_name not in history.team_ids:
+                    return jsonify({'error': f'Tim {team_name} ne postoji'}), 404
+                trajectory = history.team_trajectory(
+                    team_name, start=request.args.get('from'), end=as_of or request.args.get('to')
+                )
+                trajectory['date'] = trajectory['date'].astype(str)
+                return jsonify({'team': team_name, 'trajectory': trajectory.to_dict(orient='records')})
+
+            ratings = history.ratings_as_of(as_of)
+            return jsonify({team: {'ELO': elo} for team, elo in ratings.items()})
+        except ValueError as e:
+            return jsonify({'error': f'Neispravan datum: {e}'}), 400
+
+    df = pd.read_csv('current_elo.csv')
+    elo_dict = df.set_index(df.columns[0]).to_dict(orient='index')
+    return jsonify(elo_dict)
+
+@app.route('/api/simulation-text', methods=['GET'])
+def simulation_text():
+    """Vraća strukturirani JSON s rezultatima simulacije lige"""
+    from batch_engine import SAMPLING_MODES
+    from simulation_report import build_simulation_report
+
+    league, error = league_from_request()
+    if error:
+        return error
+
+    # Način uzorkovanja bira se po zahtjevu (?sampling=sobol), inače klasična simulacija
+    sampling = request.args.get('sampling')
+    if sampling is not None and sampling not in SAMPLING_MODES:
+        return jsonify({'error': f'Nepoznat način uzorkovanja: {sampling}'}), 400
+
+    return jsonify(build_simulation_report(league, sampling))
 
 @app.route('/api/simulation-legacy', methods=['GET'])
 def simulation_legacy():
     """Vraća originalni tekstualni format za kompatibilnost"""
     from runELO import (
-        teams, fixtures, initial_points, k, num_simulations,
-        run_multiple_simulations, simulate_league, generate_second_phase_fixtures,
-        print_results,
+        k, num_simulations, simulate_league, generate_second_phase_fixtures, print_results,
     )
+    from batch_engine import SAMPLING_MODES
+    from sim_service import run_simulations
+
+    league, error = league_from_request()
+    if error:
+        return error
+    teams, fixtures, initial_points = league['teams'], league['fixtures'], league['initial_points']
+
+    # Način uzorkovanja bira se po zahtjevu (?sampling=sobol), inače klasična simulacija
+    sampling = request.args.get('sampling')
+    if sampling is not None and sampling not in SAMPLING_MODES:
+        return jsonify({'error': f'Nepoznat način uzorkovanja: {sampling}'}), 400
 
     # Originalni kod za tekstualni format
-    position_probs, avg_points_dict, qual_top8_dict, qual_top24_dict = run_multiple_simulations(
-        teams, fixtures, initial_points, num_simulations=num_simulations, k=k
+    position_probs, avg_points_dict, qual_top8_dict, qual_top24_dict = run_simulations(
+        league['id'], teams, fixtures, initial_points, num_simulations, k, sampling
     )
     sorted_avg = sorted(avg_points_dict.items(), key=lambda x: x[1], reverse=True)
     top_phase1 = "\n".join([f"{t}: {pts:.2f} bodova" for t, pts in sorted_avg])
@@ -212,12 +198,12 @@ def simulation_legacy():
     pts_ost = {t: pts1[t] for t in liga_ostanak}
 
     pts_prv_final, elos_prv_final = simulate_league(teams_prv, fix_prvaka, pts_prv, k)
-    prob_prv, avg_prv, qual_top8_prv, qual_top24_prv = run_multiple_simulations(
-        teams_prv, fix_prvaka, pts_prv, num_simulations=num_simulations, k=k
+    prob_prv, avg_prv, qual_top8_prv, qual_top24_prv = run_simulations(
+        league['id'], teams_prv, fix_prvaka, pts_prv, num_simulations, k, sampling
     )
     pts_ost_final, elos_ost_final = simulate_league(teams_ost, fix_ostanak, pts_ost, k)
-    prob_ost, avg_ost, qual_top8_ost, qual_top24_ost = run_multiple_simulations(
-        teams_ost, fix_ostanak, pts_ost, num_simulations=num_simulations, k=k
+    prob_ost, avg_ost, qual_top8_ost, qual_top24_ost = run_simulations(
+        league['id'], teams_ost, fix_ostanak, pts_ost, num_simulations, k, sampling
     )
 
     # Tablica liga prvaka
@@ -260,9 +246,14 @@ def simulation_legacy():
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Provjera zdravlja API-ja"""
+    """Provjera zdravlja API-ja (uz broj simulacija koje su u tijeku i simulacijski backend)"""
+    from jit_kernel import BACKEND
+    from sim_service import cache_info
+
     return jsonify({
         "status": "healthy",
+        "simulations_running": cache_info()['running'],
+        "simulation_backend": BACKEND,
         "service": "ELO Liga Simulacija",
         "version": "2.0.0",
         "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -272,16 +263,24 @@ def health_check():
 def points_distribution_single(team_name):
     """Vraća distribuciju bodova za određeni tim"""
     try:
+        from batch_engine import SAMPLING_MODES
         from points import calculate_points_distribution, format_distribution_for_chart
-        
+
+        league, error = league_from_request()
+        if error:
+            return error
+
         # Provjeri postoji li tim
-        from runELO import teams
-        if team_name not in teams:
+        if team_name not in league['teams']:
             return jsonify({'error': f'Tim {team_name} ne postoji'}), 404
         
         # Izračunaj distribuciju
         num_sims = request.args.get('simulations', 10000, type=int)  # Default 10000 za brzinu
-        distribution = calculate_points_distribution(team_name, num_simulations=num_sims)
+        # ?sampling=random|sobol|halton pokreće batched dvofazni motor, inače klasična petlja
+        sampling = request.args.get('sampling')
+        if sampling is not None and sampling not in SAMPLING_MODES:
+            return jsonify({'error': f'Nepoznat način uzorkovanja: {sampling}'}), 400
+        distribution = calculate_points_distribution(team_name, num_simulations=num_sims, league=league, sampling=sampling)
         
         if not distribution:
             return jsonify({'error': 'Greška u računanju distribucije'}), 500
@@ -298,10 +297,19 @@ def points_distribution_single(team_name):
 def points_distribution_all():
     """Vraća distribuciju bodova za sve timove"""
     try:
+        from batch_engine import SAMPLING_MODES
         from points import calculate_all_teams_distribution, format_distribution_for_chart
-        
+
+        league, error = league_from_request()
+        if error:
+            return error
+
         num_sims = request.args.get('simulations', 10000, type=int)  # Manje simulacija za sve timove
-        all_distributions = calculate_all_teams_distribution(num_simulations=num_sims)
+        # ?sampling=random|sobol|halton pokreće batched dvofazni motor, inače klasična petlja
+        sampling = request.args.get('sampling')
+        if sampling is not None and sampling not in SAMPLING_MODES:
+            return jsonify({'error': f'Nepoznat način uzorkovanja: {sampling}'}), 400
+        all_distributions = calculate_all_teams_distribution(num_simulations=num_sims, league=league, sampling=sampling)
         
         # Formatiranje za frontend
         formatted_data = {}
@@ -311,6 +319,7 @@ def points_distribution_all():
         return jsonify({
             'teams': formatted_data,
             'metadata': {
+                'league': league['id'],
                 'total_simulations': num_sims,
                 'total_teams': len(formatted_data),
                 'generated_at': pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -324,11 +333,13 @@ def points_distribution_all():
 def positions_conditional_single(team_name):
     """Vraća uvjetne vjerojatnosti pozicija za određeni tim"""
     try:
-        from runELO import (
-            teams, fixtures, initial_points, k,
-            calculate_positions_conditional_optimized
-        )
-        
+        from runELO import k, calculate_positions_conditional_optimized
+
+        league, error = league_from_request()
+        if error:
+            return error
+        teams, fixtures, initial_points = league['teams'], league['fixtures'], league['initial_points']
+
         if team_name not in teams:
             return jsonify({'error': f'Tim {team_name} ne postoji'}), 404
         
@@ -376,11 +387,13 @@ def positions_conditional_single(team_name):
 def positions_conditional_matrix(team_name):
     """Vraća matricu uvjetnih vjerojatnosti (kao na slici)"""
     try:
-        from runELO import (
-            teams, fixtures, initial_points, k,
-            calculate_positions_conditional_optimized
-        )
-        
+        from runELO import k, calculate_positions_conditional_optimized
+
+        league, error = league_from_request()
+        if error:
+            return error
+        teams, fixtures, initial_points = league['teams'], league['fixtures'], league['initial_points']
+
         if team_name not in teams:
             return jsonify({'error': f'Tim {team_name} ne postoji'}), 404
         
@@ -428,8 +441,13 @@ def positions_conditional_matrix(team_name):
 def get_teams():
     """Vraća listu dostupnih timova"""
     try:
-        from runELO import teams
+        league, error = league_from_request()
+        if error:
+            return error
+
+        teams = league['teams']
         return jsonify({
+            'league': league['id'],
             'teams': list(teams.keys()),
             'total_teams': len(teams)
         })
@@ -440,19 +458,23 @@ def get_teams():
 def get_fixtures():
     """Vraća fixtures grupiranu po kolima"""
     try:
-        from runELO import fixtures
-        
-        # Grupiraj fixtures po kolima (6 utakmica po kolu)
+        league, error = league_from_request()
+        if error:
+            return error
+        fixtures = league['fixtures']
+        per_round = league['matches_per_round']
+
+        # Grupiraj fixtures po kolima (per_round utakmica po kolu)
         rounds = []
-        for i in range(0, len(fixtures), 6):
-            round_fixtures = fixtures[i:i+6]
+        for i in range(0, len(fixtures), per_round):
+            round_fixtures = fixtures[i:i+per_round]
             rounds.append({
-                'round_number': i//6 + 1,
+                'round_number': i//per_round + 1,
                 'fixtures': [
                     {
                         'home_team': home,
                         'away_team': away,
-                        'match_id': f"R{i//6 + 1}_M{idx+1}"
+                        'match_id': f"R{i//per_round + 1}_M{idx+1}"
                     }
                     for idx, (home, away) in enumerate(round_fixtures)
                 ]
@@ -464,14 +486,178 @@ def get_fixtures():
             'rounds': rounds,
             'metadata': {
                 'generated_at': pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'league': league['id'],
                 'phase': 'Prva faza lige',
-                'matches_per_round': 6
+                'matches_per_round': per_round
             }
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/probability-history', methods=['GET'])
+def probability_history():
+    """Vraća spremljene snapshotove vjerojatnosti po kolima (bez nove simulacije)"""
+    try:
+        from prob_history import load_history, snapshot_as_dict, team_history, history_file
+
+        league, error = league_from_request()
+        if error:
+            return error
+
+        history = load_history(history_file(league['id']))
+        team_name = request.args.get('team')
+        if team_name:
+            return jsonify({'team': team_name, 'history': team_history(team_name, history=history)})
+
+        return jsonify({
+            'rounds': [
+                {
+                    'round': rnd,
+                    'generated_at': history[rnd]['generated_at'],
+                    'num_simulations': history[rnd]['num_simulations'],
+                    'teams': snapshot_as_dict(history[rnd])
+                }
+                for rnd in sorted(history)
+            ]
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/probability-deltas', methods=['GET'])
+def probability_deltas():
+    """Vraća promjene vjerojatnosti u odnosu na prethodno spremljeno kolo"""
+    try:
+        from prob_history import compute_deltas, history_file
+
+        league, error = league_from_request()
+        if error:
+            return error
+
+        round_no = request.args.get('round', type=int)
+        try:
+            deltas = compute_deltas(round_no, path=history_file(league['id']))
+        except KeyError:
+            return jsonify({'error': f'Nema snapshota za kolo {round_no}'}), 404
+
+        if deltas is None:
+            return jsonify({'error': 'Nema dovoljno spremljenih kola za usporedbu'}), 404
+
+        return jsonify(deltas)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/rank-trajectory', methods=['GET'])
+def rank_trajectory():
+    """Vraća poziciju na tablici po kolima za sve klubove (ili ?team=Tim)"""
+    try:
+        from trajectory import team_trajectories
+
+        league, error = league_from_request()
+        if error:
+            return error
+        if league['standings'] is None:
+            return jsonify({'error': f'Liga {league["id"]} nema rezultate po kolima'}), 404
+
+        rounds, positions = team_trajectories(league['standings'])
+        team_name = request.args.get('team')
+        if team_name:
+            if team_name not in positions:
+                return jsonify({'error': f'Tim {team_name} ne postoji'}), 404
+            positions = {team_name: positions[team_name]}
+
+        return jsonify({
+            'league': league['id'],
+            'rounds': rounds,
+            'positions': positions,
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/scorers', methods=['GET'])
+def get_scorers():
+    """Vraća najbolje strijelce (?season=2025/26, ?club=Tim, ?top=10)"""
+    try:
+        from scorers import top_scorers
+
+        top = top_scorers(
+            request.args.get('top', 10, type=int),
+            season=request.args.get('season'),
+            club=request.args.get('club'),
+        )
+        return jsonify({'scorers': top.to_dict(orient='records')})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/golden-boot', methods=['GET'])
+def golden_boot():
+    """Vraća projekciju najboljeg strijelca sezone (ili kluba, vidi golden_boot.coverage) iz simulacije preostalih utakmica"""
+    try:
+        from golden_boot import coverage, project_golden_boot
+
+        league, error = league_from_request()
+        if error:
+            return error
+
+        num_sims = request.args.get('simulations', 10000, type=int)
+        projection = project_golden_boot(
+            league, num_simulations=num_sims, top_n=request.args.get('top', 10, type=int)
+        )
+        # scope 'club': strijelci nisu poznati za sve klubove, vjerojatnosti su unutar kluba
+        return jsonify({
+            'league': league['id'],
+            'total_simulations': num_sims,
+            **coverage(league),
+            'players': projection,
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/leagues', methods=['GET'])
+def get_leagues():
+    """Vraća sve lige s definicijom u leagues/*.json"""
+    try:
+        from leagues import list_leagues, load_league, DEFAULT_LEAGUE
+
+        leagues = []
+        for league_id in list_leagues():
+            league = load_league(league_id)
+            leagues.append({
+                'id': league_id,
+                'name': league['name'],
+                'total_teams': len(league['teams']),
+                'remaining_fixtures': len(league['fixtures']),
+            })
+        return jsonify({'default': DEFAULT_LEAGUE, 'leagues': leagues})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/leagues/warm', methods=['POST'])
+def warm_leagues():
+    """Zakazuje projekcije prve faze za sve lige na zajedničkom poolu (ne čeka rezultate)"""
+    try:
+        from batch_engine import SAMPLING_MODES
+        from sim_service import warm_leagues as schedule, cache_info
+
+        sampling = request.args.get('sampling')
+        if sampling is not None and sampling not in SAMPLING_MODES:
+            return jsonify({'error': f'Nepoznat način uzorkovanja: {sampling}'}), 400
+
+        futures = schedule(sampling=sampling)
+        return jsonify({
+            'scheduled': sorted(futures),
+            'cache': cache_info(),
+        }), 202
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from batch_engine import simulate_championship_batch, simulate_season_batch, position_counts_from_points
+from elo_replay import encode_teams, replay
+from jit_kernel import pool_context
+from run import INITIAL_ELO, K as REPLAY_K, HOME_ADV as REPLAY_HOME_ADV
+from sim_config import load_sim_config
+from workbook_cache import load_results, CACHE_DIR
+
+# ---- CONFIG ----
+EXCEL_PATH = 'result2425.xlsx'
+NUM_SIMULATIONS = 10000
+SEED = 2425
+PHASE1_ROUNDS = 22  # nakon 22. kola liga se dijeli na ligu za prvaka (1-6) i ligu za ostanak (7-12)
+GROUP_SIZE = 6
+
+# Tržišta koja bodujemo: (prva pozicija, zadnja pozicija) u konačnoj tablici, 0 = prvo mjesto
+MARKETS = {
+    'title': (0, 1),
+    'top6': (0, 6),
+    'relegation': (-1, None),
+}
+CALIBRATION_BINS = 10
+
+
+# ---- DATA ----
+def season_rounds(df):
+    """Broj kola po utakmici: u Excelu su kola odvojena praznim retkom"""
+    return ((df['row'].diff() > 1).cumsum() + 1).astype('int64')
+
+
+def load_season(excel_path=EXCEL_PATH):
+    df = load_results(excel_path)
+    df['round'] = season_rounds(df)
+    return df.reset_index(drop=True)
+
+
+def _table(df, teams):
+    """Tablica {tim: [bodovi, gol razlika, postignuti golovi]} iz odigranih utakmica"""
+    table = {t: [0, 0, 0] for t in teams}
+    for h, a, hs, as_ in zip(df['homeTeam'], df['awayTeam'], df['homeScore'], df['awayScore']):
+        table[h][1] += hs - as_
+        table[a][1] += as_ - hs
+        table[h][2] += hs
+        table[a][2] += as_
+        if hs > as_:
+            table[h][0] += 3
+        elif hs < as_:
+            table[a][0] += 3
+        else:
+            table[h][0] += 1
+            table[a][0] += 1
+    return table
+
+
+def _ranked(teams, table):
+    return sorted(teams, key=lambda t: (-table[t][0], -table[t][1], -table[t][2]))
+
+
+def championship_group(df, teams):
+    """Timovi lige za prvaka: prvih GROUP_SIZE po tablici nakon prve faze"""
+    return set(_ranked(teams, _table(df[df['round'] <= PHASE1_ROUNDS], teams))[:GROUP_SIZE])
+
+
+def final_positions(df, teams):
+    """
+    Stvarni poredak na kraju sezone: bodovi, gol razlika, postignuti golovi. Ako je
+    sezona odigrala i drugu fazu, poredak je po skupinama: liga za prvaka zauzima
+    mjesta 1-6, a liga za ostanak 7-12, bez obzira na bodove.
+    """
+    table = _table(df, teams)
+    if df['round'].max() <= PHASE1_ROUNDS:
+        order = _ranked(teams, table)
+    else:
+        top = championship_group(df, teams)
+        order = _ranked([t for t in teams if t in top], table) + _ranked([t for t in teams if t not in top], table)
+    return {t: i for i, t in enumerate(order)}
+
+
+# ---- STATE PER ROUND ----
+def round_states(df):
+    """
+    Stanje lige nakon svakog kola u jednom prolazu: ratinzi (replay kao u run.py)
+    i bodovi. Vraća (timovi, {kolo: (ratinzi, bodovi)}), kolo 0 je početak sezone.
+    """
+    teams, home_ids, away_ids = encode_teams(df)
+    ratings = np.full(len(teams), float(INITIAL_ELO))
+    points = np.zeros(len(teams))
+    states = {0: (ratings.copy(), points.copy())}
+
+    hs = df['homeScore'].to_numpy()
+    as_ = df['awayScore'].to_numpy()
+    rounds = df['round'].to_numpy()
+    for rnd in np.unique(rounds):
+        idx = np.flatnonzero(rounds == rnd)
+        ratings = replay(home_ids[idx], away_ids[idx], hs[idx], as_[idx], ratings,
+                         k=REPLAY_K, home_adv=REPLAY_HOME_ADV)[0]
+        np.add.at(points, home_ids[idx], np.where(hs[idx] > as_[idx], 3, np.where(hs[idx] == as_[idx], 1, 0)))
+        np.add.at(points, away_ids[idx], np.where(as_[idx] > hs[idx], 3, np.where(hs[idx] == as_[idx], 1, 0)))
+        states[int(rnd)] = (ratings.copy(), points.copy())
+    return teams, states
+
+
+# ---- FORECAST ----
+def _group_ranking_points(points, champions):
+    """
+    Bodovi pomaknuti tako da je svaki tim lige za prvaka iznad svakog tima lige za
+    ostanak; poredak po njima je poredak po skupinama (1-6, pa 7-12).
+    """
+    offset = int(points.max()) + 1 if points.size else 0
+    return points.astype(np.int64) + offset * champions
+
+
+def forecast_round(args):
+    """
+    Simulira ostatak sezone od stanja nakon kola 'rnd' i vraća vjerojatnosti po tržištu.
+    champions None: kolo je u prvoj fazi, pa se simulira ostatak prve faze (fixtures),
+    podjela i druga faza (simulate_championship_batch). Inače je podjela poznata
+    (bool po timu) i simulira se samo ostatak druge faze.
+    """
+    teams, ratings, points, fixtures, champions, num_simulations, k, seed = args
+    sim_teams, sim_start = dict(zip(teams, ratings)), dict(zip(teams, points))
+    if champions is None:
+        _, sim_points, sim_champions = simulate_championship_batch(
+            sim_teams, fixtures, sim_start, num_simulations, k=k, seed=seed,
+        )
+    else:
+        _, sim_points, _ = simulate_season_batch(sim_teams, fixtures, sim_start, num_simulations, k=k, seed=seed)
+        sim_champions = np.broadcast_to(champions, sim_points.shape)
+    counts = position_counts_from_points(_group_ranking_points(sim_points, sim_champions)) / num_simulations
+    return {market: counts[:, slice(*span)].sum(axis=1).tolist() for market, span in MARKETS.items()}
+
+
+def _cache_key(df, num_simulations, k, seed):
+    digest = hashlib.sha256(pd.util.hash_pandas_object(
+        df[['homeTeam', 'awayTeam', 'homeScore', 'awayScore', 'round']], index=False
+    ).values.tobytes())
+    digest.update(json.dumps([num_simulations, k, seed, PHASE1_ROUNDS, load_sim_config()], sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+def run_backtest(df=None, num_simulations=NUM_SIMULATIONS, max_workers=None, cache_dir=CACHE_DIR):
+    """
+    Walk-forward backtest: za svako kolo r prognoza konačnog poretka samo iz
+    utakmica do r, s podjelom na lige za prvaka i za ostanak nakon PHASE1_ROUNDS. Kola se simuliraju paralelno, a gotove prognoze se spremaju
+    u cache pa ponovno pokretanje simulira samo kola koja nedostaju.
+    Vraća (timovi, {kolo: {tržište: [p po timu]}}, stvarni ishodi {tržište: [0/1]}).
+    """
+    df = load_season() if df is None else df
+    k = load_sim_config()['k']
+    teams, states = round_states(df)
+    last_round = int(df['round'].max())
+
+    cache_path = os.path.join(cache_dir, f"backtest_{_cache_key(df, num_simulations, k, SEED)}.json")
+    forecasts = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            forecasts = {int(r): v for r, v in json.load(f).items()}
+
+    # Prije podjele simulira se samo ostatak prve faze, a drugu fazu generira
+    # simulate_championship_batch; nakon podjele skupine su stvarne
+    split = last_round > PHASE1_ROUNDS
+    top = championship_group(df, teams) if split else None
+    todo = [r for r in range(last_round) if r not in forecasts]
+    jobs = []
+    for rnd in todo:
+        if split and rnd < PHASE1_ROUNDS:
+            remaining = df[(df['round'] > rnd) & (df['round'] <= PHASE1_ROUNDS)]
+            champions = None
+        else:
+            remaining = df[df['round'] > rnd]
+            champions = np.array([t in top for t in teams]) if split else np.ones(len(teams), dtype=bool)
+        fixtures = list(zip(remaining['homeTeam'], remaining['awayTeam']))
+        ratings, points = states[rnd]
+        jobs.append((teams, ratings, points, fixtures, champions, num_simulations, k, SEED + rnd))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=pool_context()) as pool:
+            for rnd, result in zip(todo, pool.map(forecast_round, jobs)):
+                forecasts[rnd] = result
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({str(r): forecasts[r] for r in sorted(forecasts)}, f)
+
+    positions = final_positions(df, teams)
+    n = len(teams)
+    outcomes = {}
+    for market, (lo, hi) in MARKETS.items():
+        span = range(n)[slice(lo, hi)]
+        outcomes[market] = [int(positions[t] in span) for t in teams]
+    return teams, forecasts, outcomes
+
+
+# ---- SCORING ----
+def brier_scores(forecasts, outcomes):
+    """Brier po tržištu (prosjek po kolima i timovima) i po kolu"""
+    result = {}
+    for market, actual in outcomes.items():
+        actual = np.array(actual, dtype=float)
+        per_round = {r: float(np.mean((np.array(f[market]) - actual) ** 2)) for r, f in sorted(forecasts.items())}
+        result[market] = {'overall': float(np.mean(list(per_round.values()))), 'per_round': per_round}
+    return result
+
+
+def calibration_curve(forecasts, outcomes, market, bins=CALIBRATION_BINS):
+    """Prosječna prognoza vs. stvarna učestalost po razredu vjerojatnosti"""
+    probs = np.concatenate([forecasts[r][market] for r in sorted(forecasts)])
+    actual = np.tile(outcomes[market], len(forecasts))
+    bin_idx = np.minimum((probs * bins).astype(int), bins - 1)
+
+    curve = []
+    for b in range(bins):
+        mask = bin_idx == b
+        if mask.any():
+            curve.append({
+                'bin': [b / bins, (b + 1) / bins],
+                'predicted': float(probs[mask].mean()),
+                'observed': float(actual[mask].mean()),
+                'count': int(mask.sum()),
+            })
+    return curve
+
+
+if __name__ == '__main__':
+    num_simulations = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_SIMULATIONS
+    teams, forecasts, outcomes = run_backtest(num_simulations=num_simulations)
+    scores = brier_scores(forecasts, outcomes)
+
+    print(f"Backtest {EXCEL_PATH}: {len(forecasts)} kola, {num_simulations} simulacija po kolu")
+    for market in MARKETS:
+        print(f"\n{market.upper()}  Brier = {scores[market]['overall']:.4f}")
+        print(f"  {'razred':<12}{'prognoza':>10}{'stvarno':>10}{'n':>6}")
+        for row in calibration_curve(forecasts, outcomes, market):
+            label = f"{row['bin'][0]:.1f}-{row['bin'][1]:.1f}"
+            print(f"  {label:<12}{row['predicted']:>10.3f}{row['observed']:>10.3f}{row['count']:>6}")
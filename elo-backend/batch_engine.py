@@ -0,0 +1,364 @@
+import warnings
+
+import numpy as np
+
+import jit_kernel
+from sim_config import load_sim_config
+
+# Načini uzorkovanja uniformnih brojeva: 'random' je obični pseudo-slučajni
+# generator, 'sobol' i 'halton' su scrambled low-discrepancy nizovi (scipy)
+SAMPLING_MODES = ('random', 'sobol', 'halton')
+
+# Kompaktni tipovi izlaza: bodovi stanu u int16, pozicije u uint8, brojači u uint32
+POINTS_DTYPE = np.int16
+RANK_DTYPE = np.uint8
+DELTA_DTYPE = np.uint8  # bodovi po sezoni minus najmanji bodovi tima (za spremanje)
+COUNT_DTYPE = np.uint32
+CHUNK_SIZE = 65536  # sezona po bloku; ograničava memoriju za uniformne brojeve (blok x utakmice)
+
+SIM_CONFIG = load_sim_config()
+HOME_ADVANTAGE = SIM_CONFIG['home_advantage']
+DRAW_BAND = SIM_CONFIG['draw_band']
+
+
+def iter_uniforms(num_simulations, num_fixtures, sampling='random', seed=None, chunk_size=None):
+    """
+    Uniformni brojevi u blokovima od chunk_size sezona (None = jedan blok), oblika
+    (sezone u bloku, num_fixtures). Blokovi jednog generatora nastavljaju isti niz,
+    pa su spojeni jednaki jednom izvlačenju cijele matrice.
+    """
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(f"Nepoznat način uzorkovanja: {sampling} (dostupno: {', '.join(SAMPLING_MODES)})")
+
+    rng = np.random.default_rng(seed)
+    if sampling == 'random':
+        draw = lambda n: rng.random((n, num_fixtures))
+    else:
+        try:
+            from scipy.stats import qmc
+        except ImportError:
+            raise RuntimeError(f"Uzorkovanje '{sampling}' zahtijeva scipy (pip install scipy)")
+
+        if sampling == 'sobol':
+            engine = qmc.Sobol(d=num_fixtures, scramble=True, seed=rng)
+        else:
+            engine = qmc.Halton(d=num_fixtures, scramble=True, seed=rng)
+        draw = engine.random
+
+    chunk_size = chunk_size or max(num_simulations, 1)
+    for start in range(0, num_simulations, chunk_size):
+        with warnings.catch_warnings():
+            # Sobol je najbolje balansiran za potencije broja 2, ali radi i za ostale N
+            warnings.simplefilter('ignore', UserWarning)
+            yield draw(min(chunk_size, num_simulations - start))
+
+
+def draw_uniforms(num_simulations, num_fixtures, sampling='random', seed=None):
+    """
+    Vraća matricu uniformnih brojeva oblika (num_simulations, num_fixtures),
+    jedna dimenzija po utakmici
+    """
+    return next(iter_uniforms(num_simulations, num_fixtures, sampling, seed))
+
+
+def team_index(teams, initial_points):
+    """
+    Redoslijed timova u poljima motora. Prati redoslijed initial_points kao
+    runELO.simulate_league, da izjednačenja na tablici ostanu ista.
+    """
+    names = [t for t in initial_points if t in teams]
+    names += [t for t in teams if t not in initial_points]
+    return names, {name: i for i, name in enumerate(names)}
+
+
+def simulate_league_batch(elos, points, home_idx, away_idx, uniforms, k=20,
+                          home_advantage=HOME_ADVANTAGE, draw_band=DRAW_BAND, outcomes=None):
+    """
+    Simulira sve utakmice za S sezona odjednom.
+    elos, points: polja oblika (T, S) koja se mijenjaju na mjestu
+    home_idx, away_idx: indeksi timova po utakmici
+    uniforms: (S, F) uniformni brojevi, jedan stupac po utakmici
+    outcomes: opcionalno (S, F) polje koje se popunjava ishodima (0 domaćin, 1 neriješeno, 2 gost)
+    Elo se ažurira nakon svake utakmice kao u simulate_match.
+    Ako je Numba dostupna, izvodi se JIT kernel (jit_kernel) s istim rezultatom.
+    """
+    if jit_kernel.AVAILABLE:
+        return jit_kernel.simulate_league_jit(
+            elos, points, home_idx, away_idx, uniforms, k, home_advantage, draw_band, outcomes
+        )
+
+    for j in range(len(home_idx)):
+        h, a = home_idx[j], away_idx[j]
+        home_elo = elos[h]
+        away_elo = elos[a]
+        home_win_probability = 1 / (1 + np.power(10.0, -(home_elo + home_advantage - away_elo) / 400))
+
+        u = uniforms[:, j]
+        home_win = u < home_win_probability
+        draw = ~home_win & (u < home_win_probability + draw_band)
+        away_win = ~(home_win | draw)
+        if outcomes is not None:
+            outcomes[:, j] = draw + 2 * away_win
+
+        points[h] += 3 * home_win + draw
+        points[a] += 3 * away_win + draw
+
+        elo_change = k * (home_win + 0.5 * draw - home_win_probability)
+        elos[h] = home_elo + elo_change
+        elos[a] = away_elo - elo_change
+
+    return points, elos
+
+
+def points_dtype(initial_points, num_fixtures):
+    """
+    int16 ako su početni bodovi cijeli brojevi i kraj sezone sigurno stane u int16,
+    inače float64 (npr. prosječni bodovi nakon prve faze)
+    """
+    values = np.array(list(initial_points.values()), dtype=float)
+    integral = np.array_equal(values, np.round(values))
+    if integral and np.abs(values).max(initial=0) + 3 * num_fixtures < np.iinfo(POINTS_DTYPE).max:
+        return POINTS_DTYPE
+    return np.float64
+
+
+def simulate_season_batch(teams, fixtures, initial_points, num_simulations, k=20,
+                          sampling='random', seed=None, uniforms=None, outcomes=None,
+                          chunk_size=CHUNK_SIZE):
+    """
+    Batched ekvivalent runELO.simulate_league za num_simulations sezona.
+    Sezone se simuliraju u blokovima od chunk_size, pa su uniformni brojevi i Elo
+    u memoriji samo za jedan blok; rezultat je isti kao u jednom bloku.
+    outcomes: opcionalno (S, F) polje za ishode utakmica (vidi simulate_league_batch)
+    Vraća (imena timova, bodovi (S, T) int16 ili float64, elo (S, T) float32).
+    """
+    names, idx = team_index(teams, initial_points)
+    home_idx = np.array([idx[h] for h, _ in fixtures], dtype=np.intp)
+    away_idx = np.array([idx[a] for _, a in fixtures], dtype=np.intp)
+
+    if uniforms is None:
+        blocks = iter_uniforms(num_simulations, len(fixtures), sampling=sampling, seed=seed, chunk_size=chunk_size)
+    else:
+        blocks = (uniforms[start:start + chunk_size] for start in range(0, num_simulations, chunk_size))
+
+    start_elos = np.array([teams[t] for t in names], dtype=float)
+    start_points = np.array([initial_points[t] for t in names], dtype=points_dtype(initial_points, len(fixtures)))
+    points_out = np.empty((num_simulations, len(names)), dtype=start_points.dtype)
+    elos_out = np.empty((num_simulations, len(names)), dtype=np.float32)
+
+    start = 0
+    for block in blocks:
+        end = start + len(block)
+        elos = np.repeat(start_elos[:, None], len(block), axis=1)
+        points = np.repeat(start_points[:, None], len(block), axis=1)
+        simulate_league_batch(
+            elos, points, home_idx, away_idx, block, k=k,
+            outcomes=None if outcomes is None else outcomes[start:end],
+        )
+        points_out[start:end] = points.T
+        elos_out[start:end] = elos.T
+        start = end
+
+    return names, points_out, elos_out
+
+
+def simulate_championship_batch(teams, fixtures, initial_points, num_simulations, k=20,
+                                sampling='random', seed=None, chunk_size=CHUNK_SIZE,
+                                outcomes=None, phase1_order=None):
+    """
+    Batched ekvivalent runELO.run_complete_championship_simulation: prva faza,
+    podjela na ligu za prvaka i ligu za ostanak te druga faza, sve vektorski.
+    Podjela je permutacija po simulaciji: Elo i bodovi timova skupljaju se na mjesta
+    nakon prve faze, druga faza igra se po jednom predlošku rasporeda nad mjestima
+    (runELO.SECOND_PHASE_HOME/AWAY), a bodovi se vraćaju timovima.
+    outcomes: opcionalno (S, F + 2 x F2) polje za ishode: utakmice prve faze, pa predložak
+        druge faze za ligu za prvaka i za ligu za ostanak (mjesta, ne timovi)
+    phase1_order: opcionalno (S, T) polje za indekse timova po poretku nakon prve faze;
+        mjesto m u ligi za prvaka je phase1_order[:, m], u ligi za ostanak phase1_order[:, 6 + m]
+    Vraća (imena timova, konačni bodovi (S, T), u ligi za prvaka (S, T) bool).
+    """
+    from metrics import StageTimer
+    from runELO import SECOND_PHASE_HOME, SECOND_PHASE_AWAY
+
+    names, idx = team_index(teams, initial_points)
+    group_size = int(SECOND_PHASE_HOME.max()) + 1
+    if len(names) != 2 * group_size:
+        raise ValueError(f"Dvofazno prvenstvo zahtijeva {2 * group_size} timova, zadano {len(names)}")
+
+    home_idx = np.array([idx[h] for h, _ in fixtures], dtype=np.intp)
+    away_idx = np.array([idx[a] for _, a in fixtures], dtype=np.intp)
+    num_phase1, num_phase2 = len(fixtures), len(SECOND_PHASE_HOME)
+    total_fixtures = num_phase1 + 2 * num_phase2
+
+    start_elos = np.array([teams[t] for t in names], dtype=float)
+    start_points = np.array([initial_points[t] for t in names], dtype=points_dtype(initial_points, total_fixtures))
+    points_out = np.empty((num_simulations, len(names)), dtype=start_points.dtype)
+    champions_out = np.zeros((num_simulations, len(names)), dtype=bool)
+
+    stages = StageTimer('championship-batch')
+    start = 0
+    for block in iter_uniforms(num_simulations, total_fixtures, sampling=sampling, seed=seed, chunk_size=chunk_size):
+        size = len(block)
+        end = start + size
+        elos = np.repeat(start_elos[:, None], size, axis=1)
+        points = np.repeat(start_points[:, None], size, axis=1)
+        simulate_league_batch(
+            elos, points, home_idx, away_idx, block[:, :num_phase1], k=k,
+            outcomes=None if outcomes is None else outcomes[start:end, :num_phase1],
+        )
+        stages.mark('phase1')
+
+        # Stabilno sortiranje kao sorted(..., reverse=True) u petlji; obje skupine
+        # idu jedna ispod druge kao 2 x size simulacija nad group_size mjesta
+        order = np.argsort(-points.T, axis=1, kind='stable')
+        groups = np.concatenate([order[:, :group_size], order[:, group_size:]])
+        sims = np.tile(np.arange(size), 2)[:, None]
+        slot_elos = np.ascontiguousarray(elos.T[sims, groups].T)
+        slot_points = np.ascontiguousarray(points.T[sims, groups].T)
+        uniforms = np.concatenate([block[:, num_phase1:num_phase1 + num_phase2], block[:, num_phase1 + num_phase2:]])
+        stages.mark('split')
+
+        slot_outcomes = None if outcomes is None else np.empty((2 * size, num_phase2), dtype=outcomes.dtype)
+        simulate_league_batch(
+            slot_elos, slot_points, SECOND_PHASE_HOME, SECOND_PHASE_AWAY, uniforms, k=k, outcomes=slot_outcomes
+        )
+        if outcomes is not None:
+            outcomes[start:end, num_phase1:num_phase1 + num_phase2] = slot_outcomes[:size]
+            outcomes[start:end, num_phase1 + num_phase2:] = slot_outcomes[size:]
+        stages.mark('phase2')
+
+        final = points.T.copy()
+        final[sims, groups] = slot_points.T
+        points_out[start:end] = final
+        champions_out[np.arange(start, end)[:, None], order[:, :group_size]] = True
+        if phase1_order is not None:
+            phase1_order[start:end] = order
+        stages.mark('aggregation')
+        start = end
+
+    return names, points_out, champions_out
+
+
+def simulate_season_run(teams, fixtures, initial_points, num_simulations, k=20, sampling='random', seed=None):
+    """
+    Cijela sezona s ishodima utakmica, za potrošače koji dijele isto pokretanje (bodovi,
+    strijelci): dvofazno prvenstvo ako liga ima dvije skupine po predlošku druge faze,
+    inače samo raspored. Vraća {names, points (S, T), champions (S, T) ili None,
+    outcomes (S, F), phase1_order (S, T) ili None}; stupci ishoda kao u
+    simulate_championship_batch (prva faza, pa mjesta lige za prvaka i lige za ostanak).
+    """
+    from runELO import SECOND_PHASE_HOME
+
+    args = (teams, fixtures, initial_points, num_simulations)
+    if len(teams) != 2 * (int(SECOND_PHASE_HOME.max()) + 1):
+        outcomes = np.empty((num_simulations, len(fixtures)), dtype=np.int8)
+        names, points, _ = simulate_season_batch(*args, k=k, sampling=sampling, seed=seed, outcomes=outcomes)
+        return {'names': names, 'points': points, 'champions': None, 'outcomes': outcomes, 'phase1_order': None}
+
+    outcomes = np.empty((num_simulations, len(fixtures) + 2 * len(SECOND_PHASE_HOME)), dtype=np.int8)
+    order = np.empty((num_simulations, len(teams)), dtype=np.intp)
+    names, points, champions = simulate_championship_batch(
+        *args, k=k, sampling=sampling, seed=seed, outcomes=outcomes, phase1_order=order
+    )
+    return {'names': names, 'points': points, 'champions': champions, 'outcomes': outcomes, 'phase1_order': order}
+
+
+def ranks_from_points(points, chunk_size=CHUNK_SIZE):
+    """
+    Pozicija svakog tima (0 = prvi) u svakoj simulaciji, (S, T) uint8.
+    Izjednačenja se rješavaju redoslijedom stupaca (stabilno sortiranje).
+    """
+    num_simulations, num_teams = points.shape
+    ranks = np.empty((num_simulations, num_teams), dtype=RANK_DTYPE)
+    positions = np.arange(num_teams, dtype=RANK_DTYPE)[None, :]
+    for start in range(0, num_simulations, chunk_size):
+        order = np.argsort(-points[start:start + chunk_size], axis=1, kind='stable')
+        np.put_along_axis(ranks[start:start + chunk_size], order, positions, axis=1)
+    return ranks
+
+
+def position_counts_from_points(points):
+    """
+    Iz bodova (S, T) vraća matricu counts[tim, pozicija] (uint32).
+    Izjednačenja se rješavaju redoslijedom stupaca (stabilno sortiranje).
+    """
+    ranks = ranks_from_points(points)
+    num_teams = points.shape[1]
+    counts = np.empty((num_teams, num_teams), dtype=COUNT_DTYPE)
+    for team in range(num_teams):
+        counts[team] = np.bincount(ranks[:, team], minlength=num_teams)
+    return counts
+
+
+def simulate_position_counts(teams, fixtures, initial_points, num_simulations=10000, k=20,
+                             sampling='random', seed=None):
+    """
+    Kompaktni rezultat simulacije: (imena timova, counts[tim, pozicija] uint32, zbroj bodova po timu).
+    Postoci i prosjeci računaju se tek pri ispisu (summarize_position_counts).
+    """
+    names, points, _ = simulate_season_batch(
+        teams, fixtures, initial_points, num_simulations, k=k, sampling=sampling, seed=seed
+    )
+    return names, position_counts_from_points(points), points.sum(axis=0, dtype=np.float64)
+
+
+def summarize_position_counts(names, counts, totals, num_simulations):
+    """Kompaktni rezultat u izlaz runELO.run_multiple_simulations (postoci i prosjeci po timu)"""
+    position_probabilities = {
+        team: list(counts[i] / num_simulations * 100) for i, team in enumerate(names)
+    }
+    average_points = {team: round(float(totals[i] / num_simulations), 2) for i, team in enumerate(names)}
+    qualification_probabilities_top8 = {team: sum(probs[:1]) for team, probs in position_probabilities.items()}
+    qualification_probabilities_top24 = {team: sum(probs[:6]) for team, probs in position_probabilities.items()}
+
+    return position_probabilities, average_points, qualification_probabilities_top8, qualification_probabilities_top24
+
+
+def run_multiple_simulations_batch(teams, fixtures, initial_points, num_simulations=10000, k=20,
+                                   sampling='random', seed=None):
+    """Isti izlaz kao runELO.run_multiple_simulations, ali preko batched motora"""
+    names, counts, totals = simulate_position_counts(
+        teams, fixtures, initial_points, num_simulations, k=k, sampling=sampling, seed=seed
+    )
+    return summarize_position_counts(names, counts, totals, num_simulations)
+
+
+# ---- STORAGE ----
+def compact_points(points):
+    """
+    Cjelobrojni bodovi (S, T) kao (najmanji bodovi po timu (T,), razlika do njih (S, T) uint8).
+    Raspon bodova jednog tima kroz sezone je mali, pa razlika stane u bajt; None ako ne stane.
+    """
+    if not np.issubdtype(points.dtype, np.integer) or not points.size:
+        return None
+    base = points.min(axis=0)
+    if int((points.max(axis=0) - base).max()) > np.iinfo(DELTA_DTYPE).max:
+        return None
+    return base, (points - base).astype(DELTA_DTYPE)
+
+
+def save_season_outputs(path, names, points, ranks=None, compress=True):
+    """
+    Sprema bodove (i pozicije) po sezoni u .npz; compress=True koristi zlib kompresiju.
+    Cjelobrojni bodovi spremaju se kao uint8 razlika od najmanjih bodova tima (compact_points).
+    """
+    arrays = {'names': np.array(names)}
+    compact = compact_points(points)
+    if compact is None:
+        arrays['points'] = points
+    else:
+        arrays['points_base'], arrays['points_delta'] = compact
+    if ranks is not None:
+        arrays['ranks'] = ranks
+    (np.savez_compressed if compress else np.savez)(path, **arrays)
+
+
+def load_season_outputs(path):
+    """Vraća (imena timova, bodovi (S, T), pozicije (S, T) ili None)"""
+    with np.load(path) as data:
+        if 'points_delta' in data:
+            base = data['points_base']
+            points = (data['points_delta'] + base).astype(base.dtype)
+        else:
+            points = data['points']
+        return data['names'].tolist(), points, data['ranks'] if 'ranks' in data else None
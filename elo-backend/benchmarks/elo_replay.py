@@ -0,0 +1,74 @@
+"""
+Brzina replaya Elo ratinga: run.compute_season_elo (array replay) vs. stari
+iterrows + elo_update pristup, na sintetičkoj višesezonskoj povijesti.
+
+Pokretanje iz elo-backend direktorija:
+    python -m benchmarks.elo_replay [--seasons 100] [--teams 16]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from run import compute_season_elo, elo_update, INITIAL_ELO
+
+
+def synthetic_history(seasons, num_teams, seed=0):
+    """Dvokružni raspored za svaku sezonu, golovi iz Poissonove razdiobe"""
+    rng = np.random.default_rng(seed)
+    names = [f"Klub {i:02d}" for i in range(num_teams)]
+    pairs = [(h, a) for h in range(num_teams) for a in range(num_teams) if h != a]
+    home = np.tile([h for h, _ in pairs], seasons)
+    away = np.tile([a for _, a in pairs], seasons)
+    n = len(home)
+    return pd.DataFrame({
+        'homeTeam': np.array(names)[home],
+        'awayTeam': np.array(names)[away],
+        'dateOfMatch': pd.date_range('2000-08-01', periods=n, freq='h'),
+        'homeScore': rng.poisson(1.6, n).astype(float),
+        'awayScore': rng.poisson(1.2, n).astype(float),
+    })
+
+
+def iterrows_replay(df):
+    """Stari pristup iz compute_season_elo (prije array replaya)"""
+    teams = sorted(set(df['homeTeam']) | set(df['awayTeam']))
+    rating = {t: INITIAL_ELO for t in teams}
+    matchlog = []
+    for ix, row in df.iterrows():
+        h, a = row['homeTeam'], row['awayTeam']
+        hs, as_ = row['homeScore'], row['awayScore']
+        rh, ra = rating[h], rating[a]
+        new_rh, new_ra = elo_update(rh, ra, hs, as_)
+        matchlog.append({'rnd': ix + 1, 'home_pre': rh, 'away_pre': ra, 'home_post': new_rh, 'away_post': new_ra})
+        rating[h], rating[a] = new_rh, new_ra
+    return rating, pd.DataFrame(matchlog)
+
+
+def best_of(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, default=100)
+    parser.add_argument('--teams', type=int, default=16)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    df = synthetic_history(args.seasons, args.teams)
+    print(f"{len(df)} utakmica ({args.seasons} sezona, {args.teams} timova)")
+
+    t_new, (rating_new, _) = best_of(lambda: compute_season_elo(df), args.repeats)
+    t_old, (rating_old, _) = best_of(lambda: iterrows_replay(df), 1)
+
+    diff = max(abs(rating_new[t] - rating_old[t]) for t in rating_old)
+    print(f"array replay : {t_new * 1000:8.1f} ms  ({len(df) / t_new:,.0f} utakmica/s)")
+    print(f"iterrows     : {t_old * 1000:8.1f} ms  ({len(df) / t_old:,.0f} utakmica/s)")
+    print(f"ubrzanje     : {t_old / t_new:8.1f}x   (max razlika ratinga: {diff:.2e})")
@@ -0,0 +1,245 @@
+"""
+Točnost vs. cijena simulacijskih motora: svaki motor se pokreće za rastući broj
+simulacija, a distribucije pozicija uspoređuju se s referentnim pokretanjem
+s velikim N (batched motor s pseudo-slučajnim brojevima, iste semantike kao
+runELO.simulate_league). Mjere su total variation i chi-kvadrat udaljenost
+po timu; graf prikazuje grešku u odnosu na vrijeme izvođenja.
+
+Pokretanje iz elo-backend direktorija:
+    python -m benchmarks.engine_accuracy [--scenario phase1|phase2] [--target 0.01]
+        [--engines loop,batch,sobol,halton,frozen,parallel] [--plot accuracy.png] [--json out.json]
+"""
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch_engine import simulate_season_batch, position_counts_from_points, team_index
+from jit_kernel import pool_context
+
+# ---- CONFIG ----
+MIN_EXP = 8
+MAX_EXP = 16
+LOOP_MAX_EXP = 14          # Python petlja je ~20x sporija od batched motora
+REFERENCE_EXP = 20
+REFERENCE_CHUNK = 2 ** 16  # reference se računa u dijelovima zbog memorije
+TARGET = 0.01              # ciljna prosječna total variation udaljenost
+PARALLEL_CHUNKS = 4
+
+
+# ---- SCENARIOS ----
+def scenario(name):
+    """(teams, fixtures, initial_points) za prvu fazu lige ili drugu fazu (top 6)"""
+    from leagues import load_league, DEFAULT_LEAGUE
+    from runELO import generate_second_phase_fixtures
+
+    league = load_league(DEFAULT_LEAGUE)
+    if name == 'phase1':
+        return league['teams'], league['fixtures'], league['initial_points']
+    if name == 'phase2':
+        top6 = list(league['initial_points'])[:6]
+        return (
+            {t: league['teams'][t] for t in top6},
+            generate_second_phase_fixtures(top6),
+            {t: league['initial_points'][t] for t in top6},
+        )
+    raise ValueError(f"Nepoznat scenarij: {name}")
+
+
+# ---- ENGINES ----
+# Svaki motor vraća counts[tim, pozicija] u redoslijedu batch_engine.team_index
+def engine_loop(teams, fixtures, initial_points, n, seed):
+    from runELO import run_multiple_simulations
+
+    random.seed(seed)
+    position_probabilities, _, _, _ = run_multiple_simulations(teams, fixtures, initial_points, n)
+    names, _ = team_index(teams, initial_points)
+    return np.array([position_probabilities[t] for t in names]) * n / 100
+
+
+def _batch_counts(teams, fixtures, initial_points, n, seed, sampling='random', k=20):
+    _, points, _ = simulate_season_batch(teams, fixtures, initial_points, n, k=k, sampling=sampling, seed=seed)
+    return position_counts_from_points(points)
+
+
+def engine_batch(teams, fixtures, initial_points, n, seed):
+    return _batch_counts(teams, fixtures, initial_points, n, seed)
+
+
+def engine_sobol(teams, fixtures, initial_points, n, seed):
+    return _batch_counts(teams, fixtures, initial_points, n, seed, sampling='sobol')
+
+
+def engine_halton(teams, fixtures, initial_points, n, seed):
+    return _batch_counts(teams, fixtures, initial_points, n, seed, sampling='halton')
+
+
+def engine_frozen(teams, fixtures, initial_points, n, seed):
+    """Ratinzi se ne ažuriraju tijekom sezone (k=0): brže aproksimacije ovako izgledaju"""
+    return _batch_counts(teams, fixtures, initial_points, n, seed, k=0)
+
+
+def _chunk(args):
+    return _batch_counts(*args)
+
+
+_pool = None
+
+
+def engine_parallel(teams, fixtures, initial_points, n, seed):
+    """Batched motor podijeljen na PARALLEL_CHUNKS procesa s neovisnim seedovima"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PARALLEL_CHUNKS, mp_context=pool_context())
+    sizes = [n // PARALLEL_CHUNKS + (i < n % PARALLEL_CHUNKS) for i in range(PARALLEL_CHUNKS)]
+    seeds = np.random.SeedSequence(seed).spawn(PARALLEL_CHUNKS)
+    jobs = [(teams, fixtures, initial_points, size, s) for size, s in zip(sizes, seeds) if size]
+    return sum(_pool.map(_chunk, jobs))
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+ENGINES = {
+    'loop': engine_loop,
+    'batch': engine_batch,
+    'sobol': engine_sobol,
+    'halton': engine_halton,
+    'frozen': engine_frozen,
+    'parallel': engine_parallel,
+}
+
+
+# ---- DISTANCES ----
+def reference_distribution(teams, fixtures, initial_points, exp=REFERENCE_EXP, seed=0):
+    """Distribucija pozicija (T, T) iz 2^exp simulacija, računana u dijelovima"""
+    n = 2 ** exp
+    seeds = np.random.SeedSequence(seed).spawn(-(-n // REFERENCE_CHUNK))
+    counts = sum(
+        _batch_counts(teams, fixtures, initial_points, min(REFERENCE_CHUNK, n - i * REFERENCE_CHUNK), s)
+        for i, s in enumerate(seeds)
+    )
+    return counts / n
+
+
+def distances(counts, reference):
+    """Prosječna i najveća total variation udaljenost po timu te prosječni chi-kvadrat"""
+    p = counts / counts.sum(axis=1, keepdims=True)
+    tv = 0.5 * np.abs(p - reference).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chi2 = np.where(reference > 0, (p - reference) ** 2 / reference, 0.0).sum(axis=1)
+    return {'tv_mean': float(tv.mean()), 'tv_max': float(tv.max()), 'chi2_mean': float(chi2.mean())}
+
+
+# ---- HARNESS ----
+def run(scenario_name='phase1', engines=tuple(ENGINES), min_exp=MIN_EXP, max_exp=MAX_EXP,
+        loop_max_exp=LOOP_MAX_EXP, reference_exp=REFERENCE_EXP, repeats=1):
+    teams, fixtures, initial_points = scenario(scenario_name)
+
+    start = time.perf_counter()
+    reference = reference_distribution(teams, fixtures, initial_points, reference_exp)
+    print(f"Referenca: 2^{reference_exp} simulacija ({time.perf_counter() - start:.1f}s)")
+    print(f"{'motor':<10}{'N':>10}{'s':>10}{'TV prosj.':>12}{'TV max':>10}{'chi2':>10}")
+
+    rows = []
+    try:
+        for name in engines:
+            top = min(max_exp, loop_max_exp) if name == 'loop' else max_exp
+            # Neizmjereno zagrijavanje: importi (scipy) i pokretanje procesa ne ulaze u vrijeme
+            ENGINES[name](teams, fixtures, initial_points, 2 ** min_exp, 0)
+            for exp in range(min_exp, top + 1):
+                n = 2 ** exp
+                elapsed, results = 0.0, []
+                for rep in range(repeats):
+                    t0 = time.perf_counter()
+                    counts = ENGINES[name](teams, fixtures, initial_points, n, 1000 + rep)
+                    elapsed += time.perf_counter() - t0
+                    results.append(distances(np.asarray(counts, dtype=float), reference))
+                row = {'engine': name, 'num_simulations': n, 'seconds': elapsed / repeats}
+                row.update({key: float(np.mean([r[key] for r in results])) for key in results[0]})
+                rows.append(row)
+                print(f"{name:<10}{n:>10}{row['seconds']:>10.4f}{row['tv_mean']:>12.5f}{row['tv_max']:>10.5f}{row['chi2_mean']:>10.5f}")
+    finally:
+        shutdown_pool()
+
+    return {
+        'scenario': scenario_name,
+        'fixtures': len(fixtures),
+        'reference_simulations': 2 ** reference_exp,
+        'results': rows,
+    }
+
+
+def cheapest(report, target=TARGET):
+    """Za svaki motor najjeftinije pokretanje s prosječnom TV ispod cilja; sortirano po vremenu"""
+    best = {}
+    for row in report['results']:
+        if row['tv_mean'] <= target and (row['engine'] not in best or row['seconds'] < best[row['engine']]['seconds']):
+            best[row['engine']] = row
+    return sorted(best.values(), key=lambda r: r['seconds'])
+
+
+def plot(report, target=TARGET, out_path=None):
+    import matplotlib.pyplot as plt
+    from chart_output import finish_figure
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for name in dict.fromkeys(r['engine'] for r in report['results']):
+        rows = [r for r in report['results'] if r['engine'] == name]
+        ax.plot([r['seconds'] for r in rows], [r['tv_mean'] for r in rows], marker='o', label=name)
+    ax.axhline(target, color='gray', linestyle='--', linewidth=1, label=f'cilj {target}')
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_xlabel('Vrijeme (s)')
+    ax.set_ylabel('Prosječna total variation udaljenost')
+    ax.set_title(f"Točnost vs. vrijeme ({report['scenario']}, referenca {report['reference_simulations']:,} simulacija)")
+    ax.grid(True, which='both', alpha=0.3)
+    ax.legend()
+    fig.tight_layout()
+    return finish_figure(fig, out_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenario', default='phase1', choices=['phase1', 'phase2'])
+    parser.add_argument('--engines', default=','.join(ENGINES), help=f"podskup: {','.join(ENGINES)}")
+    parser.add_argument('--min-exp', type=int, default=MIN_EXP)
+    parser.add_argument('--max-exp', type=int, default=MAX_EXP)
+    parser.add_argument('--loop-max-exp', type=int, default=LOOP_MAX_EXP)
+    parser.add_argument('--reference-exp', type=int, default=REFERENCE_EXP)
+    parser.add_argument('--repeats', type=int, default=1)
+    parser.add_argument('--target', type=float, default=TARGET, help="ciljna prosječna TV udaljenost")
+    parser.add_argument('--plot', help="spremi graf (npr. accuracy.png); bez toga se graf ne crta")
+    parser.add_argument('--json', help="spremi rezultate u JSON datoteku")
+    args = parser.parse_args()
+
+    engines = args.engines.split(',')
+    unknown = [e for e in engines if e not in ENGINES]
+    if unknown:
+        parser.error(f"Nepoznati motori: {', '.join(unknown)}")
+
+    report = run(args.scenario, engines, args.min_exp, args.max_exp, args.loop_max_exp,
+                 args.reference_exp, args.repeats)
+    report['target'] = args.target
+    report['cheapest'] = cheapest(report, args.target)
+
+    print(f"\nNajjeftiniji motori za TV <= {args.target}:")
+    for row in report['cheapest']:
+        print(f"  {row['engine']:<10}N={row['num_simulations']:<10}{row['seconds']:.4f}s")
+    if not report['cheapest']:
+        print("  nijedan motor ne postiže cilj u zadanom rasponu")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.plot:
+        import matplotlib
+        matplotlib.use('Agg')
+        plot(report, args.target, args.plot)
@@ -0,0 +1,77 @@
+"""
+Greška vs. broj simulacija: pseudo-slučajno vs. Sobol/Halton uzorkovanje
+na rasporedu prve faze iz runELO (48 utakmica).
+
+Pokretanje iz elo-backend direktorija:
+    python -m benchmarks.qmc_convergence [--repeats 20] [--max-exp 14]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from batch_engine import simulate_season_batch, position_counts_from_points
+from runELO import teams, fixtures, initial_points, k
+
+
+def summarize(points):
+    """Vektor metrika koje uspoređujemo: prosjek bodova, P(prvak), P(top 6) po timu"""
+    num_sims = points.shape[0]
+    counts = position_counts_from_points(points)
+    return np.concatenate([
+        points.mean(axis=0),
+        counts[:, 0] / num_sims * 100,
+        counts[:, :6].sum(axis=1) / num_sims * 100,
+    ])
+
+
+def run(repeats=20, min_exp=8, max_exp=14, reference_exp=20, modes=('random', 'sobol')):
+    start = time.perf_counter()
+    _, ref_points, _ = simulate_season_batch(
+        teams, fixtures, initial_points, 2 ** reference_exp, k=k, sampling='random', seed=12345
+    )
+    reference = summarize(ref_points)
+    print(f"Referenca: 2^{reference_exp} simulacija ({time.perf_counter() - start:.1f}s)")
+
+    rows = []
+    header = f"{'N':>8}" + "".join(f"{m + ' RMSE':>16}{m + ' s':>10}" for m in modes)
+    print(header)
+    print("-" * len(header))
+    for exp in range(min_exp, max_exp + 1):
+        n = 2 ** exp
+        row = {'num_simulations': n}
+        line = f"{n:>8}"
+        for mode in modes:
+            errors = []
+            elapsed = 0.0
+            for rep in range(repeats):
+                t0 = time.perf_counter()
+                _, points, _ = simulate_season_batch(
+                    teams, fixtures, initial_points, n, k=k, sampling=mode, seed=1000 + rep
+                )
+                elapsed += time.perf_counter() - t0
+                errors.append(np.mean((summarize(points) - reference) ** 2))
+            rmse = float(np.sqrt(np.mean(errors)))
+            row[mode] = {'rmse': rmse, 'seconds': elapsed / repeats}
+            line += f"{rmse:>16.4f}{elapsed / repeats:>10.4f}"
+        rows.append(row)
+        print(line)
+
+    return {'fixtures': len(fixtures), 'reference_simulations': 2 ** reference_exp, 'results': rows}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--min-exp', type=int, default=8)
+    parser.add_argument('--max-exp', type=int, default=14)
+    parser.add_argument('--reference-exp', type=int, default=20)
+    parser.add_argument('--modes', default='random,sobol', help="npr. random,sobol,halton")
+    parser.add_argument('--json', help="spremi rezultate u JSON datoteku")
+    args = parser.parse_args()
+
+    report = run(args.repeats, args.min_exp, args.max_exp, args.reference_exp, tuple(args.modes.split(',')))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
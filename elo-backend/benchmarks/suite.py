@@ -0,0 +1,354 @@
+"""
+Benchmark suite za simulacijski i rating motor: propusnost (utakmice/s, sezone/s)
+i vršna memorija na više skala (broj simulacija, broj timova, broj sezona),
+uz izvještaj o memoriji po milijunu sezona za kompaktne tipove izlaza.
+Rezultati se spremaju u JSON po commitu; uz --baseline se uspoređuju s ranijim
+rezultatom i skripta završava s greškom ako je regresija veća od praga.
+
+Pokretanje iz elo-backend direktorija:
+    python -m benchmarks.suite [--profile quick|full] [--cases simulate_league,batch]
+    python -m benchmarks.suite --baseline benchmarks/results/abc1234.json [--threshold 0.15]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.elo_replay import synthetic_history
+
+# ---- CONFIG ----
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+REPEATS = 3
+THRESHOLD = 0.15          # dopušteni pad propusnosti (udio)
+MEMORY_THRESHOLD = 0.25   # dopušteni rast vršne memorije (udio)
+MEMORY_SIMULATIONS = 100_000            # izvještaj o memoriji se skalira na milijun sezona
+MEMORY_CHAMPIONSHIP_SIMULATIONS = 10_000
+
+
+# ---- SYNTHETIC LEAGUES ----
+def synthetic_league(num_teams, seed=0):
+    """Dvokružna liga s nasumičnim Elo ratinzima i nula bodova"""
+    rng = np.random.default_rng(seed)
+    names = [f"Klub {i:02d}" for i in range(num_teams)]
+    teams = {name: float(elo) for name, elo in zip(names, rng.normal(1500, 80, num_teams))}
+    fixtures = [(h, a) for h in names for a in names if h != a]
+    return teams, fixtures, {name: 0 for name in names}
+
+
+def default_league():
+    from leagues import load_league, DEFAULT_LEAGUE
+    league = load_league(DEFAULT_LEAGUE)
+    return league['teams'], league['fixtures'], league['initial_points']
+
+
+# ---- CASES ----
+# Svaki slučaj vraća (funkcija bez argumenata, broj jedinica, jedinica)
+def case_simulate_match(calls):
+    from runELO import simulate_match
+
+    def fn():
+        for _ in range(calls):
+            simulate_match(1500.0, 1480.0)
+    return fn, calls, 'matches'
+
+
+def case_simulate_league(seasons, teams):
+    from runELO import simulate_league
+    elos, fixtures, points = synthetic_league(teams)
+
+    def fn():
+        for _ in range(seasons):
+            simulate_league(elos, fixtures, points)
+    return fn, seasons * len(fixtures), 'matches'
+
+
+def case_run_multiple_simulations(simulations, teams):
+    from runELO import run_multiple_simulations
+    elos, fixtures, points = synthetic_league(teams)
+    return lambda: run_multiple_simulations(elos, fixtures, points, simulations), simulations, 'seasons'
+
+
+def case_batch(simulations, teams):
+    from batch_engine import run_multiple_simulations_batch
+    elos, fixtures, points = synthetic_league(teams)
+    return lambda: run_multiple_simulations_batch(elos, fixtures, points, simulations, seed=0), simulations, 'seasons'
+
+
+def case_championship(simulations, sampling=None):
+    from runELO import run_complete_championship_simulation
+    elos, fixtures, points = default_league()
+    return (
+        lambda: run_complete_championship_simulation(elos, fixtures, simulations, start_points=points, sampling=sampling),
+        simulations, 'seasons',
+    )
+
+
+def case_conditional(simulations):
+    from runELO import calculate_positions_conditional_optimized
+    elos, fixtures, points = default_league()
+    return lambda: calculate_positions_conditional_optimized(elos, fixtures, points, simulations), simulations, 'seasons'
+
+
+def case_compute_season_elo(seasons, teams):
+    from run import compute_season_elo
+    df = synthetic_history(seasons, teams)
+    return lambda: compute_season_elo(df), len(df), 'matches'
+
+
+CASES = {
+    'simulate_match': case_simulate_match,
+    'simulate_league': case_simulate_league,
+    'run_multiple_simulations': case_run_multiple_simulations,
+    'batch': case_batch,
+    'championship': case_championship,
+    'conditional': case_conditional,
+    'compute_season_elo': case_compute_season_elo,
+}
+
+# Dvofazno prvenstvo i uvjetne pozicije rade samo s 12 timova zadane lige
+PROFILES = {
+    'quick': [
+        ('simulate_match', {'calls': 100_000}),
+        ('simulate_league', {'seasons': 1000, 'teams': 12}),
+        ('simulate_league', {'seasons': 100, 'teams': 40}),
+        ('run_multiple_simulations', {'simulations': 1000, 'teams': 12}),
+        ('batch', {'simulations': 1000, 'teams': 12}),
+        ('batch', {'simulations': 10_000, 'teams': 12}),
+        ('batch', {'simulations': 100_000, 'teams': 12}),
+        ('batch', {'simulations': 10_000, 'teams': 40}),
+        ('championship', {'simulations': 1000}),
+        ('championship', {'simulations': 10_000, 'sampling': 'random'}),
+        ('conditional', {'simulations': 1000}),
+        ('compute_season_elo', {'seasons': 1, 'teams': 12}),
+        ('compute_season_elo', {'seasons': 10, 'teams': 12}),
+        ('compute_season_elo', {'seasons': 100, 'teams': 40}),
+    ],
+}
+PROFILES['full'] = PROFILES['quick'] + [
+    ('simulate_match', {'calls': 1_000_000}),
+    ('simulate_league', {'seasons': 10_000, 'teams': 12}),
+    ('run_multiple_simulations', {'simulations': 10_000, 'teams': 12}),
+    ('run_multiple_simulations', {'simulations': 1000, 'teams': 40}),
+    ('batch', {'simulations': 1_000_000, 'teams': 12}),
+    ('batch', {'simulations': 100_000, 'teams': 40}),
+    ('championship', {'simulations': 10_000}),
+    ('championship', {'simulations': 1_000_000, 'sampling': 'random'}),
+    ('conditional', {'simulations': 10_000}),
+    ('compute_season_elo', {'seasons': 1000, 'teams': 12}),
+    ('compute_season_elo', {'seasons': 1000, 'teams': 40}),
+]
+
+
+def case_id(name, params):
+    return name + ''.join(f"[{key}={value}]" for key, value in params.items())
+
+
+# ---- MEMORY REPORT ----
+def _traced_peak(fn):
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+
+def memory_report(num_simulations=MEMORY_SIMULATIONS, championship_simulations=MEMORY_CHAMPIONSHIP_SIMULATIONS):
+    """
+    Memorija po milijunu sezona (MB) na zadanoj ligi: kompaktni tipovi (int16 bodovi,
+    uint8 pozicije) naspram float64/int64 polja i Python listi, vršna memorija
+    batched motora u blokovima naspram jednog bloka te veličina spremljenih izlaza
+    sa i bez kompresije. Mjeri se na manjem N i skalira na milijun.
+    Za prvenstvo se Python liste (stari izlaz) mjere tracemallocom i uspoređuju s int16
+    poljem, uint8 razlikama (compact_points) i histogramom bodova (sharding.Accumulator),
+    koji ne raste s brojem sezona pa se ne skalira.
+    """
+    from batch_engine import (
+        CHUNK_SIZE, compact_points, simulate_season_batch, position_counts_from_points, ranks_from_points,
+        save_season_outputs,
+    )
+    from runELO import run_complete_championship_simulation
+    from sharding import league_accumulator
+
+    teams, fixtures, initial_points = default_league()
+    scale = 1_000_000 / num_simulations
+    mb = lambda nbytes, s=scale: round(nbytes * s / 1024 ** 2, 2)
+
+    names, points, _ = simulate_season_batch(teams, fixtures, initial_points, num_simulations, seed=0)
+    ranks = ranks_from_points(points)
+    stored = {}
+    for compress in (False, True):
+        buffer = io.BytesIO()
+        save_season_outputs(buffer, names, points, ranks, compress=compress)
+        stored[compress] = buffer.getbuffer().nbytes
+
+    # Blok se skalira s N, da vršna memorija odgovara milijunu sezona u blokovima od CHUNK_SIZE
+    chunk_size = max(1, round(CHUNK_SIZE / scale))
+    _, chunked_peak = _traced_peak(lambda: position_counts_from_points(simulate_season_batch(
+        teams, fixtures, initial_points, num_simulations, seed=0, chunk_size=chunk_size
+    )[1]))
+    _, single_peak = _traced_peak(lambda: simulate_season_batch(
+        teams, fixtures, initial_points, num_simulations, seed=0, chunk_size=num_simulations
+    ))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        all_results, _, _ = run_complete_championship_simulation(
+            teams, fixtures, championship_simulations, start_points=initial_points
+        )
+    championship_scale = 1_000_000 / championship_simulations
+    # Liste i elementi koje one drže (male cijele brojeve Python dijeli, pa ne ulaze u zbroj)
+    _, as_lists = _traced_peak(lambda: [values.tolist() for values in all_results.values()])
+    championship_points = np.column_stack(list(all_results.values()))
+    base, deltas = compact_points(championship_points)
+    accumulator = league_accumulator(teams, fixtures, initial_points, 'championship').add(championship_points)
+    histogram = accumulator.points_histogram.nbytes + accumulator.position_counts.nbytes
+    compact = sum(v.nbytes for v in all_results.values())
+
+    return {
+        'teams': len(names),
+        'measured_simulations': num_simulations,
+        'points_float64_mb': mb(points.size * 8),
+        'points_compact_mb': mb(points.nbytes),
+        'ranks_int64_mb': mb(ranks.size * 8),
+        'ranks_uint8_mb': mb(ranks.nbytes),
+        'stored_raw_mb': mb(stored[False]),
+        'stored_compressed_mb': mb(stored[True]),
+        'batch_peak_single_block_mb': mb(single_peak),
+        'batch_peak_chunked_mb': mb(chunked_peak),
+        'championship_lists_mb': mb(as_lists, championship_scale),
+        'championship_compact_mb': mb(compact, championship_scale),
+        'championship_uint8_delta_mb': mb(base.nbytes + deltas.nbytes * championship_scale, 1),
+        'championship_histogram_mb': mb(histogram, 1),
+        'championship_lists_vs_compact': round(as_lists / compact, 1),
+        'championship_lists_vs_uint8_delta': round(as_lists / deltas.nbytes, 1),
+        'championship_lists_vs_histogram': round(as_lists * championship_scale / histogram, 1),
+    }
+
+
+# ---- MEASUREMENT ----
+def measure(name, params, repeats=REPEATS, memory=True):
+    """Najbolje vrijeme od repeats ponavljanja i vršna memorija (tracemalloc) u zasebnom pokretanju"""
+    fn, units, unit = CASES[name](**params)
+    times = []
+    # Neki motori ispisuju napredak; u benchmarku nije potreban
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+
+        peak = None
+        if memory:
+            tracemalloc.start()
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    seconds = min(times)
+    return {
+        'case': name,
+        'params': params,
+        'seconds': seconds,
+        'units': units,
+        'unit': unit,
+        'throughput': units / seconds,
+        'peak_mb': None if peak is None else peak / 1024 ** 2,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(profile='quick', cases=None, repeats=REPEATS, memory=True):
+    """Pokreće slučajeve iz profila (opcionalno samo odabrane) i vraća izvještaj"""
+    selected = [(n, p) for n, p in PROFILES[profile] if cases is None or n in cases]
+    results = {}
+    for name, params in selected:
+        cid = case_id(name, params)
+        results[cid] = measure(name, params, repeats, memory)
+        r = results[cid]
+        peak = '' if r['peak_mb'] is None else f"{r['peak_mb']:>10.1f} MB"
+        print(f"{cid:<60}{r['seconds']:>10.3f} s{r['throughput']:>14,.0f} {r['unit']}/s{peak}")
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'profile': profile,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': results,
+    }
+    if memory:
+        report['memory_per_million_seasons'] = memory_report()
+        print("\nMemorija po milijunu sezona (MB):")
+        for key, value in report['memory_per_million_seasons'].items():
+            print(f"  {key:<32}{value:>12}")
+    return report
+
+
+def compare(report, baseline, threshold=THRESHOLD, memory_threshold=MEMORY_THRESHOLD):
+    """
+    Uspoređuje izvještaj s baseline izvještajem za zajedničke slučajeve.
+    Vraća listu regresija (slučaj, metrika, staro, novo).
+    """
+    regressions = []
+    for cid, new in report['results'].items():
+        old = baseline['results'].get(cid)
+        if old is None:
+            continue
+        if new['throughput'] < old['throughput'] * (1 - threshold):
+            regressions.append((cid, 'throughput', old['throughput'], new['throughput']))
+        if new['peak_mb'] is not None and old.get('peak_mb') is not None \
+                and new['peak_mb'] > old['peak_mb'] * (1 + memory_threshold):
+            regressions.append((cid, 'peak_mb', old['peak_mb'], new['peak_mb']))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profile', default='quick', choices=list(PROFILES))
+    parser.add_argument('--cases', help=f"podskup slučajeva: {','.join(CASES)}")
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--no-memory', action='store_true', help="bez mjerenja vršne memorije")
+    parser.add_argument('--out', help="JSON izlaz (zadano: benchmarks/results/<commit>.json)")
+    parser.add_argument('--baseline', help="raniji JSON izvještaj za usporedbu")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="dopušteni pad propusnosti")
+    parser.add_argument('--memory-threshold', type=float, default=MEMORY_THRESHOLD, help="dopušteni rast memorije")
+    args = parser.parse_args()
+
+    cases = args.cases.split(',') if args.cases else None
+    unknown = [c for c in cases or [] if c not in CASES]
+    if unknown:
+        parser.error(f"Nepoznati slučajevi: {', '.join(unknown)}")
+
+    report = run_suite(args.profile, cases, args.repeats, memory=not args.no_memory)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{report['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Rezultati spremljeni u {out}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.memory_threshold)
+        for cid, metric, old, new in regressions:
+            print(f"REGRESIJA {cid} {metric}: {old:,.2f} -> {new:,.2f}")
+        if regressions:
+            sys.exit(1)
+        print(f"Nema regresija u odnosu na {baseline.get('commit') or args.baseline}")
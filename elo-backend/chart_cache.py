@@ -0,0 +1,79 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+
+import matplotlib
+
+# ---- CONFIG ----
+CACHE_DIR = os.path.join('.cache', 'charts')
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+# Ključevi koji se mijenjaju pri svakom pokretanju, a ne utječu na izgled grafa
+VOLATILE_KEYS = ('metadata',)
+
+
+def _stable(data):
+    if isinstance(data, dict):
+        return {str(k): _stable(v) for k, v in data.items() if k not in VOLATILE_KEYS}
+    if isinstance(data, (list, tuple)):
+        return [_stable(v) for v in data]
+    return data
+
+
+def chart_key(name, chart_function, data, fmt, style=None):
+    """
+    Hash ulaza grafa: podaci, izvorni kod funkcije za crtanje (stil je zapisan u njoj),
+    dodatni parametri stila, verzija matplotliba i format izlaza
+    """
+    payload = json.dumps({
+        'chart': name,
+        'source': inspect.getsource(chart_function),
+        'data': _stable(data),
+        'style': style or {},
+        'matplotlib': matplotlib.__version__,
+        'format': fmt,
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cache_path(key, fmt, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{key}.{fmt}")
+
+
+def lookup(key, fmt, cache_dir=CACHE_DIR):
+    """Putanja slike u cacheu ili None; pogodak osvježava vrijeme zadnjeg korištenja"""
+    path = cache_path(key, fmt, cache_dir)
+    if not os.path.exists(path):
+        return None
+    os.utime(path)
+    return path
+
+
+def export(cached, out_path):
+    """Kopira sliku iz cachea na izlaznu putanju"""
+    if os.path.abspath(cached) != os.path.abspath(out_path):
+        shutil.copyfile(cached, out_path)
+    return out_path
+
+
+def evict(max_bytes=MAX_CACHE_BYTES, cache_dir=CACHE_DIR):
+    """Briše najdulje nekorištene slike dok cache ne padne ispod max_bytes. Vraća broj obrisanih."""
+    if not os.path.isdir(cache_dir):
+        return 0
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+        removed += 1
+    return removed
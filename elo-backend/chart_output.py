@@ -0,0 +1,19 @@
+import os
+
+import matplotlib.pyplot as plt
+
+
+def finish_figure(fig, out_path=None):
+    """
+    Prikazuje graf (interaktivno) ili ga sprema u datoteku/e i zatvara figuru.
+    out_path može biti jedna putanja ili lista putanja (npr. .png i .svg).
+    """
+    if out_path is None:
+        plt.show()
+        return None
+
+    paths = [out_path] if isinstance(out_path, (str, os.PathLike)) else list(out_path)
+    for path in paths:
+        fig.savefig(path, facecolor=fig.get_facecolor())
+    plt.close(fig)
+    return paths
@@ -0,0 +1,203 @@
+"""
+Dugi simulacijski poslovi s checkpointom: sezone se simuliraju u blokovima, a nakon
+svakog bloka na disk se atomarno zapisuju akumulator (sharding.Accumulator) i broj
+završenih blokova. Blok i ima seed SeedSequence(seed, spawn_key=(i,)), pa je stanje
+generatora određeno seedom i brojem blokova: nastavak nakon pada ili deploya daje isti
+rezultat kao neprekinuto pokretanje, a završeni posao može se produžiti većim N.
+
+Direktorij posla: state.json i, uz keep_outputs, chunk-NNNNN.npz s bodovima po sezoni.
+Pokretanje iz elo-backend direktorija:
+    python checkpoint.py jobs/duboka-analiza [--simulations N] [--mode championship|season] [--league id]
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+import metrics
+from sharding import Accumulator, MODES, league_accumulator, shard_seed, simulate_block
+from sim_config import load_sim_config
+
+# ---- CONFIG ----
+CHUNK_SIZE = 100_000  # sezona po bloku; najviše toliko se izgubi pri prekidu
+STATE_FILE = 'state.json'
+STATE_VERSION = 1
+
+
+# ---- STATE ----
+def league_signature(teams, fixtures, initial_points):
+    """Otisak ulaza: nastavak s promijenjenim Elo ratingom, rasporedom ili bodovima nije isti posao"""
+    payload = json.dumps(
+        {'teams': teams, 'fixtures': [list(f) for f in fixtures], 'initial_points': initial_points},
+        sort_keys=True, default=float,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _write_atomic(path, write):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_state(directory):
+    """Stanje posla iz state.json ili None ako posao još nije započeo"""
+    path = os.path.join(directory, STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('version') != STATE_VERSION:
+        raise ValueError(f"Nepodržana verzija checkpointa: {state.get('version')}")
+    return state
+
+
+def save_state(directory, state):
+    state['updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    payload = json.dumps(state).encode('utf-8')
+    _write_atomic(os.path.join(directory, STATE_FILE), lambda f: f.write(payload))
+
+
+def chunk_path(directory, index):
+    return os.path.join(directory, f"chunk-{index:05d}.npz")
+
+
+def _check_resume(state, signature, mode, k, sampling, seed, keep_outputs):
+    spec = state['spec']
+    if state['league_signature'] != signature:
+        raise ValueError("Checkpoint je za druge ulazne podatke (Elo, raspored ili bodovi su se promijenili)")
+    for name, value in (('mode', mode), ('k', float(k)), ('sampling', sampling)):
+        if spec[name] != value:
+            raise ValueError(f"Checkpoint ima {name}={spec[name]}, zadano {value}")
+    if seed is not None and spec['seed'] != seed:
+        raise ValueError(f"Checkpoint ima seed={spec['seed']}, zadano {seed}")
+    if keep_outputs and not state['outputs']:
+        raise ValueError("Checkpoint je pokrenut bez keep_outputs; bodovi po sezoni nisu spremljeni")
+
+
+# ---- RUN ----
+def run_checkpointed(directory, teams, fixtures, initial_points, num_simulations, mode='championship', k=None,
+                     sampling='random', seed=None, chunk_size=CHUNK_SIZE, keep_outputs=False, progress=None):
+    """
+    Simulira dok posao u directory ne obuhvati num_simulations sezona i vraća Accumulator.
+    Postojeći checkpoint se nastavlja (ili produžuje ako je num_simulations veći od
+    završenog); parametri moraju odgovarati onima s kojima je posao započeo, a seed i
+    veličina bloka uzimaju se iz checkpointa. Posao se ne skraćuje: ako je već završeno
+    više od num_simulations sezona, ValueError.
+    k: None uzima K iz sim_config.json (kod nastavka mora odgovarati K-u iz checkpointa)
+    keep_outputs: spremi i bodove po sezoni (load_outputs), ne samo akumulator
+    progress: opcionalno progress(završeno, ukupno) nakon svakog bloka
+    """
+    if mode not in MODES:
+        raise ValueError(f"Nepoznat način: {mode} (dostupno: {', '.join(MODES)})")
+    k = load_sim_config()['k'] if k is None else k
+
+    os.makedirs(directory, exist_ok=True)
+    signature = league_signature(teams, fixtures, initial_points)
+    state = load_state(directory)
+    if state is None:
+        state = {
+            'version': STATE_VERSION,
+            'spec': {
+                'mode': mode,
+                'k': float(k),
+                'sampling': sampling,
+                'seed': int(np.random.SeedSequence().entropy if seed is None else seed),
+                'chunk_size': int(chunk_size),
+            },
+            'league_signature': signature,
+            'outputs': bool(keep_outputs),
+            'chunks': [],
+            'accumulator': league_accumulator(teams, fixtures, initial_points, mode).to_dict(),
+        }
+        save_state(directory, state)
+    else:
+        _check_resume(state, signature, mode, k, sampling, seed, keep_outputs)
+
+    spec = state['spec']
+    acc = Accumulator.from_dict(state['accumulator'])
+    done = sum(state['chunks'])
+    if done > num_simulations:
+        raise ValueError(f"Posao u {directory} već ima {done} sezona, zadano {num_simulations}; posao se ne skraćuje")
+    while done < num_simulations:
+        index = len(state['chunks'])
+        size = min(spec['chunk_size'], num_simulations - done)
+        start = time.perf_counter()
+        points, champions = simulate_block(
+            teams, fixtures, initial_points, spec['mode'], size, spec['k'], spec['sampling'], shard_seed(spec, index)
+        )
+        acc.add(points, champions)
+
+        # Blok se prvo zapisuje, a tek onda stanje koje ga uključuje
+        if state['outputs']:
+            arrays = {'points': points} if champions is None else {'points': points, 'champions': champions}
+            _write_atomic(chunk_path(directory, index), lambda f: np.savez_compressed(f, **arrays))
+        state['chunks'].append(size)
+        state['accumulator'] = acc.to_dict()
+        save_state(directory, state)
+
+        metrics.record_simulation(f"checkpoint-{spec['mode']}", size, time.perf_counter() - start)
+        done += size
+        if progress:
+            progress(done, num_simulations)
+
+    return acc
+
+
+def load_outputs(directory):
+    """Bodovi po sezoni iz posla s keep_outputs: (imena timova, bodovi (S, T), u ligi za prvaka (S, T) ili None)"""
+    state = load_state(directory)
+    if state is None or not state['outputs']:
+        raise ValueError(f"U {directory} nema spremljenih bodova po sezoni")
+
+    points, champions = [], []
+    for index in range(len(state['chunks'])):
+        with np.load(chunk_path(directory, index)) as data:
+            points.append(data['points'])
+            if 'champions' in data:
+                champions.append(data['champions'])
+    names = state['accumulator']['names']
+    if not points:
+        return names, np.empty((0, len(names))), None
+    return names, np.concatenate(points), np.concatenate(champions) if champions else None
+
+
+if __name__ == '__main__':
+    from leagues import load_league
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directory', help="direktorij posla (nastavlja se ako postoji)")
+    parser.add_argument('--league')
+    parser.add_argument('--simulations', type=int, default=1_000_000)
+    parser.add_argument('--mode', default='championship', choices=MODES)
+    parser.add_argument('--sampling', default='random')
+    parser.add_argument('--k', type=float, help="zadano: K iz sim_config.json")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--keep-outputs', action='store_true', help="spremi i bodove po sezoni")
+    args = parser.parse_args()
+
+    league = load_league(args.league) if args.league else load_league()
+    started = time.perf_counter()
+
+    def report(done, total):
+        print(f"\r{done:,} / {total:,} sezona ({time.perf_counter() - started:.0f}s)", end='', flush=True)
+
+    acc = run_checkpointed(
+        args.directory, league['teams'], league['fixtures'], league['initial_points'], args.simulations,
+        mode=args.mode, k=args.k, sampling=args.sampling, seed=args.seed, chunk_size=args.chunk_size,
+        keep_outputs=args.keep_outputs, progress=report,
+    )
+    print()
+
+    summary = acc.summary()
+    print(f"{'Tim':<20}{'Prvi %':>8}{'Liga prvaka %':>15}{'Bodovi':>8}{'SD':>6}")
+    for team, stats in sorted(summary['teams'].items(), key=lambda x: -x[1]['average_points']):
+        print(f"{team:<20}{stats['position_probabilities'][0]:>8.2f}{stats['championship_group_probability']:>15.2f}"
+              f"{stats['average_points']:>8.2f}{stats['std_points']:>6.2f}")
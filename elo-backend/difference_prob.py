@@ -1,57 +1,88 @@
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
-# MOCK podaci: stare i nove vjerojatnosti (po redu s grafa)
-teams = [
-    "Zadrugar", "Mladost SL", "Nova Ves", "Plitvica", "Mladost VT", "Zelengaj",
-    "Semovec", "Beretinec", "Drava", "Dubravka", "Sloboda", "Obres"
-]
+from prob_history import compute_deltas
 
-old_probs = [99.9, 99.8, 94.5, 12.2, 54.7, 98.9, 14.4, 82.2, 35.8, 5.1, 0.6, 1.9]
-new_probs = [100.0, 100.0, 97.5, 8.7, 46.2, 98.1, 31.1, 77.2, 24.6, 13.0, 3.4, 0.2]
+METRIC_TITLES = {
+    'top6': 'TOP 6',
+    'champion': 'prvaka',
+    'last_place': 'zadnje mjesto',
+}
 
-# Izračun promjene
-changes = [new - old for new, old in zip(new_probs, old_probs)]
 
-# Sortiranje tako da su pozitivni na vrhu
-df = pd.DataFrame({"Klub": teams, "Promjena": changes})
-df = df[df["Promjena"].abs() >= 2].sort_values("Promjena", ascending=False, ignore_index=True)
+def render_delta_chart(deltas, metric='top6', out_path=None, min_change=2):
+    """
+    Crta najveće promjene vjerojatnosti između dva kola i sprema sliku.
+    Vraća putanju spremljene slike ili None ako nema dovoljno velikih promjena.
+    """
+    rows = [
+        {"Klub": entry['team'], "Promjena": entry[metric]['delta']}
+        for entry in deltas['teams']
+        if entry[metric]['delta'] is not None
+    ]
 
-# Boje: pozitivno = tamno zelena, negativno = tamno crvena
-colors = ['#2ecc40' if x > 0 else '#d62d2d' for x in df['Promjena']]
+    # Sortiranje tako da su pozitivni na vrhu
+    df = pd.DataFrame(rows, columns=["Klub", "Promjena"])
+    df = df[df["Promjena"].abs() >= min_change].sort_values("Promjena", ascending=False, ignore_index=True)
+    if df.empty:
+        return None
 
-fig, ax = plt.subplots(figsize=(14, 8))
-bars = ax.barh(df['Klub'], df['Promjena'],
-               color=colors, edgecolor="#222", linewidth=2, alpha=0.96,
-               height=0.65)
+    # Boje: pozitivno = tamno zelena, negativno = tamno crvena
+    colors = ['#2ecc40' if x > 0 else '#d62d2d' for x in df['Promjena']]
 
-# Grid, okomita linija na 0
-ax.xaxis.grid(True, which='major', linestyle='--', linewidth=1.5, color='#cccccc', alpha=0.6)
-ax.axvline(0, color='gray', linestyle='--', lw=1.8)
+    fig, ax = plt.subplots(figsize=(14, 8))
+    bars = ax.barh(df['Klub'], df['Promjena'],
+                   color=colors, edgecolor="#222", linewidth=2, alpha=0.96,
+                   height=0.65)
 
-# Dodaj value label iznad svakog bara s laganim offsetom
-for i, (bar, change) in enumerate(zip(bars, df["Promjena"])):
-    if change < 0:
-        xpos = bar.get_width() * 0.05  # malo desno unutar bara
-        ax.text(xpos, bar.get_y() + bar.get_height()/2,
-                f"{change:+.2f} %", va='center', ha='left',
-                fontsize=19, fontweight='bold', color='#222')
-    else:
-        xpos = bar.get_width() + 0.5
+    # Grid, okomita linija na 0
+    ax.xaxis.grid(True, which='major', linestyle='--', linewidth=1.5, color='#cccccc', alpha=0.6)
+    ax.axvline(0, color='gray', linestyle='--', lw=1.8)
+
+    # Dodaj value label iznad svakog bara s laganim offsetom
+    for bar, change in zip(bars, df["Promjena"]):
+        if change < 0:
+            xpos = bar.get_width() * 0.05  # malo desno unutar bara
+        else:
+            xpos = bar.get_width() + 0.5
         ax.text(xpos, bar.get_y() + bar.get_height()/2,
                 f"{change:+.2f} %", va='center', ha='left',
                 fontsize=19, fontweight='bold', color='#222')
 
-# Podesi stil osi i legendu
-ax.set_title("Najveće promjene vjerojatnosti za TOP 6 (kolo 7)", fontsize=26, weight='bold', pad=15)
-ax.set_xlabel("Promjena vjerojatnosti (%)", fontsize=18, labelpad=10)
-ax.set_yticklabels(df['Klub'], fontsize=17, fontweight='bold')
-ax.tick_params(axis='x', labelsize=14)
-plt.gca().invert_yaxis()
+    # Podesi stil osi i legendu
+    title = METRIC_TITLES.get(metric, metric)
+    ax.set_title(f"Najveće promjene vjerojatnosti za {title} (kolo {deltas['round']})",
+                 fontsize=26, weight='bold', pad=15)
+    ax.set_xlabel("Promjena vjerojatnosti (%)", fontsize=18, labelpad=10)
+    ax.set_yticks(np.arange(len(df)))
+    ax.set_yticklabels(df['Klub'], fontsize=17, fontweight='bold')
+    ax.tick_params(axis='x', labelsize=14)
+    ax.invert_yaxis()
+
+    fig.patch.set_facecolor('#f6f8fa')
+    ax.set_facecolor('#f6fcf6')
 
-fig.patch.set_facecolor('#f6f8fa')
-ax.set_facecolor('#f6fcf6')
+    fig.tight_layout(pad=4)
 
-plt.tight_layout(pad=4)
-plt.show()
\ No newline at end of file
+    if out_path is None:
+        out_path = f"promjene_{metric}_kolo{deltas['round']}.png"
+    fig.savefig(out_path, facecolor=fig.get_facecolor())
+    plt.close(fig)
+    return out_path
+
+
+if __name__ == '__main__':
+    import sys
+
+    round_no = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    metric = sys.argv[2] if len(sys.argv) > 2 else 'top6'
+
+    deltas = compute_deltas(round_no)
+    if deltas is None:
+        print("Nema dva spremljena kola za usporedbu (pokreni prob_history.py nakon unosa kola)")
+    else:
+        path = render_delta_chart(deltas, metric=metric)
+        print(f"Graf spremljen: {path}" if path else "Nema promjena većih od praga")
@@ -0,0 +1,232 @@
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+# ---- CONFIG ----
+HISTORY_FILE = 'elo_history.npz'
+CHECKPOINT_EVERY = 64  # full rating vector every N matches
+
+
+# ---- DATES ----
+def _parse_date(value):
+    if isinstance(value, (datetime.date, pd.Timestamp)):
+        return pd.Timestamp(value).normalize()
+    text = str(value).strip().rstrip('.')
+    if len(text) >= 10 and text[4] == '-':
+        return pd.to_datetime(text[:10], format='%Y-%m-%d', errors='coerce')
+    return pd.to_datetime(text, dayfirst=True, errors='coerce')
+
+
+def parse_match_dates(values):
+    """Parses the mixed date column (Excel datetimes and 'dd.mm.yyyy.' strings) to datetime64[D]"""
+    values = pd.Series(values)
+    parsed = {v: _parse_date(v) for v in values.dropna().unique()}
+    return pd.to_datetime(values.map(parsed)).to_numpy(dtype='datetime64[D]')
+
+
+# ---- STORE ----
+class RatingHistory:
+    """
+    Columnar pre/post Elo log for every match, in replay order.
+    Point-in-time queries: binary search on match dates, start from the nearest
+    full-rating checkpoint and replay at most CHECKPOINT_EVERY matches.
+    """
+
+    def __init__(self, arrays):
+        self.teams = [str(t) for t in arrays['teams']]
+        self.team_ids = {t: i for i, t in enumerate(self.teams)}
+        self.dates = arrays['dates']
+        self.home_id = arrays['home_id']
+        self.away_id = arrays['away_id']
+        self.home_score = arrays['home_score']
+        self.away_score = arrays['away_score']
+        self.home_pre = arrays['home_pre']
+        self.away_pre = arrays['away_pre']
+        self.home_post = arrays['home_post']
+        self.away_post = arrays['away_post']
+        self.checkpoint_idx = arrays['checkpoint_idx']
+        self.checkpoint_ratings = arrays['checkpoint_ratings']
+        self.team_ptr = arrays['team_ptr']
+        self.team_matches = arrays['team_matches']
+        # Replay order is authoritative; postponed matches can make dates go backwards,
+        # so searches use the running maximum of the match date
+        self.search_dates = np.maximum.accumulate(self.dates) if len(self.dates) else self.dates
+
+    # -- building --
+    @classmethod
+    def from_matchlog(cls, logdf, initial_ratings, checkpoint_every=CHECKPOINT_EVERY):
+        """
+        logdf: matchlog from run.compute_season_elo (home, away, hs, as, date, *_pre, *_post)
+        initial_ratings: dict of ratings before the first match (missing teams take the first pre value)
+        """
+        teams = sorted(set(logdf['home']) | set(logdf['away']) | set(initial_ratings))
+        ids = {t: i for i, t in enumerate(teams)}
+        home_id = logdf['home'].map(ids).to_numpy(dtype=np.int32)
+        away_id = logdf['away'].map(ids).to_numpy(dtype=np.int32)
+        home_pre = logdf['home_pre'].to_numpy(dtype=float)
+        away_pre = logdf['away_pre'].to_numpy(dtype=float)
+        home_post = logdf['home_post'].to_numpy(dtype=float)
+        away_post = logdf['away_post'].to_numpy(dtype=float)
+
+        n = len(logdf)
+        both_ids = np.concatenate([home_id, away_id])
+        both_matches = np.concatenate([np.arange(n), np.arange(n)])
+
+        # Starting vector: explicit initial rating or the pre-rating of the first match played
+        start = np.full(len(teams), np.nan)
+        for t, r in initial_ratings.items():
+            start[ids[t]] = r
+        by_match = np.argsort(both_matches, kind='stable')
+        seen, first = np.unique(both_ids[by_match], return_index=True)
+        first_pre = np.concatenate([home_pre, away_pre])[by_match][first]
+        missing = np.isnan(start[seen])
+        start[seen[missing]] = first_pre[missing]
+
+        # Periodic checkpoints of the full rating vector
+        checkpoint_idx = np.arange(0, n + 1, checkpoint_every, dtype=np.int64)
+        checkpoint_ratings = np.empty((len(checkpoint_idx), len(teams)))
+        current = start.copy()
+        done = 0
+        for c, idx in enumerate(checkpoint_idx):
+            for i in range(done, idx):
+                current[home_id[i]] = home_post[i]
+                current[away_id[i]] = away_post[i]
+            done = idx
+            checkpoint_ratings[c] = current
+
+        team_ptr, team_matches = _team_index(home_id, away_id, len(teams))
+
+        return cls({
+            'teams': np.array(teams),
+            'dates': pd.Series(parse_match_dates(logdf['date'])).ffill().bfill().to_numpy(dtype='datetime64[D]'),
+            'home_id': home_id, 'away_id': away_id,
+            'home_score': logdf['hs'].to_numpy(dtype=np.int16),
+            'away_score': logdf['as'].to_numpy(dtype=np.int16),
+            'home_pre': home_pre, 'away_pre': away_pre,
+            'home_post': home_post, 'away_post': away_post,
+            'checkpoint_idx': checkpoint_idx,
+            'checkpoint_ratings': checkpoint_ratings,
+            'team_ptr': team_ptr,
+            'team_matches': team_matches,
+        })
+
+    def append(self, logdf, checkpoint_every=CHECKPOINT_EVERY):
+        """
+        New store with the matches of logdf (same columns as from_matchlog) appended
+        in replay order. Existing team ids and checkpoints are kept; new teams get
+        the next ids and no rating before their first match.
+        """
+        new_teams = sorted((set(logdf['home']) | set(logdf['away'])) - set(self.team_ids))
+        teams = self.teams + new_teams
+        ids = {t: i for i, t in enumerate(teams)}
+        home_id = np.concatenate([self.home_id, logdf['home'].map(ids).to_numpy(dtype=np.int32)])
+        away_id = np.concatenate([self.away_id, logdf['away'].map(ids).to_numpy(dtype=np.int32)])
+        home_post = np.concatenate([self.home_post, logdf['home_post'].to_numpy(dtype=float)])
+        away_post = np.concatenate([self.away_post, logdf['away_post'].to_numpy(dtype=float)])
+        dates = np.concatenate([self.dates, parse_match_dates(logdf['date'])])
+
+        # Continue the checkpoints from the last existing one
+        n = len(home_id)
+        checkpoint_ratings = np.pad(self.checkpoint_ratings, ((0, 0), (0, len(new_teams))), constant_values=np.nan)
+        new_idx = np.arange(int(self.checkpoint_idx[-1]) + checkpoint_every, n + 1, checkpoint_every, dtype=np.int64)
+        current = checkpoint_ratings[-1].copy()
+        done = int(self.checkpoint_idx[-1])
+        rows = []
+        for idx in new_idx:
+            for i in range(done, idx):
+                current[home_id[i]] = home_post[i]
+                current[away_id[i]] = away_post[i]
+            done = idx
+            rows.append(current.copy())
+
+        team_ptr, team_matches = _team_index(home_id, away_id, len(teams))
+        return RatingHistory({
+            'teams': np.array(teams),
+            'dates': pd.Series(dates).ffill().bfill().to_numpy(dtype='datetime64[D]'),
+            'home_id': home_id, 'away_id': away_id,
+            'home_score': np.concatenate([self.home_score, logdf['hs'].to_numpy(dtype=np.int16)]),
+            'away_score': np.concatenate([self.away_score, logdf['as'].to_numpy(dtype=np.int16)]),
+            'home_pre': np.concatenate([self.home_pre, logdf['home_pre'].to_numpy(dtype=float)]),
+            'away_pre': np.concatenate([self.away_pre, logdf['away_pre'].to_numpy(dtype=float)]),
+            'home_post': home_post, 'away_post': away_post,
+            'checkpoint_idx': np.concatenate([self.checkpoint_idx, new_idx]),
+            'checkpoint_ratings': np.vstack([checkpoint_ratings] + rows),
+            'team_ptr': team_ptr,
+            'team_matches': team_matches,
+        })
+
+    def save(self, path=HISTORY_FILE):
+        tmp_path = path + '.tmp.npz'
+        np.savez(
+            tmp_path,
+            teams=np.array(self.teams), dates=self.dates,
+            home_id=self.home_id, away_id=self.away_id,
+            home_score=self.home_score, away_score=self.away_score,
+            home_pre=self.home_pre, away_pre=self.away_pre,
+            home_post=self.home_post, away_post=self.away_post,
+            checkpoint_idx=self.checkpoint_idx, checkpoint_ratings=self.checkpoint_ratings,
+            team_ptr=self.team_ptr, team_matches=self.team_matches,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=HISTORY_FILE):
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+    # -- queries --
+    def ratings_as_of(self, date):
+        """Ratings of all teams after every match played on or before `date`"""
+        n = int(np.searchsorted(self.search_dates, np.datetime64(date, 'D'), side='right'))
+        c = int(np.searchsorted(self.checkpoint_idx, n, side='right')) - 1
+        ratings = self.checkpoint_ratings[c].copy()
+        for i in range(int(self.checkpoint_idx[c]), n):
+            ratings[self.home_id[i]] = self.home_post[i]
+            ratings[self.away_id[i]] = self.away_post[i]
+        return {t: float(r) for t, r in zip(self.teams, ratings) if not np.isnan(r)}
+
+    def team_trajectory(self, team, start=None, end=None):
+        """Post-match Elo of one team, optionally limited to [start, end] dates"""
+        t = self.team_ids[team]
+        matches = self.team_matches[self.team_ptr[t]:self.team_ptr[t + 1]]
+        match_dates = self.search_dates[matches]
+        lo = int(np.searchsorted(match_dates, np.datetime64(start, 'D'), side='left')) if start else 0
+        hi = int(np.searchsorted(match_dates, np.datetime64(end, 'D'), side='right')) if end else len(matches)
+        matches = matches[lo:hi]
+
+        is_home = self.home_id[matches] == t
+        return pd.DataFrame({
+            'date': self.dates[matches],
+            'opponent': np.array(self.teams)[np.where(is_home, self.away_id[matches], self.home_id[matches])],
+            'home': is_home,
+            'goals_for': np.where(is_home, self.home_score[matches], self.away_score[matches]),
+            'goals_against': np.where(is_home, self.away_score[matches], self.home_score[matches]),
+            'elo_pre': np.where(is_home, self.home_pre[matches], self.away_pre[matches]),
+            'elo_post': np.where(is_home, self.home_post[matches], self.away_post[matches]),
+        })
+
+
+def _team_index(home_id, away_id, num_teams):
+    """Per-team match index (CSR layout): matches of team t are team_matches[team_ptr[t]:team_ptr[t + 1]]"""
+    n = len(home_id)
+    both_ids = np.concatenate([home_id, away_id])
+    both_matches = np.concatenate([np.arange(n), np.arange(n)])
+    order = np.lexsort((both_matches, both_ids))
+    team_matches = both_matches[order].astype(np.int64)
+    team_ptr = np.concatenate([[0], np.cumsum(np.bincount(both_ids, minlength=num_teams))]).astype(np.int64)
+    return team_ptr, team_matches
+
+
+_cache = {}
+
+
+def load_history(path=HISTORY_FILE):
+    """Loads the store once per file modification (shared by API requests)"""
+    mtime = os.path.getmtime(path)
+    cached = _cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, RatingHistory.load(path))
+        _cache[path] = cached
+    return cached[1]
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+
+# ---- TEAM ENCODING ----
+def encode_teams(df, teams=None):
+    """Maps homeTeam/awayTeam to integer IDs. Returns (team list, home_ids, away_ids)."""
+    if teams is None:
+        teams = sorted(set(df['homeTeam']) | set(df['awayTeam']))
+    home_ids = pd.Categorical(df['homeTeam'], categories=teams).codes.astype(np.intp)
+    away_ids = pd.Categorical(df['awayTeam'], categories=teams).codes.astype(np.intp)
+    return list(teams), home_ids, away_ids
+
+
+# ---- REPLAY KERNEL ----
+def replay(home_ids, away_ids, home_scores, away_scores, initial_ratings, k=20, home_adv=50):
+    """
+    Replays matches in order over integer team IDs.
+    Same arithmetic as run.elo_update, but result points and margin K are computed
+    for all matches at once and the pre/post log goes into preallocated arrays.
+    Returns (final ratings, home_pre, away_pre, home_post, away_post).
+    """
+    n = len(home_ids)
+    home_scores = np.asarray(home_scores, dtype=float)
+    away_scores = np.asarray(away_scores, dtype=float)
+
+    # result_points and margin_k, vectorized
+    pts_home = np.where(home_scores > away_scores, 1.0, np.where(home_scores == away_scores, 0.5, 0.0))
+    pts_away = 1.0 - pts_home
+    margin = np.abs(home_scores - away_scores).astype(np.int64)
+    use_k = np.where(margin > 1, k + 5 * (margin - 1), k).astype(float)
+
+    home_pre = np.empty(n)
+    away_pre = np.empty(n)
+    home_post = np.empty(n)
+    away_post = np.empty(n)
+
+    rating = [float(r) for r in initial_ratings]
+    h_list = np.asarray(home_ids).tolist()
+    a_list = np.asarray(away_ids).tolist()
+    k_list = use_k.tolist()
+    p1_list = pts_home.tolist()
+    p2_list = pts_away.tolist()
+
+    for i in range(n):
+        h = h_list[i]
+        a = a_list[i]
+        rh = rating[h]
+        ra = rating[a]
+        rha = rh + home_adv
+        exp1 = 1 / (1 + 10 ** ((ra - rha) / 400))
+        exp2 = 1 / (1 + 10 ** ((rha - ra) / 400))
+        new_rh = rh + k_list[i] * (p1_list[i] - exp1)
+        new_ra = ra + k_list[i] * (p2_list[i] - exp2)
+        home_pre[i] = rh
+        away_pre[i] = ra
+        home_post[i] = new_rh
+        away_post[i] = new_ra
+        rating[h] = new_rh
+        rating[a] = new_ra
+
+    return np.array(rating), home_pre, away_pre, home_post, away_post
+
+
+# ---- DATAFRAME WRAPPER ----
+def replay_frame(df, rating_dict, default_elo, k=20, home_adv=50):
+    """
+    Replays a match frame (homeTeam, awayTeam, homeScore, awayScore) on top of rating_dict.
+    Clubs missing from rating_dict start at default_elo.
+    Returns (new rating dict, log arrays dict).
+    """
+    teams = sorted(set(rating_dict) | set(df['homeTeam']) | set(df['awayTeam']))
+    teams, home_ids, away_ids = encode_teams(df, teams)
+    initial = [rating_dict.get(t, default_elo) for t in teams]
+
+    final, home_pre, away_pre, home_post, away_post = replay(
+        home_ids, away_ids, df['homeScore'].to_numpy(), df['awayScore'].to_numpy(),
+        initial, k=k, home_adv=home_adv
+    )
+    ratings = {t: float(r) for t, r in zip(teams, final)}
+    log = {
+        'home_pre': home_pre, 'away_pre': away_pre,
+        'home_post': home_post, 'away_post': away_post,
+    }
+    return ratings, log
@@ -0,0 +1,169 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from jit_kernel import pool_context
+from rounds import load_all_rounds
+from sim_config import save_sim_config
+from team_registry import team_ids
+from workbook_cache import load_results
+
+# ---- CONFIG ----
+EXCEL_PATH = 'result2425.xlsx'
+INITIAL_ELO = 1500
+
+K_GRID = np.arange(10, 61, 5)
+HOME_ADV_GRID = np.arange(0, 151, 10)
+DRAW_BAND_GRID = np.round(np.arange(0.10, 0.41, 0.01), 2)
+
+BURN_IN = 30  # prve utakmice se ne boduju, ratinzi se tek slažu
+EPS = 1e-12
+METRICS = ('log_loss', 'brier')
+
+
+# ---- DATA ----
+def load_match_history(excel_path=EXCEL_PATH, rounds_dir='.'):
+    """
+    Sve odigrane utakmice redom: sezona iz Excela pa kola iz CSV-ova.
+    Vraća (home_ids, away_ids, home_scores, away_scores, season).
+    """
+    frames = []
+    if os.path.exists(excel_path):
+        frames.append(load_results(excel_path).assign(season=0))
+    new_rounds = load_all_rounds(rounds_dir)
+    if len(new_rounds):
+        frames.append(new_rounds.assign(season=len(frames)))
+    if not frames:
+        raise FileNotFoundError("Nema povijesnih utakmica za fitanje")
+
+    df = pd.concat(frames, ignore_index=True)
+    return (
+        team_ids(df['homeTeam']), team_ids(df['awayTeam']),
+        df['homeScore'].to_numpy(dtype=float), df['awayScore'].to_numpy(dtype=float),
+        df['season'].to_numpy(),
+    )
+
+
+# ---- SCORING ----
+def score_grid(history, ks, home_advs, draw_bands, burn_in=BURN_IN):
+    """
+    Replay svih utakmica za P = len(ks) parova (K, prednost domaćina) odjednom:
+    ratinzi su matrica (P, T), a svaka utakmica ažurira jedan par stupaca.
+    Predikcija je ista kao u simulate_match: P(H) = p, P(X) = min(d, 1 - p),
+    P(A) = ostatak, za svaki pojas remija d (D os).
+    Vraća (log_loss (P, D), brier (P, D), broj bodovanih utakmica).
+    """
+    home_ids, away_ids, home_scores, away_scores, season = history
+    ks = np.asarray(ks, dtype=float)
+    home_advs = np.asarray(home_advs, dtype=float)
+    draw_bands = np.asarray(draw_bands, dtype=float)
+
+    num_teams = int(max(home_ids.max(), away_ids.max())) + 1
+    ratings = np.full((len(ks), num_teams), float(INITIAL_ELO))
+    seen = np.zeros(num_teams, dtype=bool)
+
+    # Ishod i K ovisan o razlici golova (kao run.margin_k), jednom za sve utakmice
+    outcome = np.where(home_scores > away_scores, 0, np.where(home_scores == away_scores, 1, 2))
+    pts_home = np.array([1.0, 0.5, 0.0])[outcome]
+    margin = np.abs(home_scores - away_scores)
+    margin_extra = np.where(margin > 1, 5 * (margin - 1), 0.0)
+
+    log_loss = np.zeros((len(ks), len(draw_bands)))
+    brier = np.zeros((len(ks), len(draw_bands)))
+    scored = 0
+
+    for i in range(len(home_ids)):
+        h, a = home_ids[i], away_ids[i]
+        for team in (h, a):
+            if not seen[team]:
+                # Novi klub u kasnijoj sezoni kreće od najslabijeg postojećeg ratinga
+                if season[i] > 0 and seen.any():
+                    ratings[:, team] = ratings[:, seen].min(axis=1)
+                seen[team] = True
+
+        rh, ra = ratings[:, h], ratings[:, a]
+        p_home = 1 / (1 + 10 ** ((ra - rh - home_advs) / 400))
+
+        if i >= burn_in:
+            p = p_home[:, None]
+            p_draw = np.minimum(draw_bands[None, :], 1 - p)
+            p_away = np.maximum(1 - p - draw_bands[None, :], 0)
+            probs = (p, p_draw, p_away)
+
+            log_loss -= np.log(np.clip(probs[outcome[i]], EPS, 1))
+            brier += sum((probs[o] - (o == outcome[i])) ** 2 for o in range(3))
+            scored += 1
+
+        change = (ks + margin_extra[i]) * (pts_home[i] - p_home)
+        ratings[:, h] = rh + change
+        ratings[:, a] = ra - change
+
+    scored = max(scored, 1)
+    return log_loss / scored, brier / scored, scored
+
+
+def _score_chunk(args):
+    history, params, draw_bands = args
+    ks, home_advs = params[:, 0], params[:, 1]
+    return score_grid(history, ks, home_advs, draw_bands)
+
+
+def fit(history=None, k_grid=K_GRID, home_adv_grid=HOME_ADV_GRID, draw_band_grid=DRAW_BAND_GRID,
+        metric='log_loss', max_workers=None):
+    """
+    Grid search po (K, prednost domaćina, pojas remija). (K, prednost) parovi se
+    dijele na blokove po procesima, a pojas remija se boduje unutar istog replaya.
+    Vraća (najbolji parametri, rezultat, broj bodovanih utakmica).
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Nepoznata metrika: {metric} (dostupno: {', '.join(METRICS)})")
+    history = load_match_history() if history is None else history
+
+    params = np.array(list(product(k_grid, home_adv_grid)), dtype=float)
+    max_workers = max_workers or os.cpu_count() or 1
+    chunks = [c for c in np.array_split(params, max_workers) if len(c)]
+
+    with ProcessPoolExecutor(max_workers=len(chunks), mp_context=pool_context()) as pool:
+        results = list(pool.map(_score_chunk, [(history, c, draw_band_grid) for c in chunks]))
+
+    scores = np.vstack([r[0] if metric == 'log_loss' else r[1] for r in results])
+    scored = results[0][2]
+
+    best_param, best_band = np.unravel_index(np.argmin(scores), scores.shape)
+    best = {
+        'k': int(params[best_param, 0]),
+        'home_advantage': int(params[best_param, 1]),
+        'draw_band': float(draw_band_grid[best_band]),
+    }
+    return best, float(scores[best_param, best_band]), scored
+
+
+if __name__ == '__main__':
+    metric = sys.argv[1] if len(sys.argv) > 1 else 'log_loss'
+    best, score, scored = fit(metric=metric)
+
+    print(f"Najbolji parametri ({metric} = {score:.4f}, {scored} utakmica):")
+    for key, value in best.items():
+        print(f"  {key:<15}{value}")
+
+    save_sim_config(
+        best, metric=metric, score=round(score, 6), matches_scored=scored,
+        fitted_at=pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
+    )
+    print("Spremljeno u sim_config.json")
+
+    # Ratinzi u ledgeru izgrađeni su starim parametrima; novi K vrijedi za sve utakmice tek nakon replaya
+    import ledger
+    if os.path.exists(ledger.LEDGER_FILE):
+        conn = ledger.connect()
+        try:
+            replayed = ledger.replay_all(conn)
+            print(f"Ledger ponovno izračunat s novim parametrima ({replayed} utakmica)")
+        except ValueError as e:
+            print(f"Ledger nije ponovno izračunat: {e}")
+        finally:
+            conn.close()
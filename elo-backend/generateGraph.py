@@ -6,6 +6,8 @@ import json
 import requests
 from typing import Dict, Any
 
+from chart_output import finish_figure
+
 
 
 # Set modern font globally
@@ -112,12 +114,13 @@ def get_green_gradient_colors(values, reverse=False):
 
 
 
-def create_champions_league_chart(raw_data: Dict[str, Any]):
+def create_champions_league_chart(raw_data: Dict[str, Any], out_path=None):
     """
     Create Champions League projected points chart (Top 6 teams after 27 rounds)
     
     Args:
         raw_data: Raw JSON data from API/file
+        out_path: File path(s) to save the chart to; shown interactively if None
     """
     if 'champions_league' not in raw_data:
         print("Champions league data not found in API response")
@@ -175,15 +178,16 @@ def create_champions_league_chart(raw_data: Dict[str, Any]):
     ax.legend(loc='lower right')
     
     plt.tight_layout()
-    plt.show()
+    finish_figure(fig, out_path)
 
 
-def create_relegation_league_chart(raw_data: Dict[str, Any]):
+def create_relegation_league_chart(raw_data: Dict[str, Any], out_path=None):
     """
     Create Relegation League projected points chart (Bottom 6 teams after 27 rounds)
     
     Args:
         raw_data: Raw JSON data from API/file
+        out_path: File path(s) to save the chart to; shown interactively if None
     """
     if 'relegation_league' not in raw_data:
         print("Relegation league data not found in API response")
@@ -241,28 +245,22 @@ def create_relegation_league_chart(raw_data: Dict[str, Any]):
     ax.legend(loc='lower right')
     
     plt.tight_layout()
-    plt.show()
+    finish_figure(fig, out_path)
 
 
 
-def create_visualizations(simulation_data: Dict[str, Dict[str, Any]]):
-    """
-    Create all four visualizations from simulation data
-    
-    Args:
-        simulation_data: Dictionary containing team statistics
-    """
+def position_probability_frame(simulation_data: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """Position probabilities as a teams x positions DataFrame"""
     teams = list(simulation_data.keys())
-    positions = list(range(1, 13))
-    
-    # Prepare data for position probabilities heatmap
-    prob_matrix = []
-    for team in teams:
-        prob_matrix.append(simulation_data[team]["all_position_probabilities"])
-    
-    df_positions = pd.DataFrame(prob_matrix, index=teams, columns=positions)
-    
-    # PLOT 1: Position Probabilities Heatmap
+    prob_matrix = [simulation_data[team]["all_position_probabilities"] for team in teams]
+    positions = list(range(1, len(prob_matrix[0]) + 1)) if prob_matrix else []
+    return pd.DataFrame(prob_matrix, index=teams, columns=positions)
+
+
+def create_position_heatmap(simulation_data: Dict[str, Dict[str, Any]], out_path=None):
+    """PLOT 1: Position Probabilities Heatmap"""
+    df_positions = position_probability_frame(simulation_data)
+
     fig, ax = plt.subplots(figsize=(12, 8))
     sns.heatmap(
         df_positions,
@@ -287,9 +285,11 @@ def create_visualizations(simulation_data: Dict[str, Dict[str, Any]]):
     
     plt.tight_layout(pad=2)
     plt.subplots_adjust(left=0.25, right=0.98, top=0.88, bottom=0.07)
-    plt.show()
-    
-    # PLOT 2: Champion Probabilities Bar Chart
+    finish_figure(fig, out_path)
+
+def create_champion_chart(simulation_data: Dict[str, Dict[str, Any]], out_path=None):
+    """PLOT 2: Champion Probabilities Bar Chart"""
+    teams = list(simulation_data.keys())
     fig, ax = plt.subplots(figsize=(12, 8))
     champion_probs = [simulation_data[team]["champion_probability"] for team in teams]
     
@@ -314,9 +314,11 @@ def create_visualizations(simulation_data: Dict[str, Dict[str, Any]]):
     ax.grid(True, alpha=0.3, axis='x')
     
     plt.tight_layout()
-    plt.show()
-    
-    # PLOT 3: Top 6 Probabilities
+    finish_figure(fig, out_path)
+
+def create_top6_chart(simulation_data: Dict[str, Dict[str, Any]], out_path=None):
+    """PLOT 3: Top 6 Probabilities"""
+    teams = list(simulation_data.keys())
     fig, ax = plt.subplots(figsize=(12, 8))
     top6_probs = [simulation_data[team]["top6_probability"] for team in teams]
     
@@ -341,9 +343,11 @@ def create_visualizations(simulation_data: Dict[str, Dict[str, Any]]):
     ax.grid(True, alpha=0.3, axis='x')
     
     plt.tight_layout()
-    plt.show()
-    
-    # PLOT 4: Projected Points
+    finish_figure(fig, out_path)
+
+def create_projected_points_chart(simulation_data: Dict[str, Dict[str, Any]], out_path=None):
+    """PLOT 4: Projected Points"""
+    teams = list(simulation_data.keys())
     fig, ax = plt.subplots(figsize=(12, 8))
     projected_pts = [simulation_data[team]["projected_points"] for team in teams]
     
@@ -368,7 +372,20 @@ def create_visualizations(simulation_data: Dict[str, Dict[str, Any]]):
     ax.grid(True, alpha=0.3, axis='x')
     
     plt.tight_layout()
-    plt.show()
+    finish_figure(fig, out_path)
+
+def create_visualizations(simulation_data: Dict[str, Dict[str, Any]]):
+    """
+    Create all four visualizations from simulation data
+    
+    Args:
+        simulation_data: Dictionary containing team statistics
+    """
+    create_position_heatmap(simulation_data)
+    create_champion_chart(simulation_data)
+    create_top6_chart(simulation_data)
+    create_projected_points_chart(simulation_data)
+
 
 # MAIN EXECUTION
 if __name__ == "__main__":
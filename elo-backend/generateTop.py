@@ -6,6 +6,8 @@ import requests
 from typing import Dict, Any
 import matplotlib.cm as cm
 
+from chart_output import finish_figure
+
 # Set modern font globally
 plt.rcParams["font.family"] = "DejaVu Sans"
 
@@ -43,12 +45,13 @@ def load_simulation_data(source: str) -> Dict[str, Any]:
         print(f"Invalid JSON format: {e}")
         raise
 
-def create_top6_probability_chart(raw_data: Dict[str, Any]):
+def create_top6_probability_chart(raw_data: Dict[str, Any], out_path=None):
     """
     Create Top 6 probability bar chart from API data
     
     Args:
         raw_data: Raw JSON data from API/file
+        out_path: File path(s) to save the chart to; shown interactively if None
     """
     # Extract team data from overall_statistics
     teams_data = []
@@ -74,7 +77,7 @@ def create_top6_probability_chart(raw_data: Dict[str, Any]):
     colors = [cmap(norm(val)) for val in df['Top 6 (%)']]
     
     # Create the chart
-    plt.figure(figsize=(13, 7))
+    fig = plt.figure(figsize=(13, 7))
     bars = plt.bar(
         df["Team"],
         df["Top 6 (%)"],
@@ -96,7 +99,7 @@ def create_top6_probability_chart(raw_data: Dict[str, Any]):
     plt.yticks(fontsize=13, weight="bold", color="#333")
     plt.grid(True, alpha=0.3, axis='y')
     plt.tight_layout(pad=2)
-    plt.show()
+    finish_figure(fig, out_path)
     
     # Print summary statistics
     print("\nTop 6 Probability Summary:")
@@ -104,12 +107,13 @@ def create_top6_probability_chart(raw_data: Dict[str, Any]):
     for _, row in df.iterrows():
         print(f"{row['Team']:20} {row['Top 6 (%)']:6.1f}%")
 
-def create_projected_points_chart(raw_data: Dict[str, Any]):
+def create_projected_points_chart(raw_data: Dict[str, Any], out_path=None):
     """
     Create projected points bar chart from API data
     
     Args:
         raw_data: Raw JSON data from API/file
+        out_path: File path(s) to save the chart to; shown interactively if None
     """
     # Extract team data
     teams_data = []
@@ -131,7 +135,7 @@ def create_projected_points_chart(raw_data: Dict[str, Any]):
     colors = [cmap(norm(val)) for val in df['Proj. Points']]
     
     # Create the chart
-    plt.figure(figsize=(13, 7))
+    fig = plt.figure(figsize=(13, 7))
     bars = plt.bar(
         df["Team"],
         df["Proj. Points"],
@@ -153,14 +157,15 @@ def create_projected_points_chart(raw_data: Dict[str, Any]):
     plt.yticks(fontsize=13, weight="bold", color="#333")
     plt.grid(True, alpha=0.3, axis='y')
     plt.tight_layout(pad=2)
-    plt.show()
+    finish_figure(fig, out_path)
 
-def create_champion_probability_chart(raw_data: Dict[str, Any]):
+def create_champion_probability_chart(raw_data: Dict[str, Any], out_path=None):
     """
     Create champion probability bar chart from API data
     
     Args:
         raw_data: Raw JSON data from API/file
+        out_path: File path(s) to save the chart to; shown interactively if None
     """
     # Extract team data
     teams_data = []
@@ -182,7 +187,7 @@ def create_champion_probability_chart(raw_data: Dict[str, Any]):
     colors = [cmap(norm(val)) for val in df['Champion (%)']]
     
     # Create the chart
-    plt.figure(figsize=(13, 7))
+    fig = plt.figure(figsize=(13, 7))
     bars = plt.bar(
         df["Team"],
         df["Champion (%)"],
@@ -206,7 +211,7 @@ def create_champion_probability_chart(raw_data: Dict[str, Any]):
     plt.yticks(fontsize=13, weight="bold", color="#333")
     plt.grid(True, alpha=0.3, axis='y')
     plt.tight_layout(pad=2)
-    plt.show()
+    finish_figure(fig, out_path)
 
 # MAIN EXECUTION
 if __name__ == "__main__":
@@ -0,0 +1,226 @@
+"""
+Projekcija najboljeg strijelca sezone nad ishodima utakmica iz pokretanja sezone
+(sim_service.season_run, obje faze prvenstva) koje dijele i distribucije bodova,
+a golovi kluba dijele se igračima po udjelu u dosadašnjim golovima kluba.
+
+Simulator daje samo ishod (pobjeda / neriješeno / poraz), pa se rezultat
+utakmice uzorkuje iz povijesnih rezultata s istim ishodom. Projekcija se pamti
+dok se ulazi lige i strijelaca ne promijene.
+
+Strijelci postoje samo za klubove u scorers.csv. Dok podaci ne pokrivaju sve
+klubove lige, projekcija je po klubu: vjerojatnost je da igrač bude najbolji
+strijelac svog kluba, ne lige (vidi coverage).
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from leagues import load_league, DEFAULT_LEAGUE
+from rounds import load_all_rounds
+from scorers import select, CURRENT_SEASON
+from workbook_cache import load_results
+
+# ---- CONFIG ----
+HISTORY_FILES = ('result2425.xlsx',)
+NUM_SIMULATIONS = 10000
+CACHE_SIZE = 16  # zadnjih projekcija koje se čuvaju
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+# ---- SCORELINES ----
+def scoreline_pool(history_files=HISTORY_FILES):
+    """
+    Povijesni rezultati grupirani po ishodu: lista od tri polja (N, 2) s golovima
+    domaćina i gosta za pobjedu domaćina, neriješeno i pobjedu gosta
+    """
+    frames = [load_all_rounds()[['homeScore', 'awayScore']]]
+    frames += [load_results(p)[['homeScore', 'awayScore']] for p in history_files if os.path.exists(p)]
+    scores = pd.concat(frames, ignore_index=True).dropna().to_numpy(dtype=np.int16)
+
+    outcome = np.sign(scores[:, 1] - scores[:, 0])  # -1 domaćin, 0 neriješeno, 1 gost
+    pools = [scores[outcome == o] for o in (-1, 0, 1)]
+    if any(len(p) == 0 for p in pools):
+        raise ValueError("Nema dovoljno povijesnih rezultata za sve ishode")
+    return pools
+
+
+def sample_scorelines(outcomes, pools, rng):
+    """Za ishode (S, F) vraća golove domaćina i gosta (S, F) iz odgovarajućeg skupa rezultata"""
+    home_goals = np.empty(outcomes.shape, dtype=np.int16)
+    away_goals = np.empty(outcomes.shape, dtype=np.int16)
+    for o, pool in enumerate(pools):
+        mask = outcomes == o
+        picks = pool[rng.integers(len(pool), size=int(mask.sum()))]
+        home_goals[mask] = picks[:, 0]
+        away_goals[mask] = picks[:, 1]
+    return home_goals, away_goals
+
+
+def team_goals(home_goals, away_goals, home_teams, away_teams, num_teams):
+    """
+    Golovi po timu (S, T) iz golova po utakmici (S, F). home_teams / away_teams su
+    indeksi timova po utakmici: (F,) za fiksni raspored ili (S, F) kad ovise o simulaciji
+    """
+    num_simulations = len(home_goals)
+    rows = np.arange(num_simulations)[:, None] * num_teams
+    size = num_simulations * num_teams
+    goals = np.bincount((rows + home_teams).ravel(), weights=home_goals.ravel(), minlength=size)
+    goals += np.bincount((rows + away_teams).ravel(), weights=away_goals.ravel(), minlength=size)
+    return goals.reshape(num_simulations, num_teams).astype(np.int64)
+
+
+def match_teams(run, fixtures):
+    """
+    Timovi po utakmici za ishode pokretanja (batch_engine.simulate_season_run):
+    (domaćini (S, F), gosti (S, F)). Prva faza igra raspored, a parovi druge faze
+    ovise o poretku nakon prve faze (predložak nad mjestima obje skupine).
+    """
+    from runELO import SECOND_PHASE_HOME, SECOND_PHASE_AWAY
+
+    idx = {name: i for i, name in enumerate(run['names'])}
+    shape = (len(run['outcomes']), len(fixtures))
+    home = [np.broadcast_to(np.array([idx[h] for h, _ in fixtures], dtype=np.intp), shape)]
+    away = [np.broadcast_to(np.array([idx[a] for _, a in fixtures], dtype=np.intp), shape)]
+    order = run['phase1_order']
+    if order is not None:
+        group_size = int(SECOND_PHASE_HOME.max()) + 1
+        for offset in (0, group_size):
+            home.append(order[:, offset + SECOND_PHASE_HOME])
+            away.append(order[:, offset + SECOND_PHASE_AWAY])
+    return np.concatenate(home, axis=1), np.concatenate(away, axis=1)
+
+
+# ---- PROJECTION ----
+def player_shares(league, season=CURRENT_SEASON):
+    """
+    {klub: (igrači, dosadašnji golovi, udjeli)} za klubove lige sa strijelcima u sezoni.
+    Udio igrača je njegov dio golova kluba; ostatak pripada ostalim igračima.
+    """
+    rows = select(season=season).astype({'club': str})
+    goals_for = {}
+    if league['standings'] is not None:
+        goals_for = {team: stats['GF'] for team, stats in league['standings'].table()}
+
+    shares = {}
+    for club, group in rows.groupby('club', sort=False):
+        if club not in league['teams']:
+            continue
+        players = group['player'].tolist()
+        goals = group['goals'].to_numpy(dtype=np.int64)
+        club_goals = max(goals_for.get(club, 0), int(goals.sum()))
+        if club_goals == 0:
+            continue
+        shares[club] = (players, goals, goals / club_goals)
+    return shares
+
+
+def coverage(league, season=CURRENT_SEASON):
+    """
+    Opseg projekcije: {'scope': 'league' ako strijelci pokrivaju sve klubove lige,
+    inače 'club', 'clubs': klubovi sa strijelcima}
+    """
+    clubs = sorted(player_shares(league, season))
+    return {'scope': 'league' if set(league['teams']) <= set(clubs) else 'club', 'clubs': clubs}
+
+
+def _projection_key(league, shares, num_simulations, seed, season):
+    payload = json.dumps(
+        [
+            league['id'], sorted(league['teams'].items()), list(league['fixtures']),
+            list(league['initial_points'].items()),
+            [[club, players, goals.tolist()] for club, (players, goals, _) in shares.items()],
+            num_simulations, seed, season,
+        ],
+        ensure_ascii=False, default=float,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def project_golden_boot(league=None, num_simulations=NUM_SIMULATIONS, seed=None,
+                        season=CURRENT_SEASON, top_n=10):
+    """
+    Monte Carlo projekcija najboljeg strijelca do kraja sezone (obje faze).
+    Vraća listu igrača (po vjerojatnosti) s trenutnim i očekivanim golovima
+    te vjerojatnošću osvajanja (izjednačeni vodeći dijele titulu na jednake dijelove);
+    ako strijelci ne pokrivaju sve klubove lige, osvajanja unutar vlastitog kluba.
+    Rezultat se pamti po ulazima lige, strijelcima, broju simulacija i seedu.
+    """
+    league = load_league(DEFAULT_LEAGUE) if league is None else league
+    shares = player_shares(league, season)
+    if not shares:
+        return []
+
+    key = _projection_key(league, shares, num_simulations, seed, season)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key][:top_n]
+
+    per_club = not set(league['teams']) <= set(shares)
+    projection = _project(league, shares, num_simulations, seed, per_club)
+    with _cache_lock:
+        _cache[key] = projection
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return projection[:top_n]
+
+
+def _project(league, shares, num_simulations, seed, per_club):
+    from sim_service import season_run
+
+    # Isto pokretanje sezone kao distribucije bodova (cache u sim_service)
+    run = season_run(league, num_simulations, seed=seed)
+    rng = np.random.default_rng(seed)
+    idx = {name: i for i, name in enumerate(run['names'])}
+    home_teams, away_teams = match_teams(run, league['fixtures'])
+
+    home_goals, away_goals = sample_scorelines(run['outcomes'], scoreline_pool(), rng)
+    goals = team_goals(home_goals, away_goals, home_teams, away_teams, len(idx))
+
+    # Golovi kluba dijele se igračima jednim multinomijalnim izvlačenjem po klubu (S x igrači)
+    players, clubs, totals = [], [], []
+    for club, (club_players, current, pvals) in shares.items():
+        split = rng.multinomial(goals[:, idx[club]], np.append(pvals, max(0.0, 1 - pvals.sum())))
+        totals.append(current + split[:, :-1])
+        players += club_players
+        clubs += [club] * len(club_players)
+    totals = np.concatenate(totals, axis=1)
+
+    # Utrka za cijelu ligu ili, bez strijelaca svih klubova, zasebno unutar svakog kluba
+    bounds = np.cumsum([0] + [len(s[0]) for s in shares.values()])
+    races = zip(bounds[:-1], bounds[1:]) if per_club else [(0, totals.shape[1])]
+    win_probability = np.empty(totals.shape[1])
+    for lo, hi in races:
+        race = totals[:, lo:hi]
+        leaders = race == race.max(axis=1, keepdims=True)
+        win_probability[lo:hi] = (leaders / leaders.sum(axis=1, keepdims=True)).mean(axis=0)
+    current = np.concatenate([s[1] for s in shares.values()])
+    expected = totals.mean(axis=0)
+
+    order = np.lexsort((-expected, -win_probability))
+    return [
+        {
+            'player': players[i],
+            'club': clubs[i],
+            'goals': int(current[i]),
+            'expected_goals': round(float(expected[i]), 2),
+            'probability': round(float(win_probability[i]) * 100, 2),
+        }
+        for i in order
+    ]
+
+
+if __name__ == '__main__':
+    scope = coverage(load_league(DEFAULT_LEAGUE))
+    if scope['scope'] == 'club':
+        print(f"Strijelci samo za: {', '.join(scope['clubs'])}; vjerojatnost je za najboljeg strijelca kluba")
+    print(f"{'Igrač':<25}{'Klub':<15}{'Golovi':>8}{'Očekivano':>11}{'Vjer. %':>9}")
+    for row in project_golden_boot(seed=2526):
+        print(f"{row['player']:<25}{row['club']:<15}{row['goals']:>8}{row['expected_goals']:>11}{row['probability']:>9}")
@@ -0,0 +1,74 @@
+"""
+Opcionalni JIT kernel (Numba) za sekvencijalni dio simulacije: utakmice jedne
+sezone moraju ići redom zbog Elo povratne veze, ali su sezone međusobno neovisne,
+pa kernel vrti sezone paralelno, a utakmice redom unutar sezone.
+
+Bez Numbe (ili uz ELO_JIT=0) batch_engine koristi NumPy put; za iste uniformne
+brojeve oba puta daju iste bodove, Elo i ishode.
+"""
+import multiprocessing
+import os
+
+import numpy as np
+
+# ---- CONFIG ----
+JIT_ENV = 'ELO_JIT'
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+AVAILABLE = numba is not None and os.environ.get(JIT_ENV, '1') != '0'
+BACKEND = 'numba' if AVAILABLE else 'numpy'
+
+
+def pool_context():
+    """
+    multiprocessing kontekst za ProcessPoolExecutor. Numba pokreće radne dretve u procesu
+    koji je pozvao kernel, a fork takvog procesa ostavlja radnike i pool koji nikad ne
+    završe; uz JIT se radnici zato pokreću preko forkservera (bez JIT-a zadani kontekst).
+    """
+    return multiprocessing.get_context('forkserver') if AVAILABLE else None
+
+
+# Prazno polje ishoda kad ih pozivatelj ne traži (Numba ne prima None za polje)
+NO_OUTCOMES = np.zeros((0, 0), dtype=np.int8)
+
+
+if AVAILABLE:
+    @numba.njit(cache=True, parallel=True)
+    def _league_kernel(elos, points, home_idx, away_idx, uniforms, k, home_advantage, draw_band, outcomes):
+        num_simulations = elos.shape[1]
+        record = outcomes.shape[0] > 0
+        for s in numba.prange(num_simulations):
+            for j in range(home_idx.shape[0]):
+                h = home_idx[j]
+                a = away_idx[j]
+                home_elo = elos[h, s]
+                away_elo = elos[a, s]
+                # Isti redoslijed operacija kao u batch_engine.simulate_league_batch
+                home_win_probability = 1 / (1 + 10.0 ** (-(home_elo + home_advantage - away_elo) / 400))
+
+                u = uniforms[s, j]
+                home_win = u < home_win_probability
+                draw = not home_win and u < home_win_probability + draw_band
+                away_win = not (home_win or draw)
+                if record:
+                    outcomes[s, j] = 1 if draw else (2 if away_win else 0)
+
+                points[h, s] += 3 * home_win + draw
+                points[a, s] += 3 * away_win + draw
+
+                elo_change = k * (home_win + 0.5 * draw - home_win_probability)
+                elos[h, s] = home_elo + elo_change
+                elos[a, s] = away_elo - elo_change
+
+
+def simulate_league_jit(elos, points, home_idx, away_idx, uniforms, k, home_advantage, draw_band, outcomes=None):
+    """JIT verzija batch_engine.simulate_league_batch (polja se mijenjaju na mjestu)"""
+    _league_kernel(
+        elos, points, np.asarray(home_idx, dtype=np.intp), np.asarray(away_idx, dtype=np.intp), uniforms,
+        float(k), float(home_advantage), float(draw_band), NO_OUTCOMES if outcomes is None else outcomes,
+    )
+    return points, elos
@@ -0,0 +1,117 @@
+import glob
+import json
+import os
+from collections import Counter
+
+import ledger
+import metrics
+from rounds import discover_round_files, load_all_rounds, ROUND_PATTERN
+from standings import current_standings
+
+# ---- CONFIG ----
+LEAGUES_DIR = 'leagues'
+DEFAULT_LEAGUE = 'znl-varazdin'
+
+_cache = {}
+
+
+# ---- DISCOVERY ----
+def league_path(league_id, leagues_dir=LEAGUES_DIR):
+    return os.path.join(leagues_dir, f"{league_id}.json")
+
+
+def list_leagues(leagues_dir=LEAGUES_DIR):
+    """ID-ovi svih liga s definicijom u leagues/*.json"""
+    return sorted(os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(leagues_dir, '*.json')))
+
+
+# ---- LOADING ----
+def fixtures_first_round(league):
+    """Prvo kolo rasporeda ako raspored pokriva zadnja kola dvokružne prve faze"""
+    total_rounds = 2 * (len(league['teams']) - 1)
+    return total_rounds - len(league['fixtures']) // league['matches_per_round'] + 1
+
+
+def remaining_fixtures(fixtures, played):
+    """Raspored bez utakmica (par domaćin-gost) koje već postoje u odigranim kolima"""
+    played_pairs = Counter(zip(played['homeTeam'], played['awayTeam']))
+    remaining = []
+    for fixture in fixtures:
+        if played_pairs[fixture] > 0:
+            played_pairs[fixture] -= 1
+        else:
+            remaining.append(fixture)
+    return remaining
+
+
+def ledger_ratings(teams, ledger_path):
+    """
+    Ratinzi iz ledgera (zapisuje ih runUpdate / ledger.apply_pending nakon svakog kola)
+    preko ratinga iz definicije lige; timovi kojih nema u ledgeru zadržavaju svoje
+    """
+    conn = ledger.connect(ledger_path)
+    try:
+        rated = ledger.current_ratings(conn)
+    finally:
+        conn.close()
+    return {team: rated.get(team, elo) for team, elo in teams.items()}
+
+
+def load_league(league_id=DEFAULT_LEAGUE, leagues_dir=LEAGUES_DIR, ledger_path=ledger.LEDGER_FILE):
+    """
+    Učitava definiciju lige: {id, name, teams, fixtures, initial_points, standings, ...}.
+    initial_points su zadani u datoteci ili se računaju iz datoteka kola ('rounds').
+    Za zadanu ligu ratinzi dolaze iz ledgera (ako postoji; ledger se vodi samo za nju),
+    pa API, servis simulacija i snapshotovi koriste iste ratinge.
+    Rezultat se pamti dok se JSON, datoteke kola ili ledger ne promijene.
+    """
+    path = league_path(league_id, leagues_dir)
+    if not os.path.exists(path):
+        raise KeyError(f"Liga {league_id} ne postoji")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+
+    # Ključ: JSON lige i sve datoteke kola, da novo kolo osvježi bodove
+    rounds = raw.get('rounds', {})
+    round_files = [] if 'initial_points' in raw else discover_round_files(
+        rounds.get('directory', '.'), rounds.get('pattern', ROUND_PATTERN)
+    )
+    rated = league_id == DEFAULT_LEAGUE and os.path.exists(ledger_path)
+    sources = [path] + round_files + ([ledger_path] if rated else [])
+    signature = tuple((p, os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in sources)
+    cached = _cache.get((path, ledger_path))
+    if cached is not None and cached[0] == signature:
+        metrics.cache_lookup('leagues', hit=True)
+        return cached[1]
+    metrics.cache_lookup('leagues', hit=False)
+
+    league = {
+        'id': league_id,
+        'name': raw.get('name', league_id),
+        'teams': {team: float(elo) for team, elo in raw['teams'].items()},
+        'fixtures': [tuple(f) for f in raw['fixtures']],
+        'matches_per_round': raw.get('matches_per_round', len(raw['teams']) // 2),
+    }
+    # Snapshotovi tablice (za kretanje po tablici) postoje samo ako liga ima datoteke kola
+    league['standings'] = None
+    if 'initial_points' in raw:
+        league['initial_points'] = dict(raw['initial_points'])
+    else:
+        standings = current_standings(
+            rounds.get('directory', '.'), rounds.get('pattern', ROUND_PATTERN),
+            adjustments=raw.get('point_adjustments'),
+        )
+        league['initial_points'] = standings.points()
+        league['standings'] = standings
+        # Odigrane utakmice su već u bodovima; iz rasporeda ostaju samo neodigrane.
+        # Isti par domaćin-gost igra se i ranije u sezoni, pa se gledaju samo kola rasporeda.
+        played = load_all_rounds(rounds.get('directory', '.'), rounds.get('pattern', ROUND_PATTERN))
+        first_round = raw.get('fixtures_from_round', fixtures_first_round(league))
+        league['fixtures'] = remaining_fixtures(league['fixtures'], played[played['round'] >= first_round])
+
+    if rated:
+        league['teams'] = ledger_ratings(league['teams'], ledger_path)
+
+    _cache[(path, ledger_path)] = (signature, league)
+    return league
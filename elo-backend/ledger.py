@@ -0,0 +1,262 @@
+import hashlib
+import os
+import sqlite3
+
+import pandas as pd
+
+from elo_history import HISTORY_FILE, RatingHistory, load_history
+from runUpdate import INITIAL_ELO, elo_update
+from rounds import read_round_file, round_from_filename
+from sim_config import load_sim_config
+
+# -------- CONFIGURATION --------
+LEDGER_FILE = 'match_ledger.db'
+SEASON_WORKBOOK = 'result2425.xlsx'  # last season, replayed by run.py before the ledger takes over
+LOG_COLUMNS = ['date', 'home', 'away', 'hs', 'as', 'home_pre', 'away_pre', 'home_post', 'away_post']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_files (
+    content_hash TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    round INTEGER,
+    match_count INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    round INTEGER,
+    date TEXT,
+    home_team TEXT NOT NULL,
+    away_team TEXT NOT NULL,
+    home_score INTEGER NOT NULL,
+    away_score INTEGER NOT NULL,
+    attendance INTEGER,
+    content_hash TEXT NOT NULL REFERENCES ingested_files(content_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_matches_round ON matches(round);
+CREATE INDEX IF NOT EXISTS idx_matches_date ON matches(date);
+CREATE INDEX IF NOT EXISTS idx_matches_home ON matches(home_team);
+CREATE INDEX IF NOT EXISTS idx_matches_away ON matches(away_team);
+CREATE TABLE IF NOT EXISTS ratings (
+    team TEXT PRIMARY KEY,
+    elo REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS seed_ratings (
+    team TEXT PRIMARY KEY,
+    elo REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+# -------- CONNECTION --------
+def connect(path=LEDGER_FILE):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def _set_meta(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def get_watermark(conn):
+    """Id of the last match already included in the ratings (0 if none)"""
+    return int(_get_meta(conn, 'watermark', 0))
+
+
+# -------- INGESTION --------
+def ingest_round_file(conn, path, round_no=None):
+    """
+    Appends the matches of one round file to the ledger.
+    Files are identified by content hash, so re-ingesting the same file is a no-op.
+    Returns the number of newly added matches.
+    """
+    content_hash = file_hash(path)
+    if conn.execute("SELECT 1 FROM ingested_files WHERE content_hash = ?", (content_hash,)).fetchone():
+        return 0
+
+    if round_no is None:
+        round_no = round_from_filename(path)
+
+    df = read_round_file(path, round_no)
+    rows = [
+        (
+            int(row['round']),
+            row['dateOfMatch'].strftime('%Y-%m-%d') if pd.notna(row['dateOfMatch']) else None,
+            row['homeTeam'],
+            row['awayTeam'],
+            int(row['homeScore']),
+            int(row['awayScore']),
+            int(row['attendance']) if pd.notna(row['attendance']) else None,
+            content_hash,
+        )
+        for row in df.to_dict(orient='records')
+    ]
+
+    with conn:
+        conn.execute(
+            "INSERT INTO ingested_files (content_hash, filename, round, match_count, ingested_at) VALUES (?, ?, ?, ?, ?)",
+            (content_hash, os.path.basename(path), round_no, len(rows), pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")),
+        )
+        conn.executemany(
+            "INSERT INTO matches (round, date, home_team, away_team, home_score, away_score, attendance, content_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return len(rows)
+
+
+# -------- RATINGS --------
+def seed_ratings(conn, rating_dict, source=''):
+    """Sets starting ratings once; ignored if the ledger already has ratings"""
+    if conn.execute("SELECT 1 FROM ratings LIMIT 1").fetchone():
+        return False
+    with conn:
+        conn.executemany("INSERT INTO ratings (team, elo) VALUES (?, ?)", list(rating_dict.items()))
+        conn.executemany("INSERT INTO seed_ratings (team, elo) VALUES (?, ?)", list(rating_dict.items()))
+        _set_meta(conn, 'seed_source', source)
+    return True
+
+
+def seeded_ratings(conn):
+    """Starting ratings the ledger was seeded with (empty for ledgers seeded before they were kept)"""
+    return dict(conn.execute("SELECT team, elo FROM seed_ratings").fetchall())
+
+
+def current_ratings(conn):
+    return dict(conn.execute("SELECT team, elo FROM ratings").fetchall())
+
+
+def apply_pending(conn, k=None, home_adv=None, history_path=HISTORY_FILE):
+    """
+    Applies elo_update only to matches past the watermark, in ledger order.
+    K and home advantage default to the current sim_config.json values. They only
+    affect the matches applied now: ratings already in the ledger keep the parameters
+    they were built with, so after a refit (fit_params.py) call replay_all.
+    Applied matches are also appended to the Elo history store (elo_history.npz)
+    if it exists, so point-in-time queries cover the current season; a missing
+    store is built later by ensure_history, including these matches.
+    Cost is O(new matches); running it again without new matches does nothing.
+    Returns the number of applied matches.
+    """
+    config = load_sim_config()
+    k = config['k'] if k is None else k
+    home_adv = config['home_advantage'] if home_adv is None else home_adv
+    watermark = get_watermark(conn)
+    pending = conn.execute(
+        "SELECT id, date, home_team, away_team, home_score, away_score FROM matches WHERE id > ? ORDER BY id",
+        (watermark,),
+    ).fetchall()
+    if not pending:
+        return 0
+
+    changed, log = _replay_matches(pending, current_ratings(conn), k, home_adv)
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO ratings (team, elo) VALUES (?, ?)", list(changed.items()))
+        _set_meta(conn, 'watermark', pending[-1][0])
+        # Inside the transaction: if the history cannot be written, the watermark does not advance
+        if history_path and os.path.exists(history_path):
+            RatingHistory.load(history_path).append(pd.DataFrame(log, columns=LOG_COLUMNS)).save(history_path)
+    return len(pending)
+
+
+def _replay_matches(matches, rating_dict, k, home_adv):
+    """
+    elo_update over (id, date, home, away, hs, as) rows in order.
+    Returns (changed ratings, log rows in LOG_COLUMNS order).
+    """
+    lowest_elo = min(rating_dict.values()) if rating_dict else INITIAL_ELO
+    changed = {}
+    log = []
+    for _, date, h, a, hs, as_ in matches:
+        # New clubs start from the lowest Elo present, as in update_elo_with_new_round
+        rh = changed.get(h, rating_dict.get(h, lowest_elo))
+        ra = changed.get(a, rating_dict.get(a, lowest_elo))
+        changed[h], changed[a] = elo_update(rh, ra, hs, as_, k=k, home_adv=home_adv)
+        log.append((date, h, a, hs, as_, rh, ra, changed[h], changed[a]))
+    return changed, log
+
+
+# -------- HISTORY STORE --------
+def rebuild_history(conn=None, excel_path=SEASON_WORKBOOK, history_path=HISTORY_FILE, k=None, home_adv=None):
+    """
+    Rebuilds the Elo history store, which is generated and not versioned: last
+    season's workbook replayed as in run.py, followed by the ledger matches already
+    applied to the ratings, replayed from the ledger's seed ratings (or the season's
+    final ratings for ledgers without stored seeds).
+    """
+    from run import INITIAL_ELO as SEASON_INITIAL_ELO, compute_season_elo, load_clean_results
+
+    season_ratings, season_log = compute_season_elo(load_clean_results(excel_path))
+    history = RatingHistory.from_matchlog(season_log, {t: SEASON_INITIAL_ELO for t in season_ratings})
+    if conn is not None:
+        applied = conn.execute(
+            "SELECT id, date, home_team, away_team, home_score, away_score FROM matches WHERE id <= ? ORDER BY id",
+            (get_watermark(conn),),
+        ).fetchall()
+        if applied:
+            config = load_sim_config()
+            k = config['k'] if k is None else k
+            home_adv = config['home_advantage'] if home_adv is None else home_adv
+            start = seeded_ratings(conn) or season_ratings
+            _, log = _replay_matches(applied, start, k, home_adv)
+            history = history.append(pd.DataFrame(log, columns=LOG_COLUMNS))
+    history.save(history_path)
+    return history
+
+
+def ensure_history(ledger_path=LEDGER_FILE, history_path=HISTORY_FILE):
+    """Loads the Elo history store, building it with rebuild_history on first use"""
+    if not os.path.exists(history_path):
+        conn = connect(ledger_path) if os.path.exists(ledger_path) else None
+        try:
+            rebuild_history(conn, history_path=history_path)
+        finally:
+            if conn is not None:
+                conn.close()
+    return load_history(history_path)
+
+
+def replay_all(conn, k=None, home_adv=None, history_path=HISTORY_FILE):
+    """
+    Rebuilds the ratings from the seed ratings over every ingested match with the
+    given (default: current sim_config.json) K and home advantage, e.g. after a refit.
+    The Elo history store is rebuilt too if it exists. Returns the number of replayed matches.
+    """
+    seeds = seeded_ratings(conn)
+    if not seeds and conn.execute("SELECT 1 FROM ratings LIMIT 1").fetchone():
+        raise ValueError("Ledger has no stored seed ratings; re-create it with seed_ratings to replay")
+    with conn:
+        conn.execute("DELETE FROM ratings")
+        conn.executemany("INSERT INTO ratings (team, elo) VALUES (?, ?)", list(seeds.items()))
+        _set_meta(conn, 'watermark', 0)
+    replayed = apply_pending(conn, k=k, home_adv=home_adv, history_path=None)
+    if history_path and os.path.exists(history_path):
+        rebuild_history(conn, history_path=history_path, k=k, home_adv=home_adv)
+    return replayed
+
+
+def applied_rounds(conn):
+    """Rounds whose matches are all included in the current ratings"""
+    watermark = get_watermark(conn)
+    rows = conn.execute(
+        "SELECT round, MAX(id) FROM matches GROUP BY round ORDER BY round"
+    ).fetchall()
+    return [rnd for rnd, max_id in rows if max_id <= watermark]
@@ -0,0 +1,174 @@
+"""
+Lagani registar metrika (brojači, mjerači, histogrami) u procesu API-ja,
+izložen u Prometheus tekstualnom formatu na /api/metrics.
+Svako ažuriranje je jedan lock i nekoliko zbrajanja, bez vanjskih ovisnosti.
+Radni procesi poolova nemaju svoj /api/metrics: posao se tamo pokreće pod capture(),
+a roditelj upisuje skupljena ažuriranja s apply() kad stigne rezultat.
+"""
+import bisect
+import contextlib
+import math
+import threading
+import time
+
+# ---- CONFIG ----
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+
+# ime -> (tip, opis)
+METRICS = {
+    'elo_http_request_duration_seconds': ('histogram', 'Trajanje HTTP zahtjeva po ruti'),
+    'elo_http_requests_in_flight': ('gauge', 'Zahtjevi koji se trenutno obrađuju po ruti'),
+    'elo_cache_requests_total': ('counter', 'Pogoci i promašaji cacheva'),
+    'elo_simulation_seasons_total': ('counter', 'Ukupno simuliranih sezona po motoru'),
+    'elo_simulation_seconds_total': ('counter', 'Ukupno vrijeme simulacije po motoru'),
+    'elo_simulation_seasons_per_second': ('gauge', 'Propusnost zadnjeg pokretanja motora'),
+    'elo_simulation_stage_seconds': ('histogram', 'Trajanje faza simulacije (prva faza, podjela, druga faza, agregacija)'),
+    'elo_shard_failures_total': ('counter', 'Neuspjeli pokušaji shardova po radniku (sharding koordinator)'),
+}
+
+_lock = threading.Lock()
+_values = {}      # (ime, oznake) -> broj (brojači i mjerači)
+_histograms = {}  # (ime, oznake) -> [brojevi po bucketu..., +Inf, zbroj]
+_buckets = {}     # ime histograma -> granice bucketa
+_capture = threading.local()  # .updates: lista ažuriranja dok je aktivan capture() u toj dretvi
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+# ---- UPDATES ----
+def _captured(kind, *args, **labels):
+    """Ako je u dretvi aktivan capture(), sprema ažuriranje umjesto upisa u registar"""
+    updates = getattr(_capture, 'updates', None)
+    if updates is None:
+        return False
+    updates.append((kind, args, labels))
+    return True
+
+
+def inc(name, amount=1, **labels):
+    if _captured('inc', name, amount, **labels):
+        return
+    key = _key(name, labels)
+    with _lock:
+        _values[key] = _values.get(key, 0) + amount
+
+
+def set_gauge(name, value, **labels):
+    if _captured('set_gauge', name, value, **labels):
+        return
+    with _lock:
+        _values[_key(name, labels)] = value
+
+
+def observe(name, value, buckets=LATENCY_BUCKETS, **labels):
+    if _captured('observe', name, value, tuple(buckets), **labels):
+        return
+    key = _key(name, labels)
+    i = bisect.bisect_left(buckets, value)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            _buckets.setdefault(name, buckets)
+            hist = _histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+        hist[i] += 1
+        hist[-1] += value
+
+
+def cache_lookup(cache, hit):
+    inc('elo_cache_requests_total', cache=cache, result='hit' if hit else 'miss')
+
+
+def record_simulation(engine, seasons, seconds):
+    """Propusnost motora: ukupne sezone i vrijeme te sezone/s zadnjeg pokretanja"""
+    inc('elo_simulation_seasons_total', seasons, engine=engine)
+    inc('elo_simulation_seconds_total', seconds, engine=engine)
+    if seconds > 0:
+        set_gauge('elo_simulation_seasons_per_second', seasons / seconds, engine=engine)
+
+
+class StageTimer:
+    """Mjeri uzastopne faze jednog pokretanja: mark(faza) zatvara fazu koja je upravo završila"""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self._last = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        observe('elo_simulation_stage_seconds', now - self._last, STAGE_BUCKETS, pipeline=self.pipeline, stage=stage)
+        self._last = now
+
+
+# ---- WORKER PROCESSES ----
+@contextlib.contextmanager
+def capture():
+    """
+    Skuplja ažuriranja iz ove dretve u listu umjesto u registar (za posao u radnom
+    procesu); lista je picklable i roditelj je upisuje s apply()
+    """
+    previous = getattr(_capture, 'updates', None)
+    _capture.updates = updates = []
+    try:
+        yield updates
+    finally:
+        _capture.updates = previous
+
+
+def apply(updates):
+    """Upisuje ažuriranja skupljena s capture() u registar ovog procesa"""
+    for kind, args, labels in updates:
+        {'inc': inc, 'set_gauge': set_gauge, 'observe': observe}[kind](*args, **labels)
+
+
+# ---- EXPOSITION ----
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in items)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """Sve metrike u Prometheus tekstualnom formatu (verzija 0.0.4)"""
+    with _lock:
+        values = dict(_values)
+        histograms = {key: list(hist) for key, hist in _histograms.items()}
+
+    lines = []
+    for name, (kind, text) in METRICS.items():
+        lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind != 'histogram':
+            for (metric, labels), value in sorted(values.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            continue
+
+        for (metric, labels), hist in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(list(_buckets[name]) + [math.inf], hist[:-1]):
+                cumulative += count
+                le = '+Inf' if math.isinf(bound) else repr(float(bound))
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(hist[-1])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    with _lock:
+        _values.clear()
+        _histograms.clear()
+        _buckets.clear()
@@ -7,31 +7,62 @@ from runELO import (
     simulate_league, run_complete_championship_simulation
 )
 
-def calculate_points_distribution(team_name, num_simulations=10000):
+def _league_data(league):
+    if league is None:
+        return teams, fixtures, initial_points
+    return league['teams'], league['fixtures'], league['initial_points']
+
+def _season_results(teams, fixtures, initial_points, num_simulations, league, sampling):
+    """
+    Bodovi po simulaciji i pojavljivanja u ligama (izlaz run_complete_championship_simulation).
+    Batched dvofazni motor za ligu dolazi iz sim_service.season_run, pa projekcija
+    strijelaca s istim brojem simulacija koristi isto pokretanje.
+    """
+    if sampling is None or league is None:
+        return run_complete_championship_simulation(
+            teams, fixtures, num_simulations=num_simulations, k=k, start_points=initial_points, sampling=sampling
+        )
+    from runELO import _championship_results
+    from sim_service import season_run
+
+    run = season_run(league, num_simulations, sampling=sampling)
+    if run['champions'] is None:
+        raise ValueError(f"Dvofazno prvenstvo nije moguće za ligu {league['id']} ({len(teams)} timova)")
+    return _championship_results(teams, run['names'], run['points'], run['champions'])
+
+def points_histogram(team_points):
+    """{bodovi: broj simulacija} za zaokružene bodove iz polja bodova po simulaciji"""
+    values, counts = np.unique(np.rint(team_points).astype(np.int64), return_counts=True)
+    return Counter(dict(zip(values.tolist(), counts.tolist())))
+
+def calculate_points_distribution(team_name, num_simulations=10000, league=None, sampling=None):
     """
     Računa distribuciju bodova za određeni tim kroz sve simulacije
+    league: definicija lige iz leagues.load_league (zadano: liga iz runELO)
+    sampling: None za klasičnu petlju, inače batched dvofazni motor
     """
+    teams, fixtures, initial_points = _league_data(league)
     if team_name not in teams:
         return None
     
     print(f"Računam distribuciju bodova za {team_name}...")
     
     # Pokreni kompletnu simulaciju
-    all_results, champ_appearances, releg_appearances = run_complete_championship_simulation(
-        teams, fixtures, num_simulations=num_simulations, k=k
+    all_results, champ_appearances, releg_appearances = _season_results(
+        teams, fixtures, initial_points, num_simulations, league, sampling
     )
     
-    # Dobij sve bodove za odabrani tim
+    # Dobij sve bodove za odabrani tim (kompaktno polje, vidi run_complete_championship_simulation)
     team_points = all_results[team_name]
     
     # Izračunaj statistike
-    min_points = min(team_points)
-    max_points = max(team_points)
-    avg_points = np.mean(team_points)
-    std_points = np.std(team_points)
+    min_points = team_points.min().item()
+    max_points = team_points.max().item()
+    avg_points = float(np.mean(team_points))
+    std_points = float(np.std(team_points))
     
     # Napravi histogram bodova
-    points_counter = Counter([int(round(points)) for points in team_points])
+    points_counter = points_histogram(team_points)
     
     # Izračunaj postotke za svaki broj bodova
     total_simulations = len(team_points)
@@ -62,15 +93,16 @@ def calculate_points_distribution(team_name, num_simulations=10000):
         }
     }
 
-def calculate_all_teams_distribution(num_simulations=10000):
+def calculate_all_teams_distribution(num_simulations=10000, league=None, sampling=None):
     """
     Računa distribuciju bodova za sve timove odjednom (efikasnija metoda)
     """
+    teams, fixtures, initial_points = _league_data(league)
     print(f"Računam distribuciju bodova za sve timove ({num_simulations} simulacija)...")
     
     # Pokreni kompletnu simulaciju
-    all_results, champ_appearances, releg_appearances = run_complete_championship_simulation(
-        teams, fixtures, num_simulations=num_simulations, k=k
+    all_results, champ_appearances, releg_appearances = _season_results(
+        teams, fixtures, initial_points, num_simulations, league, sampling
     )
     
     results = {}
@@ -79,13 +111,13 @@ def calculate_all_teams_distribution(num_simulations=10000):
         team_points = all_results[team_name]
         
         # Statistike
-        min_points = min(team_points)
-        max_points = max(team_points)
-        avg_points = np.mean(team_points)
-        std_points = np.std(team_points)
+        min_points = team_points.min().item()
+        max_points = team_points.max().item()
+        avg_points = float(np.mean(team_points))
+        std_points = float(np.std(team_points))
         
         # Histogram
-        points_counter = Counter([int(round(points)) for points in team_points])
+        points_counter = points_histogram(team_points)
         
         # Distribucija
         distribution = {}
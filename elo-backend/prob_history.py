@@ -0,0 +1,176 @@
+import json
+import os
+
+import pandas as pd
+
+from leagues import load_league, DEFAULT_LEAGUE
+from ledger import LEDGER_FILE
+from rounds import round_from_filename
+
+HISTORY_FILE = 'prob_history.json'
+
+# Ključne vjerojatnosti koje pratimo iz kola u kolo
+HEADLINE_METRICS = ('champion', 'top6', 'last_place', 'projected_points')
+
+
+def history_file(league_id=DEFAULT_LEAGUE):
+    """Datoteka snapshotova za ligu (zadana liga zadržava staro ime datoteke)"""
+    if league_id == DEFAULT_LEAGUE:
+        return HISTORY_FILE
+    return f"prob_history_{league_id}.json"
+
+
+def load_history(path=HISTORY_FILE):
+    """Učitava sve spremljene snapshotove, ključ je broj kola (int)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    return {int(rnd): snap for rnd, snap in raw.get('rounds', {}).items()}
+
+
+def _write_history(history, path=HISTORY_FILE):
+    payload = {'rounds': {str(rnd): history[rnd] for rnd in sorted(history)}}
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def latest_played_round(league):
+    """Zadnje odigrano kolo iz datoteka kola ili None ako liga nema datoteke kola"""
+    standings = league.get('standings')
+    return standings.rounds[-1] if standings is not None else None
+
+
+def compute_snapshot(num_simulations=None, league_id=DEFAULT_LEAGUE, ledger_path=LEDGER_FILE):
+    """
+    Pokreće simulaciju za trenutno stanje lige (ratinzi iz ledgera kao u API-ju, samo
+    neodigrane utakmice) i vraća kompaktan snapshot (stupci po metrikama, redoslijed timova u 'teams')
+    """
+    from runELO import k, run_multiple_simulations
+    from runELO import num_simulations as default_simulations
+
+    league = load_league(league_id, ledger_path=ledger_path)
+    teams = league['teams']
+    num_simulations = num_simulations or default_simulations
+    position_probs, avg_points, _, _ = run_multiple_simulations(
+        teams, league['fixtures'], league['initial_points'], num_simulations=num_simulations, k=k
+    )
+
+    team_names = sorted(teams.keys())
+    return {
+        'generated_at': pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'num_simulations': num_simulations,
+        'teams': team_names,
+        'champion': [round(position_probs[t][0], 2) for t in team_names],
+        'top6': [round(sum(position_probs[t][:6]), 2) for t in team_names],
+        'last_place': [round(position_probs[t][-1], 2) for t in team_names],
+        'projected_points': [round(avg_points[t], 2) for t in team_names],
+    }
+
+
+def record_round(round_no, num_simulations=None, overwrite=False, path=None, league_id=DEFAULT_LEAGUE):
+    """
+    Sprema snapshot za odigrano kolo. Ako snapshot za to kolo već postoji,
+    vraća se spremljeni - povijesna kola se nikad ne simuliraju ponovno.
+    Snapshot uvijek opisuje trenutno stanje lige, pa se za kolo koje nije zadnje
+    odigrano odbija (ValueError) osim uz overwrite=True.
+    """
+    path = path or history_file(league_id)
+    history = load_history(path)
+    if round_no in history and not overwrite:
+        return history[round_no]
+
+    latest = latest_played_round(load_league(league_id))
+    if latest is not None and round_no != latest and not overwrite:
+        raise ValueError(
+            f"Zadnje odigrano kolo je {latest}; snapshot za kolo {round_no} sadržavao bi današnje stanje "
+            f"lige (overwrite=True za prisilno spremanje)"
+        )
+
+    snapshot = compute_snapshot(num_simulations, league_id)
+    history[round_no] = snapshot
+    _write_history(history, path)
+    return snapshot
+
+
+def snapshot_as_dict(snapshot):
+    """Pretvara stupčani snapshot u {tim: {metrika: vrijednost}}"""
+    return {
+        team: {metric: snapshot[metric][i] for metric in HEADLINE_METRICS}
+        for i, team in enumerate(snapshot['teams'])
+    }
+
+
+def compute_deltas(round_no=None, history=None, path=HISTORY_FILE):
+    """
+    Računa promjene vjerojatnosti između snapshota kola 'round_no'
+    (zadnje spremljeno kolo ako nije zadano) i prethodnog spremljenog kola
+    """
+    history = load_history(path) if history is None else history
+    if not history:
+        return None
+
+    if round_no is None:
+        round_no = max(history)
+    if round_no not in history:
+        raise KeyError(f"Nema snapshota za kolo {round_no}")
+
+    previous_rounds = [r for r in history if r < round_no]
+    if not previous_rounds:
+        return None
+    previous_round = max(previous_rounds)
+
+    new = snapshot_as_dict(history[round_no])
+    old = snapshot_as_dict(history[previous_round])
+
+    teams_delta = []
+    for team in sorted(new):
+        entry = {'team': team}
+        for metric in HEADLINE_METRICS:
+            new_value = new[team][metric]
+            old_value = old.get(team, {}).get(metric)
+            entry[metric] = {
+                'old': old_value,
+                'new': new_value,
+                'delta': round(new_value - old_value, 2) if old_value is not None else None,
+            }
+        teams_delta.append(entry)
+
+    return {
+        'round': round_no,
+        'previous_round': previous_round,
+        'teams': teams_delta,
+    }
+
+
+def team_history(team, history=None, path=HISTORY_FILE):
+    """Vraća kretanje svih metrika za jedan tim kroz spremljena kola"""
+    history = load_history(path) if history is None else history
+    series = []
+    for rnd in sorted(history):
+        values = snapshot_as_dict(history[rnd]).get(team)
+        if values is not None:
+            series.append({'round': rnd, **values})
+    return series
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Upotreba: python prob_history.py <newroundN.csv | broj kola>")
+        sys.exit(1)
+
+    arg = sys.argv[1]
+    rnd = int(arg) if arg.isdigit() else round_from_filename(arg)
+    record_round(rnd)
+    deltas = compute_deltas(rnd)
+    if deltas:
+        print(f"Promjene TOP 6 (kolo {deltas['previous_round']} -> {rnd}):")
+        for entry in sorted(deltas['teams'], key=lambda e: -(e['top6']['delta'] or 0)):
+            delta = entry['top6']['delta']
+            print(f"  {entry['team']:<15}" + (f"{delta:+7.2f}" if delta is not None else f"{'novo':>7}"))
+    else:
+        print(f"Spremljen snapshot za kolo {rnd} (nema prethodnog kola za usporedbu)")
@@ -0,0 +1,130 @@
+"""
+Profiliranje pojedinačnog zahtjeva na zahtjev: sampling profiler u zasebnoj dretvi
+bilježi stog dretve koja obrađuje zahtjev, a rezultat se vraća kao collapsed
+stackovi (za flamegraph.pl / speedscope) ili speedscope JSON.
+
+Uključuje se po zahtjevu zaglavljem X-Profile: collapsed|speedscope (ili ?profile=)
+uz admin token (X-Admin-Token ili ?token=) iz varijable okruženja ELO_ADMIN_TOKEN.
+Bez tokena u okruženju profiliranje je isključeno.
+"""
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# ---- CONFIG ----
+TOKEN_ENV = 'ELO_ADMIN_TOKEN'
+SAMPLE_INTERVAL = 0.001  # sekunde između uzoraka
+FORMATS = ('collapsed', 'speedscope')
+MAX_DEPTH = 128
+
+# sys.setswitchinterval vrijedi za cijeli proces: mijenja ga prvi aktivni sampler,
+# a vraća zadnji, da preklopljeni zahtjevi ne vrate krivu vrijednost
+_switch_lock = threading.Lock()
+_active_samplers = 0
+_saved_switch_interval = None
+
+
+def authorized(request):
+    expected = os.environ.get(TOKEN_ENV)
+    if not expected:
+        return False
+    given = request.headers.get('X-Admin-Token') or request.args.get('token') or ''
+    return hmac.compare_digest(given.encode('utf-8'), expected.encode('utf-8'))
+
+
+# ---- SAMPLER ----
+def _frame_label(frame):
+    code = frame.f_code
+    return code.co_name, os.path.basename(code.co_filename), code.co_firstlineno
+
+
+class StackSampler:
+    """Periodički uzorkuje stog jedne dretve (zadano: trenutne) dok se ne zaustavi"""
+
+    def __init__(self, thread_id=None, interval=SAMPLE_INTERVAL):
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        # Dretva koja drži GIL predaje ga tek nakon switch intervala (zadano 5 ms),
+        # pa se za vrijeme profiliranja interval skraćuje na razmak uzoraka
+        global _active_samplers, _saved_switch_interval
+        with _switch_lock:
+            if _active_samplers == 0:
+                _saved_switch_interval = sys.getswitchinterval()
+            _active_samplers += 1
+            sys.setswitchinterval(min(sys.getswitchinterval(), self.interval))
+        self._start = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        global _active_samplers
+        if self._stop.is_set():
+            return self
+        self._stop.set()
+        self._thread.join()
+        with _switch_lock:
+            _active_samplers -= 1
+            if _active_samplers == 0:
+                sys.setswitchinterval(_saved_switch_interval)
+        self.duration = time.perf_counter() - self._start
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                # Od korijena prema listu
+                self.stacks[tuple(reversed(stack))] += 1
+
+    # ---- EXPORT ----
+    def collapsed(self):
+        """Brendan Gregg collapsed format: 'korijen;...;list broj' po retku"""
+        lines = [
+            ';'.join(f"{name} ({filename}:{line})" for name, filename, line in stack) + f" {count}"
+            for stack, count in self.stacks.most_common()
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def speedscope(self, name='request'):
+        """Speedscope 'sampled' profil; težina uzorka je stvarni prosječni razmak uzoraka"""
+        frames, frame_ids, samples, weights = [], {}, [], []
+        total = sum(self.stacks.values())
+        per_sample = self.duration / total if total else 0.0
+        for stack, count in self.stacks.most_common():
+            ids = []
+            for label in stack:
+                if label not in frame_ids:
+                    frame_ids[label] = len(frames)
+                    frames.append({'name': label[0], 'file': label[1], 'line': label[2]})
+                ids.append(frame_ids[label])
+            samples.append(ids)
+            weights.append(count * per_sample)
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'elo-backend profiling',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights,
+            }],
+        }
@@ -0,0 +1,152 @@
+"""
+Renderira sve grafove za objavu bez GUI-ja (Agg) i bez HTTP poziva:
+rezultati dolaze izravno iz simulacije (simulation_report) ili iz spremljenog
+JSON-a, a grafovi se crtaju paralelno u zasebnim procesima.
+
+Pokretanje iz elo-backend direktorija:
+    python render_charts.py [--league znl-varazdin] [--formats png,svg] [--from-json charts/simulation.json]
+"""
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import chart_cache
+from jit_kernel import pool_context
+from leagues import load_league, DEFAULT_LEAGUE
+
+# ---- CONFIG ----
+OUTPUT_DIR = 'charts'
+FORMATS = ('png',)
+REPORT_FILE = 'simulation.json'
+
+# ime grafa -> (modul, funkcija, ulazni podaci)
+# ulazi: 'report' = JSON iz /api/simulation-text, 'teams' = generateGraph.extract_team_data,
+# 'positions' = pozicije po kolima iz trajectory.team_trajectories
+CHARTS = {
+    'top6': ('generateTop', 'create_top6_probability_chart', 'report'),
+    'projected_points': ('generateTop', 'create_projected_points_chart', 'report'),
+    'champion': ('generateTop', 'create_champion_probability_chart', 'report'),
+    'position_heatmap': ('generateGraph', 'create_position_heatmap', 'teams'),
+    'champions_league': ('generateGraph', 'create_champions_league_chart', 'report'),
+    'relegation_league': ('generateGraph', 'create_relegation_league_chart', 'report'),
+    'rank_trajectory': ('table_change', 'create_rank_trajectory_chart', 'positions'),
+}
+
+
+def _init_worker():
+    matplotlib.use('Agg')
+
+
+def _render(job):
+    name, data, paths = job
+    module_name, function_name, _ = CHARTS[name]
+    chart = getattr(importlib.import_module(module_name), function_name)
+    # Funkcije iz generateTop ispisuju sažetke; u batch modu nisu potrebni
+    with contextlib.redirect_stdout(io.StringIO()):
+        chart(data, out_path=paths)
+    return name, paths
+
+
+def chart_inputs(report, names, league_id=DEFAULT_LEAGUE):
+    """Priprema ulaze samo za grafove koji se crtaju"""
+    kinds = {CHARTS[name][2] for name in names}
+    inputs = {'report': report}
+    if 'teams' in kinds:
+        from generateGraph import extract_team_data
+        inputs['teams'] = extract_team_data(report)
+    if 'positions' in kinds:
+        from trajectory import team_trajectories
+        _, inputs['positions'] = team_trajectories(load_league(league_id)['standings'])
+    return inputs
+
+
+def render_all(report=None, league_id=DEFAULT_LEAGUE, out_dir=OUTPUT_DIR, formats=FORMATS,
+               charts=None, sampling=None, max_workers=None, use_cache=True,
+               cache_dir=chart_cache.CACHE_DIR, max_cache_bytes=chart_cache.MAX_CACHE_BYTES):
+    """
+    Crta odabrane grafove (zadano: sve) paralelno i sprema ih u out_dir.
+    report: gotov rezultat simulacije; ako nije zadan, simulacija se pokreće u procesu.
+    Slike s istim ulazima uzimaju se iz cachea umjesto ponovnog crtanja.
+    Vraća ({ime grafa: [putanje]}, [ponovno nacrtani grafovi]).
+    """
+    names = list(charts or CHARTS)
+    unknown = [n for n in names if n not in CHARTS]
+    if unknown:
+        raise ValueError(f"Nepoznati grafovi: {', '.join(unknown)} (dostupno: {', '.join(CHARTS)})")
+
+    if report is None:
+        from simulation_report import build_simulation_report
+        report = build_simulation_report(load_league(league_id), sampling)
+
+    if load_league(league_id)['standings'] is None and 'rank_trajectory' in names:
+        # Kretanje po tablici zahtijeva rezultate po kolima
+        names.remove('rank_trajectory')
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, REPORT_FILE), 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False)
+
+    inputs = chart_inputs(report, names, league_id)
+    style = {'font.family': list(matplotlib.rcParams['font.family'])}
+
+    # Crtaju se samo grafovi čiji se ulazi (podaci, kod, stil, format) promijenili
+    jobs = []
+    cached = {}
+    for name in names:
+        module_name, function_name, kind = CHARTS[name]
+        chart = getattr(importlib.import_module(module_name), function_name)
+        missing = []
+        for fmt in formats:
+            key = chart_cache.chart_key(name, chart, inputs[kind], fmt, style)
+            cached[(name, fmt)] = chart_cache.cache_path(key, fmt, cache_dir)
+            if use_cache and chart_cache.lookup(key, fmt, cache_dir):
+                continue
+            missing.append(cached[(name, fmt)])
+        if missing:
+            jobs.append((name, inputs[kind], missing))
+
+    if jobs:
+        os.makedirs(cache_dir, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, mp_context=pool_context()) as pool:
+            list(pool.map(_render, jobs))
+
+    rendered = {
+        name: [chart_cache.export(cached[(name, fmt)], os.path.join(out_dir, f"{name}.{fmt}")) for fmt in formats]
+        for name in names
+    }
+    chart_cache.evict(max_cache_bytes, cache_dir)
+    return rendered, [name for name, _, _ in jobs]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--league', default=DEFAULT_LEAGUE)
+    parser.add_argument('--out-dir', default=OUTPUT_DIR)
+    parser.add_argument('--formats', default=','.join(FORMATS), help="npr. png,svg")
+    parser.add_argument('--charts', help=f"podskup grafova: {','.join(CHARTS)}")
+    parser.add_argument('--sampling', help="random, sobol ili halton (zadano: klasična simulacija)")
+    parser.add_argument('--from-json', help="spremljeni rezultat simulacije umjesto nove simulacije")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--no-cache', action='store_true', help="nacrtaj sve ponovno")
+    args = parser.parse_args()
+
+    report = None
+    if args.from_json:
+        with open(args.from_json, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+
+    rendered, redrawn = render_all(
+        report, league_id=args.league, out_dir=args.out_dir, formats=tuple(args.formats.split(',')),
+        charts=args.charts.split(',') if args.charts else None, sampling=args.sampling,
+        max_workers=args.workers, use_cache=not args.no_cache,
+    )
+    for name, paths in rendered.items():
+        status = 'nacrtano' if name in redrawn else 'cache'
+        print(f"{name:<20}{status:<10}{', '.join(paths)}")
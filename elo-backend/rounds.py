@@ -0,0 +1,89 @@
+import glob
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from elo_history import parse_match_dates
+from team_registry import canonical_names
+
+# ---- CONFIG ----
+ROUND_PATTERN = 'newround*.csv'
+
+COLUMNS = ['round', 'homeTeam', 'awayTeam', 'homeScore', 'awayScore', 'dateOfMatch', 'attendance']
+
+
+# ---- DISCOVERY ----
+def round_from_filename(path):
+    """Round number from a file name like 'newround14.csv'"""
+    match = re.search(r'(\d+)\D*$', os.path.basename(path))
+    if not match:
+        raise ValueError(f"Ne mogu odrediti kolo iz imena datoteke: {path}")
+    return int(match.group(1))
+
+
+def discover_round_files(directory='.', pattern=ROUND_PATTERN):
+    """All round files in a directory, ordered by round number (not alphabetically)"""
+    return sorted(glob.glob(os.path.join(directory, pattern)), key=round_from_filename)
+
+
+# ---- READING ----
+def _sniff_separator(path):
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        header = f.readline()
+    return ';' if header.count(';') >= header.count(',') else ','
+
+
+def read_round_file(path, round_no=None):
+    """Reads one round file (';' or ',' separated) into the normalized, typed match frame"""
+    df = pd.read_csv(path, sep=_sniff_separator(path), encoding='utf-8-sig')
+    df.columns = [str(c).strip() for c in df.columns]
+
+    # Canonical team names through the shared registry
+    for c in ['homeTeam', 'awayTeam']:
+        df[c] = canonical_names(df[c])
+    df['homeScore'] = pd.to_numeric(df['homeScore'], errors='coerce')
+    df['awayScore'] = pd.to_numeric(df['awayScore'], errors='coerce')
+    df = df.dropna(subset=['homeScore', 'awayScore'])
+
+    df['homeScore'] = df['homeScore'].astype('int64')
+    df['awayScore'] = df['awayScore'].astype('int64')
+    if 'dateOfMatch' in df.columns:
+        df['dateOfMatch'] = pd.to_datetime(parse_match_dates(df['dateOfMatch']))
+    else:
+        df['dateOfMatch'] = pd.NaT
+    if 'attendance' in df.columns:
+        df['attendance'] = pd.to_numeric(df['attendance'], errors='coerce').astype('Int64')
+    else:
+        df['attendance'] = pd.array([pd.NA] * len(df), dtype='Int64')
+    df['round'] = round_from_filename(path) if round_no is None else round_no
+
+    return df[COLUMNS].reset_index(drop=True)
+
+
+# ---- BULK LOADER ----
+_cache = {}
+
+
+def load_all_rounds(directory='.', pattern=ROUND_PATTERN, max_workers=8):
+    """
+    Discovers every round file and reads them concurrently into one frame with a
+    'round' column, ordered by round and by match order within the file.
+    The result is cached in-process until any round file is added or modified.
+    """
+    paths = discover_round_files(directory, pattern)
+    signature = tuple((p, os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in paths)
+    cached = _cache.get((directory, pattern))
+    if cached is not None and cached[0] == signature:
+        return cached[1].copy()
+
+    if paths:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            frames = list(pool.map(read_round_file, paths))
+        matches = pd.concat(frames, ignore_index=True)
+    else:
+        matches = pd.DataFrame({c: pd.Series(dtype='int64') for c in COLUMNS})
+
+    _cache[(directory, pattern)] = (signature, matches)
+    return matches.copy()
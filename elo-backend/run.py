@@ -1,44 +1,23 @@
 import pandas as pd
 
+from elo_replay import encode_teams, replay, replay_frame
+from rounds import read_round_file
+from sim_config import load_sim_config
+from workbook_cache import load_results
+
 # ---- CONFIG ----
 INITIAL_ELO = 1500
-HOME_ADV = 50
-K = 20
+# K and home advantage come from sim_config.json (fit_params.py), so the ratings
+# are built under the same model the simulator uses
+SIM_CONFIG = load_sim_config()
+HOME_ADV = SIM_CONFIG['home_advantage']
+K = SIM_CONFIG['k']
 
 # ---- DATA CLEANING ----
 def load_clean_results(excel_path):
-    df = pd.read_excel(excel_path, sheet_name=None)
-    # Support for multi-sheet Excel: get all, same formatting
-    dfs = []
-    for _, t in df.items():
-        t = t.dropna(axis=1, how='all')
-        t.columns = [str(c).strip().replace(" ", "").replace("score", "Score") for c in t.columns]
-        # Normalize headers
-        rename = {}
-        for c in t.columns:
-            if c.lower() == "hometeam": rename[c] = "homeTeam"
-            if c.lower() == "awayteam": rename[c] = "awayTeam"
-            if c.lower().startswith("date"): rename[c] = "dateOfMatch"
-            if c.lower().startswith("homescore"): rename[c] = "homeScore"
-            if c.lower().startswith("awayscore"): rename[c] = "awayScore"
-        t = t.rename(columns=rename)
-        # select
-        t = t[['homeTeam','awayTeam','dateOfMatch','homeScore','awayScore']]
-        t = t.dropna(how='all')
-        t = t[t['homeTeam'].notnull() & t['awayTeam'].notnull() & t['homeScore'].notnull() & t['awayScore'].notnull()]
-        t = t[t['homeTeam'] != 'homeTeam']
-        t = t[t['awayTeam'] != 'awayTeam']
-        dfs.append(t)
-    result = pd.concat(dfs, ignore_index=True)
-    # Fix team name variants
-    def std_name(x):
-        return str(x).strip().replace('ŠNK ','').replace('NK ','').replace('(S)','').replace('(C)','').replace('.','').replace(',','')
-    for c in ['homeTeam','awayTeam']:
-        result[c] = result[c].apply(std_name)
-    result['homeScore'] = pd.to_numeric(result['homeScore'], errors='coerce')
-    result['awayScore'] = pd.to_numeric(result['awayScore'], errors='coerce')
-    result = result.dropna(subset=['homeScore','awayScore'])
-    return result.reset_index(drop=True)
+    # Parsed once per workbook version, then served from the columnar cache
+    result = load_results(excel_path)
+    return result[['homeTeam','awayTeam','dateOfMatch','homeScore','awayScore']]
 
 # ---- ELO FUNCTIONS ----
 def expected_score(r1, r2): return 1/(1+10**((r2-r1)/400))
@@ -60,23 +39,20 @@ def elo_update(r1, r2, s1, s2, k=K, home_adv=HOME_ADV):
 
 # ---- CALCULATE INIT ELO FROM FULL SEASON ----
 def compute_season_elo(df):
-    teams = sorted(list(set(df['homeTeam']) | set(df['awayTeam'])))
-    rating = {t: INITIAL_ELO for t in teams}
-    matchlog = []
-    for ix, row in df.iterrows():
-        h, a = row['homeTeam'], row['awayTeam']
-        hs, as_ = row['homeScore'], row['awayScore']
-        rh, ra = rating[h], rating[a]
-        new_rh, new_ra = elo_update(rh, ra, hs, as_)
-        matchlog.append({
-            'rnd': ix + 1,
-            'date': row['dateOfMatch'],
-            'home': h, 'away': a, 'hs': hs, 'as': as_,
-            'home_pre': rh, 'away_pre': ra,
-            'home_post': new_rh, 'away_post': new_ra
-        })
-        rating[h], rating[a] = new_rh, new_ra
-    logdf = pd.DataFrame(matchlog)
+    teams, home_ids, away_ids = encode_teams(df)
+    final, home_pre, away_pre, home_post, away_post = replay(
+        home_ids, away_ids, df['homeScore'].to_numpy(), df['awayScore'].to_numpy(),
+        [INITIAL_ELO] * len(teams), k=K, home_adv=HOME_ADV
+    )
+    rating = {t: float(r) for t, r in zip(teams, final)}
+    logdf = pd.DataFrame({
+        'rnd': df.index + 1,
+        'date': df['dateOfMatch'].to_numpy(),
+        'home': df['homeTeam'].to_numpy(), 'away': df['awayTeam'].to_numpy(),
+        'hs': df['homeScore'].to_numpy(), 'as': df['awayScore'].to_numpy(),
+        'home_pre': home_pre, 'away_pre': away_pre,
+        'home_post': home_post, 'away_post': away_post
+    })
     return rating, logdf
 
 # ---- ELO UPDATER FOR NEW ROUNDS ----
@@ -84,22 +60,11 @@ def update_elo_with_round(round_csv, rating_dict):
     """round_csv: path to csv with columns homeTeam,awayTeam,homeScore,awayScore,dateOfMatch (optional date)
     rating_dict: current elo score per team (dict)
     """
-    df = pd.read_csv(round_csv)
-    # Clean team names
-    def std_name(x):
-        return str(x).strip().replace('ŠNK ','').replace('NK ','').replace('(S)','').replace('(C)','').replace('.','').replace(',','')
-    for c in ['homeTeam','awayTeam']:
-        df[c] = df[c].apply(std_name)
-    df['homeScore'] = pd.to_numeric(df['homeScore'], errors='coerce')
-    df['awayScore'] = pd.to_numeric(df['awayScore'], errors='coerce')
-    df = df.dropna(subset=['homeScore','awayScore'])
+    # Shared reader: detects ';' or ',' and cleans names/scores
+    df = read_round_file(round_csv)
     # Apply matches
-    for _, row in df.iterrows():
-        h, a = row['homeTeam'], row['awayTeam']
-        hs, as_ = row['homeScore'], row['awayScore']
-        rh = rating_dict.get(h, INITIAL_ELO)
-        ra = rating_dict.get(a, INITIAL_ELO)
-        rating_dict[h], rating_dict[a] = elo_update(rh, ra, hs, as_)
+    new_ratings, _ = replay_frame(df, rating_dict, INITIAL_ELO, k=K, home_adv=HOME_ADV)
+    rating_dict.update(new_ratings)
     return rating_dict
 
 # ---- MAIN EXECUTION ----
@@ -112,6 +77,9 @@ if __name__ == '__main__':
         print(f'{team:30}: {score:.0f}')
     # Save to file for future update use
     pd.Series(elo_rating).to_csv('current_elo.csv', header=['ELO'])
+    # Persist the full pre/post log for point-in-time queries (/api/elo?as_of=...)
+    from elo_history import RatingHistory
+    RatingHistory.from_matchlog(elo_log, {t: INITIAL_ELO for t in elo_rating}).save()
     # 2. Update with new round
     # round_df should have columns: homeTeam,aw...
     # rating_dict = pd.read_csv('current_elo.csv', index_col=0, squeeze=True).to_dict()
@@ -1,8 +1,19 @@
 import random
 import math
+import time
 import numpy as np
 
-def simulate_match(home_team_elo, away_team_elo, home_advantage=50, k=20):
+import metrics
+
+from sim_config import load_sim_config
+from leagues import load_league, DEFAULT_LEAGUE
+
+# K, prednost domaćina i širina pojasa za remi (sim_config.json ili zadane vrijednosti)
+SIM_CONFIG = load_sim_config()
+HOME_ADVANTAGE = SIM_CONFIG['home_advantage']
+DRAW_BAND = SIM_CONFIG['draw_band']
+
+def simulate_match(home_team_elo, away_team_elo, home_advantage=HOME_ADVANTAGE, k=20, draw_band=DRAW_BAND):
     adjusted_home_elo = home_team_elo + home_advantage
     elo_diff = adjusted_home_elo - away_team_elo
     home_win_probability = 1 / (1 + math.pow(10, -elo_diff / 400))
@@ -11,7 +22,7 @@ def simulate_match(home_team_elo, away_team_elo, home_advantage=50, k=20):
     if result < home_win_probability:
         outcome = 1
         home_score, away_score = 3, 0
-    elif result < home_win_probability + 0.25:
+    elif result < home_win_probability + draw_band:
         outcome = 0.5
         home_score, away_score = 1, 1
     else:
@@ -41,7 +52,18 @@ def simulate_league(teams, fixtures, initial_points, k=20):
     return points, current_elos
 
 
-def run_multiple_simulations(teams, fixtures, initial_points, num_simulations=10000, k=20):
+def run_position_counts(teams, fixtures, initial_points, num_simulations=10000, k=20, sampling=None):
+    """
+    Kompaktni rezultat simulacije: (imena timova, counts[tim, pozicija] uint32, zbroj bodova po timu).
+    sampling=None je klasična petlja, inače batched motor s odabranim uzorkovanjem.
+    """
+    if sampling is not None:
+        # Batched motor s odabranim uzorkovanjem ('random', 'sobol', 'halton')
+        from batch_engine import simulate_position_counts
+        return simulate_position_counts(
+            teams, fixtures, initial_points, num_simulations=num_simulations, k=k, sampling=sampling
+        )
+
     num_teams = len(teams)
     position_counts = {team: [0] * num_teams for team in teams}
     total_points = {team: 0 for team in teams}
@@ -54,15 +76,19 @@ def run_multiple_simulations(teams, fixtures, initial_points, num_simulations=10
             position_counts[team][position] += 1
             total_points[team] += points
 
-    position_probabilities = {
-        team: [count / num_simulations * 100 for count in counts]
-        for team, counts in position_counts.items()
-    }
-    average_points = {team: round((total / num_simulations), 2) for team, total in total_points.items()}
-    qualification_probabilities_top8 = {team: sum(probs[:1]) for team, probs in position_probabilities.items()}
-    qualification_probabilities_top24 = {team: sum(probs[:6]) for team, probs in position_probabilities.items()}
+    names = list(teams)
+    counts = np.array([position_counts[team] for team in names], dtype=np.uint32)
+    totals = np.array([total_points[team] for team in names], dtype=np.float64)
+    return names, counts, totals
 
-    return position_probabilities, average_points, qualification_probabilities_top8, qualification_probabilities_top24
+
+def run_multiple_simulations(teams, fixtures, initial_points, num_simulations=10000, k=20, sampling=None):
+    from batch_engine import summarize_position_counts
+
+    names, counts, totals = run_position_counts(
+        teams, fixtures, initial_points, num_simulations=num_simulations, k=k, sampling=sampling
+    )
+    return summarize_position_counts(names, counts, totals, num_simulations)
 
 
 def print_results(position_probabilities, average_points, qualification_probabilities_top8, qualification_probabilities_top24):
@@ -93,31 +119,37 @@ def print_results(position_probabilities, average_points, qualification_probabil
     print("=" * 116)
 
 
+# Druga faza: natjecateljski brojevi po poziciji nakon prve faze (1., 2., 3., 4., 5., 6.)
+# i raspored kola po natjecateljskim brojevima
+COMPETITION_NUMBERS = (1, 2, 3, 6, 5, 4)
+SECOND_PHASE_ROUNDS = (
+    ((1, 6), (2, 5), (3, 4)),
+    ((6, 4), (5, 3), (1, 2)),
+    ((2, 6), (3, 1), (4, 5)),
+    ((6, 5), (3, 2), (1, 4)),
+    ((3, 6), (5, 1), (4, 2)),
+)
+
+
+def second_phase_template():
+    """
+    Raspored druge faze preveden jednom na mjesta nakon prve faze (0 = prvi u skupini):
+    polja (domaćin, gost) s indeksom mjesta po utakmici
+    """
+    slot_of = {num: slot for slot, num in enumerate(COMPETITION_NUMBERS)}
+    pairs = [(slot_of[h], slot_of[a]) for rnd in SECOND_PHASE_ROUNDS for h, a in rnd]
+    return np.array([h for h, _ in pairs], dtype=np.intp), np.array([a for _, a in pairs], dtype=np.intp)
+
+
+SECOND_PHASE_HOME, SECOND_PHASE_AWAY = second_phase_template()
+
+
 def assign_competition_numbers(sorted_teams):
-    comp_nums = {}
-    for i in range(3):
-        comp_nums[sorted_teams[i]] = i + 1
-    comp_nums[sorted_teams[3]] = 6
-    comp_nums[sorted_teams[4]] = 5
-    comp_nums[sorted_teams[5]] = 4
-    return comp_nums
+    return {team: num for team, num in zip(sorted_teams, COMPETITION_NUMBERS)}
 
 
 def generate_second_phase_fixtures(liga_teams):
-    comp_nums = assign_competition_numbers(liga_teams)
-    rounds = [
-        [(1, 6), (2, 5), (3, 4)],
-        [(6, 4), (5, 3), (1, 2)],
-        [(2, 6), (3, 1), (4, 5)],
-        [(6, 5), (3, 2), (1, 4)],
-        [(3, 6), (5, 1), (4, 2)],
-    ]
-    num_to_team = {num: team for team, num in comp_nums.items()}
-    fixtures_second_phase = []
-    for rnd in rounds:
-        for home_num, away_num in rnd:
-            fixtures_second_phase.append((num_to_team[home_num], num_to_team[away_num]))
-    return fixtures_second_phase
+    return [(liga_teams[h], liga_teams[a]) for h, a in zip(SECOND_PHASE_HOME, SECOND_PHASE_AWAY)]
 
 
 def print_phase_table(title, points_dict, pos_prob):
@@ -135,50 +167,13 @@ def print_phase_table(title, points_dict, pos_prob):
 
 # Definicija podataka i simulacije
 
-initial_points = {
-    "Mladost SL": 30,
-    "Zadrugar": 28,
-    "Zelengaj": 27,
-    "Beretinec": 22,
-    "Nova Ves": 19,
-    "Semovec": 19,
-    "Dubravka": 17,
-    "Mladost VT": 17,
-    "Plitvica": 15,
-    "Drava": 14,
-    "Sloboda": 12,
-    "Obres": 10
-}
-
-teams = {
-    "Beretinec": 1454.8278865073946,
-    "Drava": 1449.7298476635615,
-    "Mladost SL": 1608.3321834812218,
-    "Mladost VT": 1430.802542867657,
-    "Nova Ves": 1504.6089000077482,
-    "Obres": 1411.5309999548047,
-    "Plitvica": 1542.2539659987629,
-    "Sloboda": 1369.1721475212782,
-    "Zadrugar": 1601.705626520519,
-    "Zelengaj": 1587.1976076404965,
-    "Dubravka": 1427.1824090944194,
-    "Semovec": 1410.6346749648299
-}
-
-fixtures = [
-("Mladost SL", "Drava"), ("Plitvica", "Obres"), ("Beretinec", "Nova Ves"), ("Sloboda", "Zelengaj"), ("Mladost VT", "Dubravka"), ("Semovec", "Zadrugar"),
-("Drava", "Beretinec"), ("Plitvica", "Semovec"), ("Zelengaj", "Mladost SL"), ("Dubravka", "Sloboda"), ("Zadrugar", "Mladost VT"), ("Nova Ves", "Obres"),
-
-("Obres", "Zelengaj"), ("Nova Ves", "Zadrugar"), ("Plitvica", "Dubravka"), ("Semovec", "Drava"), ("Mladost VT", "Beretinec"), ("Sloboda", "Mladost SL"),
-("Zelengaj", "Plitvica"), ("Dubravka", "Nova Ves"), ("Zadrugar", "Sloboda"), ("Mladost SL", "Mladost VT"), ("Beretinec", "Semovec"), ("Drava", "Obres"),
-("Beretinec", "Mladost SL"), ("Sloboda", "Drava"), ("Mladost VT", "Zelengaj"), ("Semovec", "Obres"), ("Zadrugar", "Plitvica"), ("Nova Ves", "Dubravka"),
-
-("Beretinec", "Plitvica"), ("Drava", "Zelengaj"), ("Dubravka", "Sloboda"), ("Nova Ves", "Mladost VT"), ("Zadrugar", "Semovec"), ("Mladost SL", "Obres"),
-("Mladost VT", "Sloboda"), ("Drava", "Dubravka"), ("Zelengaj", "Beretinec"), ("Plitvica", "Mladost SL"), ("Obres", "Zadrugar"), ("Semovec", "Nova Ves"),
-("Zadrugar", "Plitvica"), ("Mladost SL", "Zelengaj"), ("Beretinec", "Drava"), ("Dubravka", "Mladost VT"), ("Sloboda", "Semovec"), ("Nova Ves", "Obres")
-]
-
-k = 20
+# Zadana liga iz leagues/*.json; bodovi se računaju iz odigranih kola (newroundN.csv)
+_league = load_league(DEFAULT_LEAGUE)
+initial_points = _league['initial_points']
+teams = _league['teams']
+fixtures = _league['fixtures']
+
+k = SIM_CONFIG['k']
 num_simulations = 10000
 
 def calculate_positions_conditional_on_points(teams, fixtures, initial_points, num_simulations=10000, k=20):
@@ -272,7 +267,7 @@ def calculate_positions_conditional_optimized(teams, fixtures, initial_points, n
         
         # Simuliraj kompletno prvenstvo
         all_team_results, _, _ = run_complete_championship_simulation(
-            teams, fixtures, num_simulations=1, k=k  # Jedna simulacija
+            teams, fixtures, num_simulations=1, k=k, start_points=initial_points  # Jedna simulacija
         )
         
         # Dobij konačne bodove za sve timove u ovoj simulaciji
@@ -306,17 +301,43 @@ def calculate_positions_conditional_optimized(teams, fixtures, initial_points, n
     
     return final_results
 
-def run_complete_championship_simulation(teams, fixtures_phase1, num_simulations=10000, k=20):
+def run_complete_championship_simulation(teams, fixtures_phase1, num_simulations=10000, k=20, start_points=None,
+                                         sampling=None, checkpoint=None):
     """
     Pokreće kompletnu simulaciju prvenstva s varijabilnom podjelom liga
+    start_points: bodovi prije prve faze (zadano: initial_points zadane lige)
+    sampling: None za klasičnu petlju, inače batched motor ('random', 'sobol', 'halton')
+    checkpoint: direktorij posla (checkpoint.py); simulira batched motorom u blokovima
+        s checkpointom, nastavlja prekinuti posao i produžuje završeni do num_simulations.
+        Bodovi po sezoni spremaju se uz posao i vraćaju kao bez checkpointa (memorija
+        raste s brojem sezona); samo sažetak daje run_championship_checkpointed
     """
-    all_results = {team: [] for team in teams.keys()}
+    start_points = initial_points if start_points is None else start_points
+    if checkpoint is not None:
+        from checkpoint import run_checkpointed, load_outputs
+
+        run_checkpointed(checkpoint, teams, fixtures_phase1, start_points, num_simulations, mode='championship',
+                         k=k, sampling=sampling or 'random', keep_outputs=True)
+        names, final_points, champions = load_outputs(checkpoint)
+        return _championship_results(teams, names, final_points, champions)
+    if sampling is not None:
+        return _run_championship_batch(teams, fixtures_phase1, num_simulations, k, start_points, sampling)
+
+    # Konačni bodovi po simulaciji u kompaktnom polju (int16 za cjelobrojne bodove)
+    from batch_engine import points_dtype
+    dtype = points_dtype(start_points, len(fixtures_phase1) + len(teams) * 5 // 2)
+    all_results = {team: np.empty(num_simulations, dtype=dtype) for team in teams.keys()}
     champions_league_appearances = {team: 0 for team in teams.keys()}
     relegation_league_appearances = {team: 0 for team in teams.keys()}
+    # Vrijeme po fazama zbraja se lokalno i bilježi jednom na kraju
+    stage_seconds = [0.0, 0.0, 0.0, 0.0]
+    start = time.perf_counter()
     
     for sim in range(num_simulations):
         # 1. Simuliraj prvu fazu
-        points_phase1, elos_phase1 = simulate_league(teams, fixtures_phase1, initial_points, k)
+        t0 = time.perf_counter()
+        points_phase1, elos_phase1 = simulate_league(teams, fixtures_phase1, start_points, k)
+        t1 = time.perf_counter()
         
         # 2. Podijeli timove na temelju OVOJE simulacije
         sorted_phase1 = sorted(points_phase1.items(), key=lambda x: x[1], reverse=True)
@@ -332,6 +353,7 @@ def run_complete_championship_simulation(teams, fixtures_phase1, num_simulations
         # 4. Generiraj fixtures za drugu fazu
         fixtures_prvaka = generate_second_phase_fixtures(liga_prvaka)
         fixtures_ostanak = generate_second_phase_fixtures(liga_ostanak)
+        t2 = time.perf_counter()
         
         # 5. Simuliraj drugu fazu
         teams_prvaka = {t: elos_phase1[t] for t in liga_prvaka}
@@ -342,16 +364,69 @@ def run_complete_championship_simulation(teams, fixtures_phase1, num_simulations
         
         points_prvaka_final, _ = simulate_league(teams_prvaka, fixtures_prvaka, points_prvaka_start, k)
         points_ostanak_final, _ = simulate_league(teams_ostanak, fixtures_ostanak, points_ostanak_start, k)
+        t3 = time.perf_counter()
         
         # 6. Spremi konačne rezultate
         for team, points in points_prvaka_final.items():
-            all_results[team].append(points)
+            all_results[team][sim] = points
         for team, points in points_ostanak_final.items():
-            all_results[team].append(points)
+            all_results[team][sim] = points
+
+        stage_seconds[0] += t1 - t0
+        stage_seconds[1] += t2 - t1
+        stage_seconds[2] += t3 - t2
+        stage_seconds[3] += time.perf_counter() - t3
+
+    for stage, seconds in zip(('phase1', 'split', 'phase2', 'aggregation'), stage_seconds):
+        metrics.observe('elo_simulation_stage_seconds', seconds, metrics.STAGE_BUCKETS, pipeline='championship', stage=stage)
+    metrics.record_simulation('championship', num_simulations, time.perf_counter() - start)
     
     return all_results, champions_league_appearances, relegation_league_appearances
 
 
+def _run_championship_batch(teams, fixtures_phase1, num_simulations, k, start_points, sampling):
+    """Isti izlaz kao run_complete_championship_simulation, preko batch_engine.simulate_championship_batch"""
+    from batch_engine import simulate_championship_batch
+
+    start = time.perf_counter()
+    names, final_points, champions = simulate_championship_batch(
+        teams, fixtures_phase1, start_points, num_simulations, k=k, sampling=sampling
+    )
+    metrics.record_simulation('championship-batch', num_simulations, time.perf_counter() - start)
+    return _championship_results(teams, names, final_points, champions)
+
+
+def run_championship_checkpointed(directory, teams, fixtures_phase1, num_simulations=10000, k=None, start_points=None,
+                                  sampling='random'):
+    """
+    Simulacija prvenstva u poslu s checkpointom (checkpoint.py) bez bodova po sezoni u memoriji.
+    k=None uzima K iz sim_config.json (kao checkpoint.run_checkpointed).
+    Vraća ({tim: sažetak iz Accumulator.summary()} (prosjek, SD i distribucija bodova),
+    pojavljivanja u ligi za prvaka, pojavljivanja u ligi za ostanak).
+    """
+    from checkpoint import run_checkpointed
+
+    start_points = initial_points if start_points is None else start_points
+    acc = run_checkpointed(directory, teams, fixtures_phase1, start_points, num_simulations, mode='championship',
+                           k=k, sampling=sampling)
+    summary = acc.summary()['teams']
+    column = {team: i for i, team in enumerate(acc.names)}
+    champions_league_appearances = {team: int(acc.championship_group[column[team]]) for team in teams}
+    relegation_league_appearances = {team: acc.num_simulations - champions_league_appearances[team] for team in teams}
+    return {team: summary[team] for team in teams}, champions_league_appearances, relegation_league_appearances
+
+
+def _championship_results(teams, names, final_points, champions):
+    """Bodovi (S, T) i pripadnost ligi za prvaka (S, T) u rječnike po timu"""
+    num_simulations = len(final_points)
+    column = {team: i for i, team in enumerate(names)}
+    champions_counts = champions.sum(axis=0)
+    all_results = {team: np.ascontiguousarray(final_points[:, column[team]]) for team in teams}
+    champions_league_appearances = {team: int(champions_counts[column[team]]) for team in teams}
+    relegation_league_appearances = {team: num_simulations - champions_league_appearances[team] for team in teams}
+    return all_results, champions_league_appearances, relegation_league_appearances
+
+
 if __name__ == "__main__":
     print("Pokretanje kompletne simulacije...")
     
@@ -1,14 +1,22 @@
 import pandas as pd
 
+from elo_replay import replay_frame
+from rounds import read_round_file
+from sim_config import load_sim_config
+from team_registry import canonical_name, canonical_names
+
 # -------- CONFIGURATION --------
 INITIAL_ELO = 1500
-HOME_ADV = 50
-K = 20
+# K and home advantage come from sim_config.json (fit_params.py), so the ratings
+# are built under the same model the simulator uses
+SIM_CONFIG = load_sim_config()
+HOME_ADV = SIM_CONFIG['home_advantage']
+K = SIM_CONFIG['k']
 
 # -------- DATA CLEANING --------
 def standardize_team_name(name):
-    # Normalize club names to avoid mismatches
-    return str(name).strip().replace('ŠNK ', '').replace('NK ', '').replace('(S)', '').replace('(C)', '').replace('.', '').replace(',', '')
+    # Normalize club names to avoid mismatches (shared alias registry)
+    return canonical_name(name)
 
 # -------- ELO CORE FUNCTIONS --------
 def expected_score(r1, r2):
@@ -46,13 +54,13 @@ def update_elo_with_new_round(round_csv_or_df, rating_dict):
     New clubs get the lowest Elo score present in rating_dict or INITIAL_ELO if empty.
     """
     if isinstance(round_csv_or_df, str):
-        df = pd.read_csv(round_csv_or_df, sep=';')  # Use sep=';' for your newround.csv
+        df = read_round_file(round_csv_or_df)
     else:
         df = round_csv_or_df.copy()
 
     # Clean team names
     for c in ['homeTeam', 'awayTeam']:
-        df[c] = df[c].apply(standardize_team_name)
+        df[c] = canonical_names(df[c])
 
     df['homeScore'] = pd.to_numeric(df['homeScore'], errors='coerce')
     df['awayScore'] = pd.to_numeric(df['awayScore'], errors='coerce')
@@ -68,32 +76,45 @@ def update_elo_with_new_round(round_csv_or_df, rating_dict):
     for club in new_clubs:
         rating_dict[club] = lowest_elo
 
-    # Update Elo match-by-match
-    for _, row in df.iterrows():
-        h, a = row['homeTeam'], row['awayTeam']
-        hs, as_ = row['homeScore'], row['awayScore']
-        rh = rating_dict[h]
-        ra = rating_dict[a]
-        rating_dict[h], rating_dict[a] = elo_update(rh, ra, hs, as_)
+    # Update Elo match-by-match (array replay over integer team IDs)
+    new_ratings, _ = replay_frame(df, rating_dict, lowest_elo, k=K, home_adv=HOME_ADV)
+    rating_dict.update(new_ratings)
 
     return rating_dict
 
 # -------- USAGE EXAMPLE --------
 if __name__ == '__main__':
-    # Load example current Elo from CSV or init empty
+    import sys
+
+    import ledger
+    from prob_history import record_round
+    from rounds import discover_round_files
+
+    conn = ledger.connect()
+
+    # Seed the ledger once from the current Elo CSV; afterwards the ledger is the source of truth
     try:
         rating_df = pd.read_csv('current_elo.csv', index_col=0)
         rating_series = rating_df['ELO']  # Explicitly select the 'ELO' column by name
-        rating_dict = rating_series.to_dict()
-        print("Loaded current Elo ratings.")
+        if ledger.seed_ratings(conn, rating_series.to_dict(), source='current_elo.csv'):
+            print("Seeded match ledger from current_elo.csv.")
     except FileNotFoundError:
         print("No existing elo CSV found, starting fresh with empty ratings.")
-        rating_dict = {}
 
-    # Update Elo with new round file (adjust filename)
-    new_round_file = 'newround14.csv'  # Replace with actual round file
-    rating_dict = update_elo_with_new_round(new_round_file, rating_dict)
-    print("Updated Elo ratings with new round results:")
+    # Ingest the given round files, or every newroundN.csv; already ingested files are skipped by hash
+    round_files = sys.argv[1:] or discover_round_files()
+    for round_file in round_files:
+        added = ledger.ingest_round_file(conn, round_file)
+        if added:
+            print(f"Ingested {round_file}: {added} matches")
+
+    applied = ledger.apply_pending(conn)
+    if not applied:
+        print("No new matches past the watermark, ratings unchanged.")
+        sys.exit(0)
+
+    rating_dict = ledger.current_ratings(conn)
+    print(f"Updated Elo ratings with {applied} new matches (rounds in ratings: {ledger.applied_rounds(conn)}):")
 
     # Display updated Elo
     for team, elo in sorted(rating_dict.items(), key=lambda x: -x[1]):
@@ -101,3 +122,6 @@ if __name__ == '__main__':
 
     # Save updated ratings for future use
     pd.Series(rating_dict).to_csv('current_elo.csv', header=['ELO'])
+
+    # Snapshot headline probabilities for the latest round (history is never re-simulated)
+    record_round(max(ledger.applied_rounds(conn)))
@@ -0,0 +1,57 @@
+import os
+
+import pandas as pd
+
+from team_registry import canonical_names
+
+# ---- CONFIG ----
+SCORERS_FILE = 'scorers.csv'
+CURRENT_SEASON = '2025/26'
+
+_cache = {}
+
+
+# ---- STORE ----
+def load_scorers(path=SCORERS_FILE):
+    """
+    Strijelci kao stupčana tablica (season, club, player, goals) s indeksom
+    (season, club), tako da je izdvajanje sezone ili kluba samo rez po indeksu.
+    Redoslijed redaka iz datoteke se čuva. Rezultat se pamti dok se datoteka ne promijeni.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    df = pd.read_csv(path, encoding='utf-8')
+    df['club'] = canonical_names(df['club'])
+    df['order'] = range(len(df))
+    df = df.astype({'season': 'category', 'club': 'category', 'goals': 'int32'})
+    df = df.set_index(['season', 'club']).sort_index()
+
+    _cache[path] = (mtime, df)
+    return df
+
+
+def select(season=None, club=None, path=SCORERS_FILE):
+    """Retci za sezonu i/ili klub (None = sve), u redoslijedu iz datoteke"""
+    df = load_scorers(path)
+    key = (season if season is not None else slice(None), club if club is not None else slice(None))
+    if season is not None and season not in df.index.get_level_values('season'):
+        return df.iloc[0:0].reset_index()
+    if club is not None and club not in df.index.get_level_values('club'):
+        return df.iloc[0:0].reset_index()
+    return df.loc[key, :].reset_index().sort_values('order')
+
+
+def top_scorers(n=10, season=None, club=None, path=SCORERS_FILE):
+    """
+    Najboljih n strijelaca (zbroj golova preko odabranih sezona), s klubovima.
+    Kod istog broja golova prednost ima igrač koji se ranije pojavljuje u podacima.
+    """
+    rows = select(season, club, path).astype({'club': str})
+    grouped = rows.groupby('player', sort=False, observed=True).agg(
+        goals=('goals', 'sum'),
+        clubs=('club', lambda c: sorted(set(c))),
+    )
+    return grouped.sort_values('goals', ascending=False, kind='stable').head(n).reset_index()
@@ -0,0 +1,461 @@
+"""
+Simulacija podijeljena na shardove za više strojeva: koordinator dijeli specifikaciju
+(liga, broj sezona, način, seed) na shardove s disjunktnim seedovima, šalje ih
+radnicima preko TCP-a i zbraja njihove akumulatore fiksne veličine (brojači pozicija,
+histogram bodova, momenti). Shard i njegov seed određeni su samo specifikacijom i
+indeksom, pa je spojeni rezultat jednak lokalnom pokretanju istih shardova (run_local).
+
+Poruke su JSON s 4-bajtnim prefiksom duljine (bez pickle-a). Pokretanje iz elo-backend:
+    python sharding.py worker [--host 127.0.0.1] [--port 7071]
+    python sharding.py coordinate --workers host:port,... [--simulations N] [--mode season|championship]
+    python sharding.py coordinate --local-workers 4 ...   # lokalni radnički procesi za test
+"""
+import argparse
+import json
+import queue
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+import metrics
+
+# ---- CONFIG ----
+DEFAULT_PORT = 7071
+SHARD_SIZE = 1_000_000  # sezona po shardu; jedan shard je jedan posao jednog radnika
+MAX_RETRIES = 3         # ponovnih pokušaja po shardu (i uzastopnih neuspjelih spajanja po radniku)
+TIMEOUT = 600           # sekunde čekanja na odgovor radnika
+MODES = ('season', 'championship')
+MAX_MESSAGE = 64 * 1024 * 1024
+SECOND_PHASE_GAMES = 5  # utakmica po timu u drugoj fazi (runELO.SECOND_PHASE_ROUNDS)
+
+
+class ShardError(RuntimeError):
+    """Radnik je vratio grešku za shard"""
+
+
+# ---- SPEC ----
+def make_spec(num_simulations, league_id=None, mode='season', k=None, sampling='random', seed=None,
+              shard_size=SHARD_SIZE):
+    """
+    Specifikacija posla; seed=None bira slučajni seed koji se zapisuje u specifikaciju,
+    da se pokretanje može ponoviti. k=None uzima K iz sim_config.json.
+    """
+    from batch_engine import SAMPLING_MODES
+    from leagues import DEFAULT_LEAGUE
+    from sim_config import load_sim_config
+
+    if mode not in MODES:
+        raise ValueError(f"Nepoznat način: {mode} (dostupno: {', '.join(MODES)})")
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(f"Nepoznat način uzorkovanja: {sampling} (dostupno: {', '.join(SAMPLING_MODES)})")
+    return {
+        'league': league_id or DEFAULT_LEAGUE,
+        'num_simulations': int(num_simulations),
+        'mode': mode,
+        'k': float(load_sim_config()['k'] if k is None else k),
+        'sampling': sampling,
+        'seed': int(np.random.SeedSequence().entropy if seed is None else seed),
+        'shard_size': int(shard_size),
+    }
+
+
+def shard_sizes(spec):
+    """Broj sezona po shardu; zadnji shard je ostatak"""
+    n, size = spec['num_simulations'], spec['shard_size']
+    return [min(size, n - start) for start in range(0, n, size)]
+
+
+def shard_seed(spec, index):
+    """Seed sharda: index-to dijete SeedSequence(seed), isto kao SeedSequence(seed).spawn(n)[index]"""
+    return np.random.SeedSequence(spec['seed'], spawn_key=(index,))
+
+
+def points_bounds(teams, fixtures, initial_points, mode):
+    """Najmanji i najveći mogući konačni bodovi (bodovi ne padaju, najviše 3 po utakmici)"""
+    games = {t: 0 for t in teams}
+    for home, away in fixtures:
+        games[home] += 1
+        games[away] += 1
+    extra = SECOND_PHASE_GAMES if mode == 'championship' else 0
+    low = min(initial_points.get(t, 0) for t in teams)
+    high = max(initial_points.get(t, 0) + 3 * (games[t] + extra) for t in teams)
+    return int(np.floor(low)), int(np.ceil(high))
+
+
+# ---- ACCUMULATOR ----
+class Accumulator:
+    """
+    Zbirni rezultat jednog ili više shardova, fiksne veličine neovisno o broju sezona:
+    brojači pozicija (T, T), histogram bodova (T, raspon), zbroj i zbroj kvadrata bodova
+    te broj ulazaka u ligu za prvaka. Spajanje je zbrajanje (merge).
+    """
+
+    def __init__(self, names, points_min, points_max):
+        num_teams = len(names)
+        self.names = list(names)
+        self.points_min = int(points_min)
+        self.num_simulations = 0
+        self.position_counts = np.zeros((num_teams, num_teams), dtype=np.int64)
+        self.points_histogram = np.zeros((num_teams, int(points_max) - self.points_min + 1), dtype=np.int64)
+        self.points_sum = np.zeros(num_teams)
+        self.points_sumsq = np.zeros(num_teams)
+        self.championship_group = np.zeros(num_teams, dtype=np.int64)
+
+    def add(self, points, champions=None):
+        """Dodaje bodove (S, T) u redoslijedu names; champions (S, T) bool za dvofazno prvenstvo"""
+        from batch_engine import position_counts_from_points
+
+        self.num_simulations += len(points)
+        self.position_counts += position_counts_from_points(points)
+        bins = self.points_histogram.shape[1]
+        for team in range(len(self.names)):
+            column = points[:, team].astype(np.float64)
+            offsets = np.floor(column).astype(np.int64) - self.points_min
+            self.points_histogram[team] += np.bincount(offsets, minlength=bins)[:bins]
+            self.points_sum[team] += column.sum()
+            self.points_sumsq[team] += (column * column).sum()
+        if champions is not None:
+            self.championship_group += champions.sum(axis=0)
+        return self
+
+    def merge(self, other):
+        if other.names != self.names or other.points_histogram.shape != self.points_histogram.shape:
+            raise ValueError("Akumulatori različitih liga ili raspona bodova ne mogu se spojiti")
+        self.num_simulations += other.num_simulations
+        self.position_counts += other.position_counts
+        self.points_histogram += other.points_histogram
+        self.points_sum += other.points_sum
+        self.points_sumsq += other.points_sumsq
+        self.championship_group += other.championship_group
+        return self
+
+    # ---- SERIALIZATION ----
+    def to_dict(self):
+        return {
+            'names': self.names,
+            'points_min': self.points_min,
+            'num_simulations': self.num_simulations,
+            'position_counts': self.position_counts.tolist(),
+            'points_histogram': self.points_histogram.tolist(),
+            # float.hex čuva zbrojeve bit-identično kroz JSON
+            'points_sum': [float(v).hex() for v in self.points_sum],
+            'points_sumsq': [float(v).hex() for v in self.points_sumsq],
+            'championship_group': self.championship_group.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = np.array(data['points_histogram'], dtype=np.int64)
+        acc = cls(data['names'], data['points_min'], data['points_min'] + histogram.shape[1] - 1)
+        acc.num_simulations = int(data['num_simulations'])
+        acc.position_counts = np.array(data['position_counts'], dtype=np.int64)
+        acc.points_histogram = histogram
+        acc.points_sum = np.array([float.fromhex(v) for v in data['points_sum']])
+        acc.points_sumsq = np.array([float.fromhex(v) for v in data['points_sumsq']])
+        acc.championship_group = np.array(data['championship_group'], dtype=np.int64)
+        return acc
+
+    def summary(self):
+        """Postoci po poziciji, prosjek i standardna devijacija bodova, distribucija bodova po timu"""
+        n = max(self.num_simulations, 1)
+        mean = self.points_sum / n
+        std = np.sqrt(np.maximum(self.points_sumsq / n - mean ** 2, 0.0))
+        result = {}
+        for i, team in enumerate(self.names):
+            nonzero = np.flatnonzero(self.points_histogram[i])
+            result[team] = {
+                'position_probabilities': list(self.position_counts[i] / n * 100),
+                'average_points': round(float(mean[i]), 2),
+                'std_points': round(float(std[i]), 2),
+                'championship_group_probability': round(float(self.championship_group[i] / n * 100), 2),
+                'points_distribution': {
+                    int(self.points_min + b): round(float(self.points_histogram[i, b] / n * 100), 4) for b in nonzero
+                },
+            }
+        return {'num_simulations': self.num_simulations, 'teams': result}
+
+
+def league_accumulator(teams, fixtures, initial_points, mode):
+    """Prazan akumulator za zadanu ligu i način"""
+    from batch_engine import team_index
+
+    names, _ = team_index(teams, initial_points)
+    return Accumulator(names, *points_bounds(teams, fixtures, initial_points, mode))
+
+
+def new_accumulator(spec):
+    """Prazan akumulator za ligu i način iz specifikacije"""
+    from leagues import load_league
+
+    league = load_league(spec['league'])
+    return league_accumulator(league['teams'], league['fixtures'], league['initial_points'], spec['mode'])
+
+
+def simulate_block(teams, fixtures, initial_points, mode, num_simulations, k, sampling, seed):
+    """Jedan blok sezona batched motorom: (bodovi (S, T), u ligi za prvaka (S, T) ili None)"""
+    from batch_engine import simulate_season_batch, simulate_championship_batch
+
+    args = (teams, fixtures, initial_points, num_simulations)
+    if mode == 'championship':
+        _, points, champions = simulate_championship_batch(*args, k=k, sampling=sampling, seed=seed)
+        return points, champions
+    _, points, _ = simulate_season_batch(*args, k=k, sampling=sampling, seed=seed)
+    return points, None
+
+
+def run_shard(spec, index):
+    """Simulira jedan shard i vraća njegov akumulator"""
+    from leagues import load_league
+
+    sizes = shard_sizes(spec)
+    if not 0 <= index < len(sizes):
+        raise ValueError(f"Shard {index} ne postoji (shardova: {len(sizes)})")
+
+    league = load_league(spec['league'])
+    start = time.perf_counter()
+    points, champions = simulate_block(
+        league['teams'], league['fixtures'], league['initial_points'], spec['mode'], sizes[index],
+        spec['k'], spec['sampling'], shard_seed(spec, index),
+    )
+    acc = new_accumulator(spec).add(points, champions)
+    metrics.record_simulation(f"shard-{spec['mode']}", sizes[index], time.perf_counter() - start)
+    return acc
+
+
+def merge_shards(spec, results):
+    """Spaja akumulatore shardova redom po indeksu, da zbrojevi ne ovise o redoslijedu dolaska"""
+    merged = new_accumulator(spec)
+    for index in sorted(results):
+        merged.merge(results[index])
+    return merged
+
+
+def run_local(spec):
+    """Svi shardovi u ovom procesu; referenca za run_distributed"""
+    return merge_shards(spec, {i: run_shard(spec, i) for i in range(len(shard_sizes(spec)))})
+
+
+# ---- PROTOCOL ----
+def send_message(sock, message):
+    payload = json.dumps(message).encode('utf-8')
+    sock.sendall(struct.pack('>I', len(payload)) + payload)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Veza je zatvorena usred poruke")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_message(sock):
+    """Sljedeća poruka ili None ako je druga strana zatvorila vezu između poruka"""
+    header = sock.recv(4, socket.MSG_WAITALL)
+    if not header:
+        return None
+    if len(header) < 4:
+        header += _recv_exact(sock, 4 - len(header))
+    (size,) = struct.unpack('>I', header)
+    if size > MAX_MESSAGE:
+        raise ValueError(f"Poruka je prevelika ({size} B)")
+    return json.loads(_recv_exact(sock, size).decode('utf-8'))
+
+
+# ---- WORKER ----
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    """Jedna veza može poslati više zahtjeva redom: {'op': 'run', 'spec', 'shard'} ili {'op': 'ping'}"""
+
+    def handle(self):
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (ConnectionError, ValueError):
+                return
+            if request is None:
+                return
+            try:
+                if request.get('op') == 'ping':
+                    reply = {'ok': True}
+                elif request.get('op') == 'run':
+                    acc = run_shard(request['spec'], int(request['shard']))
+                    reply = {'ok': True, 'shard': request['shard'], 'accumulator': acc.to_dict()}
+                else:
+                    reply = {'ok': False, 'error': f"Nepoznata operacija: {request.get('op')}"}
+            except Exception as e:
+                reply = {'ok': False, 'error': str(e)}
+            send_message(self.request, reply)
+
+
+class WorkerServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve_worker(host='127.0.0.1', port=DEFAULT_PORT):
+    """Pokreće radnika; ispisuje stvarni port (važno za port 0) i poslužuje do prekida"""
+    with WorkerServer((host, port), _WorkerHandler) as server:
+        print(server.server_address[1], flush=True)
+        server.serve_forever()
+
+
+def start_local_workers(count):
+    """Pokreće count radničkih procesa na slučajnim portovima; vraća (procesi, adrese)"""
+    processes, addresses = [], []
+    for _ in range(count):
+        process = subprocess.Popen(
+            [sys.executable, __file__, 'worker', '--port', '0'], stdout=subprocess.PIPE, text=True
+        )
+        processes.append(process)
+        addresses.append(('127.0.0.1', int(process.stdout.readline())))
+    return processes, addresses
+
+
+# ---- COORDINATOR ----
+def parse_address(text):
+    host, _, port = text.rpartition(':')
+    return (host or '127.0.0.1', int(port or DEFAULT_PORT))
+
+
+def run_distributed(spec, workers, max_retries=MAX_RETRIES, timeout=TIMEOUT):
+    """
+    Raspoređuje shardove na radnike (adrese (host, port)) i vraća spojeni Accumulator.
+    Shard koji ne uspije (greška radnika, prekinuta veza, timeout) vraća se u red i
+    pokušava ponovno, najviše max_retries puta; radnik koji se max_retries puta zaredom
+    ne može spojiti izbacuje se (to se ne broji kao pokušaj sharda). Ako shard iscrpi pokušaje ili ne ostane radnika, RuntimeError.
+    """
+    num_shards = len(shard_sizes(spec))
+    pending = queue.Queue()
+    for index in range(num_shards):
+        pending.put((index, 0))
+    results, errors = {}, []
+    lock = threading.Lock()
+
+    def finished():
+        with lock:
+            return len(results) == num_shards or bool(errors)
+
+    def serve(address):
+        conn, failed_connects = None, 0
+        while not finished():
+            try:
+                index, attempt = pending.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if conn is None:
+                try:
+                    conn = socket.create_connection(address, timeout=timeout)
+                    failed_connects = 0
+                except OSError:
+                    # Nedostupan radnik ne troši pokušaje sharda
+                    metrics.inc('elo_shard_failures_total', worker=f"{address[0]}:{address[1]}")
+                    pending.put((index, attempt))
+                    failed_connects += 1
+                    if failed_connects >= max_retries:
+                        return
+                    time.sleep(0.1 * failed_connects)
+                    continue
+            try:
+                send_message(conn, {'op': 'run', 'spec': spec, 'shard': index})
+                reply = recv_message(conn)
+                if reply is None:
+                    raise ConnectionError("Radnik je zatvorio vezu")
+                if not reply.get('ok'):
+                    raise ShardError(reply.get('error'))
+                acc = Accumulator.from_dict(reply['accumulator'])
+                with lock:
+                    results[index] = acc
+            except (OSError, ValueError, KeyError, ShardError) as e:
+                metrics.inc('elo_shard_failures_total', worker=f"{address[0]}:{address[1]}")
+                if not isinstance(e, ShardError) and conn is not None:
+                    conn.close()
+                    conn = None
+                if attempt >= max_retries:
+                    with lock:
+                        errors.append(f"Shard {index} nije uspio nakon {attempt + 1} pokušaja: {e}")
+                    return
+                pending.put((index, attempt + 1))
+        if conn is not None:
+            conn.close()
+
+    threads = [threading.Thread(target=serve, args=(address,), daemon=True) for address in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise RuntimeError(errors[0])
+    if len(results) < num_shards:
+        raise RuntimeError(f"Nema dostupnih radnika; završeno {len(results)} od {num_shards} shardova")
+    return merge_shards(spec, results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    worker = sub.add_parser('worker', help="pokreni radnika")
+    worker.add_argument('--host', default='127.0.0.1')
+    worker.add_argument('--port', type=int, default=DEFAULT_PORT)
+
+    coordinate = sub.add_parser('coordinate', help="podijeli simulaciju na radnike i spoji rezultat")
+    coordinate.add_argument('--workers', default='', help="adrese radnika host:port, odvojene zarezom")
+    coordinate.add_argument('--local-workers', type=int, default=0, help="pokreni toliko lokalnih radnika")
+    coordinate.add_argument('--league')
+    coordinate.add_argument('--simulations', type=int, default=10_000_000)
+    coordinate.add_argument('--mode', default='season', choices=MODES)
+    coordinate.add_argument('--sampling', default='random')
+    coordinate.add_argument('--k', type=float, help="zadano: K iz sim_config.json")
+    coordinate.add_argument('--seed', type=int)
+    coordinate.add_argument('--shard-size', type=int, default=SHARD_SIZE)
+    coordinate.add_argument('--retries', type=int, default=MAX_RETRIES)
+    coordinate.add_argument('--verify', action='store_true', help="usporedi s lokalnim pokretanjem istih shardova")
+    coordinate.add_argument('--json', help="spremi sažetak u JSON datoteku")
+    args = parser.parse_args()
+
+    if args.command == 'worker':
+        serve_worker(args.host, args.port)
+        sys.exit(0)
+
+    spec = make_spec(args.simulations, args.league, args.mode, args.k, args.sampling, args.seed, args.shard_size)
+    addresses = [parse_address(a) for a in args.workers.split(',') if a]
+    processes = []
+    if args.local_workers:
+        processes, local = start_local_workers(args.local_workers)
+        addresses += local
+    if not addresses:
+        parser.error("Zadaj --workers ili --local-workers")
+
+    try:
+        start = time.perf_counter()
+        merged = run_distributed(spec, addresses, max_retries=args.retries)
+        elapsed = time.perf_counter() - start
+    finally:
+        for process in processes:
+            process.terminate()
+
+    print(f"Seed {spec['seed']}: {merged.num_simulations:,} sezona u {len(shard_sizes(spec))} shardova, "
+          f"{len(addresses)} radnika, {elapsed:.1f}s ({merged.num_simulations / elapsed:,.0f} sezona/s)")
+    summary = merged.summary()
+    print(f"{'Tim':<20}{'Prvi %':>8}{'Bodovi':>8}{'SD':>6}")
+    for team, stats in sorted(summary['teams'].items(), key=lambda x: -x[1]['average_points']):
+        print(f"{team:<20}{stats['position_probabilities'][0]:>8.2f}{stats['average_points']:>8.2f}{stats['std_points']:>6.2f}")
+
+    if args.verify:
+        same = merged.to_dict() == run_local(spec).to_dict()
+        print("Lokalno pokretanje istih shardova:", "identično" if same else "RAZLIKUJE SE")
+        if not same:
+            sys.exit(1)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'spec': spec, 'summary': summary}, f, indent=2)
@@ -0,0 +1,30 @@
+import json
+import os
+
+# Parametri simulatora; fit_params.py ih može prepisati procijenjenim vrijednostima
+CONFIG_FILE = 'sim_config.json'
+
+DEFAULTS = {
+    'k': 20,
+    'home_advantage': 50,
+    'draw_band': 0.25,
+}
+
+
+def load_sim_config(path=CONFIG_FILE):
+    """Vraća parametre simulatora (zadane vrijednosti ako datoteka ne postoji)"""
+    config = dict(DEFAULTS)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        config.update({key: saved[key] for key in DEFAULTS if key in saved})
+    return config
+
+
+def save_sim_config(params, path=CONFIG_FILE, **metadata):
+    payload = {key: params[key] for key in DEFAULTS}
+    payload.update(metadata)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
+from jit_kernel import pool_context
+from leagues import list_leagues, load_league
+
+# ---- CONFIG ----
+MAX_WORKERS = None  # zadano: broj jezgri
+CACHE_SIZE = 64     # broj zadnjih rezultata koji se čuvaju (sve lige zajedno)
+SEASON_CACHE_SIZE = 4  # cijele sezone (bodovi i ishodi po simulaciji) su veće, čuva ih se manje
+
+_pool = None
+_pool_lock = threading.Lock()
+_results = OrderedDict()  # ključ -> Future
+_seasons = OrderedDict()  # ključ -> Future cijele sezone (submit_season_run)
+_results_lock = threading.Lock()
+
+
+def get_pool():
+    """Jedan zajednički pool procesa za simulacije svih liga"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=pool_context())
+        return _pool
+
+
+def _run_simulations(args):
+    from runELO import run_position_counts
+
+    teams, fixtures, initial_points, num_simulations, k, sampling = args
+    # Metrike iz radnog procesa (propusnost, faze motora) vraćaju se s rezultatom
+    with metrics.capture() as updates:
+        start = time.perf_counter()
+        # Kompaktni rezultat (uint32 brojači pozicija): manji za prijenos iz procesa i za cache
+        result = run_position_counts(
+            teams, fixtures, initial_points, num_simulations=num_simulations, k=k, sampling=sampling
+        )
+        # Vrijeme se mjeri u radnom procesu, bez čekanja u redu
+        metrics.record_simulation(sampling or 'legacy', num_simulations, time.perf_counter() - start)
+    return result, updates
+
+
+def _run_season(args):
+    from batch_engine import simulate_season_run
+
+    teams, fixtures, initial_points, num_simulations, k, sampling, seed = args
+    with metrics.capture() as updates:
+        start = time.perf_counter()
+        run = simulate_season_run(
+            teams, fixtures, initial_points, num_simulations, k=k, sampling=sampling, seed=seed
+        )
+        metrics.record_simulation(f"season-{sampling}", num_simulations, time.perf_counter() - start)
+    return run, updates
+
+
+def _record_metrics(future):
+    # Callback se izvršava u procesu API-ja, pa metrike radnika završe u njegovom registru
+    if future.exception() is None:
+        metrics.apply(future.result()[1])
+
+
+def _result_key(league_id, teams, fixtures, initial_points, num_simulations, k, sampling, *extra):
+    payload = json.dumps(
+        [league_id, sorted(teams.items()), list(fixtures), list(initial_points.items()), num_simulations, k, sampling,
+         *extra],
+        ensure_ascii=False, default=float,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# ---- SCHEDULING ----
+def submit_simulations(league_id, teams, fixtures, initial_points, num_simulations, k, sampling=None):
+    """
+    Zakazuje simulaciju na zajedničkom poolu i vraća Future s ((imena, counts, zbroj bodova),
+    metrike iz radnog procesa), vidi runELO.run_position_counts. Isti ulazi (i za ligu u tijeku) dijele isti Future, pa se svaka projekcija
+    računa jednom dok se podaci lige ne promijene.
+    """
+    key = _result_key(league_id, teams, fixtures, initial_points, num_simulations, k, sampling)
+    return _submit(_results, CACHE_SIZE, key, _run_simulations,
+                   (teams, list(fixtures), initial_points, num_simulations, k, sampling))
+
+
+def submit_season_run(league_id, teams, fixtures, initial_points, num_simulations, k, sampling='random', seed=None):
+    """
+    Zakazuje cijelu sezonu s ishodima utakmica (batch_engine.simulate_season_run) i vraća
+    Future s (pokretanje, metrike iz radnog procesa). Distribucije bodova i projekcija
+    strijelaca s istim ulazima čitaju isto pokretanje iz cachea.
+    """
+    key = _result_key(league_id, teams, fixtures, initial_points, num_simulations, k, sampling, 'season', seed)
+    return _submit(_seasons, SEASON_CACHE_SIZE, key, _run_season,
+                   (teams, list(fixtures), initial_points, num_simulations, k, sampling, seed))
+
+
+def _submit(cache, capacity, key, fn, args):
+    """Future iz cachea za ključ ili novi posao na poolu (neuspjeli poslovi se ponavljaju)"""
+    with _results_lock:
+        future = cache.get(key)
+        if future is not None and not (future.done() and future.exception() is not None):
+            cache.move_to_end(key)
+            metrics.cache_lookup('simulations', hit=True)
+            return future
+
+        metrics.cache_lookup('simulations', hit=False)
+        future = get_pool().submit(fn, args)
+        future.add_done_callback(_record_metrics)
+        cache[key] = future
+        while len(cache) > capacity:
+            cache.popitem(last=False)
+        return future
+
+
+def run_simulations(league_id, teams, fixtures, initial_points, num_simulations, k, sampling=None):
+    """Blokirajuća verzija submit_simulations (isti izlaz kao run_multiple_simulations)"""
+    from batch_engine import summarize_position_counts
+
+    future = submit_simulations(league_id, teams, fixtures, initial_points, num_simulations, k, sampling)
+    names, counts, totals = future.result()[0]
+    return summarize_position_counts(names, counts, totals, num_simulations)
+
+
+def season_run(league, num_simulations, sampling='random', seed=None):
+    """Blokirajuća verzija submit_season_run za ligu iz leagues.load_league (k iz runELO)"""
+    from runELO import k
+
+    future = submit_season_run(
+        league['id'], league['teams'], league['fixtures'], league['initial_points'], num_simulations, k, sampling, seed
+    )
+    return future.result()[0]
+
+
+def warm_leagues(league_ids=None, num_simulations=None, sampling=None):
+    """
+    Zakazuje projekcije prve faze za sve (ili zadane) lige odjednom.
+    Vraća {liga: Future}; ne čeka rezultate.
+    """
+    from runELO import k, num_simulations as default_simulations
+
+    futures = {}
+    for league_id in league_ids or list_leagues():
+        league = load_league(league_id)
+        futures[league_id] = submit_simulations(
+            league_id, league['teams'], league['fixtures'], league['initial_points'],
+            num_simulations or default_simulations, k, sampling,
+        )
+    return futures
+
+
+def cache_info():
+    with _results_lock:
+        return {
+            'entries': len(_results),
+            'running': sum(not f.done() for f in list(_results.values()) + list(_seasons.values())),
+            'capacity': CACHE_SIZE,
+            'season_entries': len(_seasons),
+        }
@@ -0,0 +1,177 @@
+import pandas as pd
+
+from metrics import StageTimer
+from runELO import k, num_simulations, simulate_league, generate_second_phase_fixtures
+from sim_service import run_simulations
+
+
+def build_simulation_report(league, sampling=None):
+    """
+    Strukturirani rezultat simulacije lige (JSON iz /api/simulation-text).
+    Koriste ga API i renderer grafova, bez HTTP poziva.
+    """
+    teams, fixtures, initial_points = league['teams'], league['fixtures'], league['initial_points']
+    stages = StageTimer('report')
+
+    # --- PRVA FAZA - Monte Carlo simulacija ---
+    position_probs, avg_points_dict, qual_top8_dict, qual_top24_dict = run_simulations(
+        league['id'], teams, fixtures, initial_points, num_simulations, k, sampling
+    )
+    
+    sorted_avg = sorted(avg_points_dict.items(), key=lambda x: x[1], reverse=True)
+    liga_prvaka = [t for t, _ in sorted_avg[:6]]
+    liga_ostanak = [t for t, _ in sorted_avg[6:]]
+
+    # ✅ ISPRAVKA: Računaj prosjek bodova i ELO-a nakon prve faze
+    # Simuliraj prvu fazu više puta da dobiješ reprezentativne početne uvjete za drugu fazu
+    total_points_after_phase1 = {team: 0 for team in teams}
+    total_elos_after_phase1 = {team: 0 for team in teams}
+    
+    phase1_simulations = 500  # Optimalno između brzine i preciznosti
+    
+    for _ in range(phase1_simulations):
+        pts_temp, elos_temp = simulate_league(teams, fixtures, initial_points, k)
+        for team in teams:
+            total_points_after_phase1[team] += pts_temp[team]
+            total_elos_after_phase1[team] += elos_temp[team]
+    
+    # Izračunaj prosjek nakon prve faze
+    avg_points_after_phase1 = {team: total_points_after_phase1[team] / phase1_simulations for team in teams}
+    avg_elos_after_phase1 = {team: total_elos_after_phase1[team] / phase1_simulations for team in teams}
+    stages.mark('phase1')
+
+    # --- DRUGA FAZA: Liga za prvaka ---
+    fix_prvaka = generate_second_phase_fixtures(liga_prvaka)
+    teams_prv = {t: avg_elos_after_phase1[t] for t in liga_prvaka}  # ✅ Koristi prosjek ELO
+    pts_prv = {t: avg_points_after_phase1[t] for t in liga_prvaka}  # ✅ Koristi prosjek bodova
+
+    # --- DRUGA FAZA: Liga za ostanak ---
+    fix_ostanak = generate_second_phase_fixtures(liga_ostanak)
+    teams_ost = {t: avg_elos_after_phase1[t] for t in liga_ostanak}  # ✅ Koristi prosjek ELO
+    pts_ost = {t: avg_points_after_phase1[t] for t in liga_ostanak}  # ✅ Koristi prosjek bodova
+    stages.mark('split')
+
+    # Simuliraj druge faze
+    pts_prv_final, elos_prv_final = simulate_league(teams_prv, fix_prvaka, pts_prv, k)
+    prob_prv, avg_prv, qual_top8_prv, qual_top24_prv = run_simulations(
+        league['id'], teams_prv, fix_prvaka, pts_prv, num_simulations, k, sampling
+    )
+    
+    pts_ost_final, elos_ost_final = simulate_league(teams_ost, fix_ostanak, pts_ost, k)
+    prob_ost, avg_ost, qual_top8_ost, qual_top24_ost = run_simulations(
+        league['id'], teams_ost, fix_ostanak, pts_ost, num_simulations, k, sampling
+    )
+    stages.mark('phase2')
+
+    # --- FORMATIRANJE REZULTATA U STRUKTURIRANI JSON ---
+    
+    # Prva faza - bodovi timova
+    phase1_teams = []
+    for team, points in sorted_avg:
+        phase1_teams.append({
+            "team": team,
+            "projected_points": round(points, 2)
+        })
+
+    # Liga za prvaka
+    liga_prvaka_results = []
+    sorted_prv = sorted(pts_prv_final.items(), key=lambda x: x[1], reverse=True)
+    for position, (team, _) in enumerate(sorted_prv, 1):
+        avg_pts = avg_prv[team]
+        probs = prob_prv[team][:6]
+        liga_prvaka_results.append({
+            "position": position,
+            "team": team,
+            "projected_points": round(avg_pts, 2),
+            "starting_points_phase2": round(pts_prv[team], 2),  # ✅ Dodano za debug
+            "position_probabilities": {
+                "1st": round(probs[0], 2),
+                "2nd": round(probs[1], 2),
+                "3rd": round(probs[2], 2),
+                "4th": round(probs[3], 2),
+                "5th": round(probs[4], 2),
+                "6th": round(probs[5], 2)
+            }
+        })
+
+    # Liga za ostanak
+    liga_ostanak_results = []
+    sorted_ost = sorted(pts_ost_final.items(), key=lambda x: x[1], reverse=True)
+    for position, (team, _) in enumerate(sorted_ost, 1):
+        avg_pts = avg_ost[team]
+        probs = prob_ost[team][:6]
+        liga_ostanak_results.append({
+            "position": position,
+            "team": team,
+            "projected_points": round(avg_pts, 2),
+            "starting_points_phase2": round(pts_ost[team], 2),  # ✅ Dodano za debug
+            "position_probabilities": {
+                "1st": round(probs[0], 2),
+                "2nd": round(probs[1], 2),
+                "3rd": round(probs[2], 2),
+                "4th": round(probs[3], 2),
+                "5th": round(probs[4], 2),
+                "6th": round(probs[5], 2)
+            }
+        })
+
+    # Opća statistika (iz prve faze)
+    overall_stats = []
+    for team, avg_points in sorted_avg:
+        team_probs = position_probs[team]
+        champion_prob = team_probs[0] if len(team_probs) > 0 else 0
+        top6_prob = sum(team_probs[:6]) if len(team_probs) >= 6 else sum(team_probs)
+        
+        overall_stats.append({
+            "team": team,
+            "projected_points": round(avg_points, 2),
+            "champion_probability": round(champion_prob, 2),
+            "top6_probability": round(top6_prob, 2),
+            "all_position_probabilities": [round(p, 2) for p in team_probs[:12]]
+        })
+
+    # Finalni strukturirani JSON
+    result = {
+        "simulation_summary": {
+            "total_simulations": num_simulations,
+            "league": league['id'],
+            "k_factor": k,
+            "sampling": sampling or "legacy",
+            "phase1_simulations_for_avg": phase1_simulations,
+            "phase_structure": {
+                "phase1": "Svi timovi igraju međusobno (22 kola)",
+                "phase2_champions": "Top 6 timova se bore za prvaka (dodatnih 5 kola)",
+                "phase2_relegation": "Bottom 6 timova se bore protiv ispadanja (dodatnih 5 kola)"
+            }
+        },
+        "phase1_results": {
+            "description": "Projekcije bodova nakon prve faze (22 kola)",
+            "teams": phase1_teams
+        },
+        "champions_league": {
+            "description": "Liga za prvaka (Top 6 timova - ukupno 27 kola)",
+            "teams": liga_prvaka_results
+        },
+        "relegation_league": {
+            "description": "Liga za ostanak (Bottom 6 timova - ukupno 27 kola)",
+            "teams": liga_ostanak_results
+        },
+        "overall_statistics": {
+            "description": "Ukupne statistike i vjerojatnosti (prva faza)",
+            "teams": overall_stats
+        },
+        "phase_connection_info": {
+            "description": "Informacije o povezivanju faza",
+            "phase1_avg_points": {team: round(pts, 2) for team, pts in avg_points_after_phase1.items()},
+            "champions_starting_points": {team: round(pts_prv[team], 2) for team in liga_prvaka},
+            "relegation_starting_points": {team: round(pts_ost[team], 2) for team in liga_ostanak}
+        },
+        "metadata": {
+            "generated_at": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "total_teams": len(teams),
+            "simulation_type": "ELO-based Monte Carlo with connected phases"
+        }
+    }
+
+    stages.mark('aggregation')
+    return result
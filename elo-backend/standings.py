@@ -0,0 +1,124 @@
+import numpy as np
+
+from rounds import load_all_rounds, ROUND_PATTERN
+from team_registry import canonical_name
+
+# Stupci tablice kao u tablica2025: odigrano, pobjede, neriješeno, izgubljeno, golovi
+STATS = ('O', 'P', 'N', 'I', 'GF', 'GA')
+
+
+class Standings:
+    """
+    Kumulativna tablica po kolima. Za svako kolo čuva se snapshot (timovi x STATS),
+    pa je tablica nakon kola r samo čitanje jednog snapshota, a novo kolo je
+    kopija zadnjeg snapshota plus zbrajanje njegovih utakmica.
+    """
+
+    def __init__(self, teams=(), base=None, adjustments=None):
+        self.teams = []
+        self._index = {}
+        self._adjustments = {canonical_name(t): v for t, v in (adjustments or {}).items()}
+        self.rounds = [0]
+        self._snapshots = [np.zeros((0, len(STATS)), dtype=np.int32)]
+        self._round_pos = {0: 0}
+
+        for team in list(teams) + list(base or {}):
+            self._ensure_team(canonical_name(team))
+        for team, stats in (base or {}).items():
+            row = self._snapshots[0][self._index[canonical_name(team)]]
+            row[:] = [stats.get(s, 0) for s in STATS]
+
+    @classmethod
+    def from_matches(cls, df, base=None, adjustments=None):
+        """Gradi snapshotove iz okvira utakmica sa stupcem 'round'"""
+        standings = cls(sorted(set(df['homeTeam']) | set(df['awayTeam'])), base, adjustments)
+        for round_no, round_df in df.groupby('round', sort=True):
+            standings.apply_round(int(round_no), round_df)
+        return standings
+
+    def _ensure_team(self, team):
+        if team in self._index:
+            return self._index[team]
+        self._index[team] = len(self.teams)
+        self.teams.append(team)
+        self._snapshots = [np.vstack([s, np.zeros((1, len(STATS)), dtype=np.int32)]) for s in self._snapshots]
+        return self._index[team]
+
+    # ---- UPDATE ----
+    def apply_round(self, round_no, df):
+        """Dodaje snapshot za novo kolo (homeTeam, awayTeam, homeScore, awayScore)"""
+        if round_no <= self.rounds[-1]:
+            raise ValueError(f"Kolo {round_no} nije novije od zadnjeg kola {self.rounds[-1]}")
+
+        home = np.array([self._ensure_team(t) for t in df['homeTeam']], dtype=np.intp)
+        away = np.array([self._ensure_team(t) for t in df['awayTeam']], dtype=np.intp)
+        hs = df['homeScore'].to_numpy(dtype=np.int32)
+        as_ = df['awayScore'].to_numpy(dtype=np.int32)
+
+        # Redak statistike za domaćina i gosta po utakmici, pa jedan np.add.at
+        win, draw, loss = (hs > as_).astype(np.int32), (hs == as_).astype(np.int32), (hs < as_).astype(np.int32)
+        ones = np.ones_like(hs)
+        home_rows = np.column_stack([ones, win, draw, loss, hs, as_])
+        away_rows = np.column_stack([ones, loss, draw, win, as_, hs])
+
+        snapshot = self._snapshots[-1].copy()
+        np.add.at(snapshot, home, home_rows)
+        np.add.at(snapshot, away, away_rows)
+
+        self._round_pos[round_no] = len(self.rounds)
+        self.rounds.append(round_no)
+        self._snapshots.append(snapshot)
+        return snapshot
+
+    # ---- QUERIES ----
+    def snapshot(self, round_no=None):
+        """Sirovi snapshot (timovi x STATS) nakon kola; zadnje kolo ako nije zadano"""
+        if round_no is None:
+            return self._snapshots[-1]
+        if round_no not in self._round_pos:
+            raise KeyError(f"Nema snapshota za kolo {round_no}")
+        return self._snapshots[self._round_pos[round_no]]
+
+    def points_array(self, round_no=None):
+        snap = self.snapshot(round_no)
+        adjustments = np.array([self._adjustments.get(t, 0) for t in self.teams], dtype=np.int32)
+        return 3 * snap[:, 1] + snap[:, 2] + adjustments
+
+    def table(self, round_no=None):
+        """
+        Poredak nakon kola: lista (klub, {O, P, N, I, GF, GA, Bod}) sortirana po
+        bodovima, gol razlici i postignutim golovima
+        """
+        snap = self.snapshot(round_no)
+        pts = self.points_array(round_no)
+        gd = snap[:, 4] - snap[:, 5]
+        order = np.lexsort((-snap[:, 4], -gd, -pts))
+        return [
+            (self.teams[i], {**dict(zip(STATS, snap[i].tolist())), 'Bod': int(pts[i])})
+            for i in order
+        ]
+
+    def points(self, round_no=None):
+        """{klub: bodovi} poredano po tablici (ulaz za simulator)"""
+        return {team: stats['Bod'] for team, stats in self.table(round_no)}
+
+    def cumulative(self):
+        """Tenzor (kola x timovi x [bodovi, gol razlika]) za sva spremljena kola bez kola 0"""
+        snaps = np.stack(self._snapshots[1:]) if len(self._snapshots) > 1 else np.zeros((0, len(self.teams), len(STATS)))
+        adjustments = np.array([self._adjustments.get(t, 0) for t in self.teams])
+        pts = 3 * snaps[..., 1] + snaps[..., 2] + adjustments
+        return np.stack([pts, snaps[..., 4] - snaps[..., 5]], axis=-1)
+
+    def cumulative_goals(self):
+        """Postignuti golovi (kola x timovi) za sva spremljena kola bez kola 0"""
+        if len(self._snapshots) == 1:
+            return np.zeros((0, len(self.teams)), dtype=np.int32)
+        return np.stack(self._snapshots[1:])[..., STATS.index('GF')]
+
+
+def current_standings(directory='.', pattern=ROUND_PATTERN, adjustments=None):
+    """
+    Tablica tekuće sezone iz svih datoteka kola. adjustments su korekcije bodova
+    izvan rezultata na terenu (npr. {"Drava": -3} za oduzete bodove).
+    """
+    return Standings.from_matches(load_all_rounds(directory, pattern), adjustments=adjustments)
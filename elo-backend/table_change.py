@@ -1,75 +1,43 @@
-import pandas as pd
-import os
 import matplotlib.pyplot as plt
 
-clubs_order = [
-    "Zadrugar", "Mladost SL", "Zelengaj", "Beretinec",
-    "Mladost VT", "Drava", "Semovec", "Nova Ves",
-    "Sloboda", "Plitvica", "Dubravka", "Obres"
-]
+from chart_output import finish_figure
+from leagues import load_league, DEFAULT_LEAGUE
+from trajectory import team_trajectories
 
-results_per_round = []
-for i in range(1, 12):
-    filename = f"newround{i}.csv"
-    if os.path.exists(filename):
-        df = pd.read_csv(filename, sep=';')
-        results_per_round.append(df)
-    else:
-        results_per_round.append(pd.DataFrame(columns=["homeTeam","awayTeam","homeScore","awayScore","dateOfMatch"]))
 
-club_history = {club: [] for club in clubs_order}
-club_stats = {club: {'points': 0, 'gf': 0, 'ga': 0} for club in clubs_order}
+def compute_positions(league_id=DEFAULT_LEAGUE):
+    """Pozicija svakog kluba po kolima: {klub: [pozicija u kolu 1, 2, ...]}"""
+    _, positions = team_trajectories(load_league(league_id)['standings'])
+    return positions
 
-for round_idx, round_df in enumerate(results_per_round):
-    round_tally = {club: club_stats[club].copy() for club in clubs_order}
-    for _, row in round_df.iterrows():
-        home, away = row['homeTeam'], row['awayTeam']
-        hs, as_ = int(row['homeScore']), int(row['awayScore'])
-        round_tally[home]['gf'] += hs
-        round_tally[home]['ga'] += as_
-        round_tally[away]['gf'] += as_
-        round_tally[away]['ga'] += hs
-        if hs > as_:
-            round_tally[home]['points'] += 3
-        elif hs < as_:
-            round_tally[away]['points'] += 3
+
+def create_rank_trajectory_chart(positions, highlight="Zelengaj", out_path=None):
+    """Graf kretanja po tablici; klub 'highlight' je istaknut, ostali su sivi"""
+    rounds = range(1, len(next(iter(positions.values()))) + 1)
+    fig = plt.figure(figsize=(14, 7))
+    for club, pos_list in positions.items():
+        if club == highlight:
+            plt.plot(rounds, pos_list, marker='o', label=club, color='green', linewidth=6, markersize=16, zorder=2)
         else:
-            round_tally[home]['points'] += 1
-            round_tally[away]['points'] += 1
-    for club in clubs_order:
-        club_stats[club] = round_tally[club].copy()
-        club_history[club].append((club_stats[club]['points'], club_stats[club]['gf']-club_stats[club]['ga']))
+            plt.plot(rounds, pos_list, marker='o', color='lightgray', linewidth=1.5, markersize=8, zorder=1)
 
-positions = {club: [] for club in clubs_order}
-for rnd in range(len(results_per_round)):
-    table = []
-    for club in clubs_order:
-        pts, gr = club_history[club][rnd]
-        table.append((pts, gr, club))
-    table_sorted = sorted(table, key=lambda x: (-x[0], -x[1], clubs_order.index(x[2])))
-    for pos, (_, _, club) in enumerate(table_sorted, 1):
-        positions[club].append(pos)
+    plt.gca().invert_yaxis()
+    plt.xticks(rounds)
+    plt.xlabel('Kolo', fontsize=13)
+    plt.ylabel('Pozicija', fontsize=13)
+    plt.title('Praćenje promjena na tablici po klubovima')
 
-plt.figure(figsize=(14, 7))
-for club, pos_list in positions.items():
-    if club == "Zelengaj":
-        plt.plot(range(1, 12), pos_list, marker='o', label=club, color='green', linewidth=6, markersize=16, zorder=2)
-    else:
-        plt.plot(range(1, 12), pos_list, marker='o', color='lightgray', linewidth=1.5, markersize=8, zorder=1)
+    # DODAJEMO LEGENDU SA STRANE, sortirano po poziciji u zadnjem kolu:
+    final_table = sorted([(pos_list[-1], club) for club, pos_list in positions.items()])
+    for club, pos_list in positions.items():
+        x_pos = rounds[-1] + 0.5  # Slightly to the right of the last column
+        y_pos = pos_list[-1]
+        plt.text(x_pos, y_pos, club, va='center', ha='left', fontsize=13, color='green' if club == highlight else 'gray', fontweight='bold' if club == highlight else 'normal')
 
-plt.gca().invert_yaxis()
-plt.xticks(range(1, 12))
-plt.xlabel('Kolo', fontsize=13)
-plt.ylabel('Pozicija', fontsize=13)
-plt.title('Praćenje promjena na tablici po klubovima')
+    plt.xlim(1, rounds[-1] + 1.7)
+    plt.tight_layout()
+    finish_figure(fig, out_path)
 
-# DODAJEMO LEGENDU SA STRANE, sortirano po poziciji u zadnjem kolu:
-final_table = sorted([(pos_list[-1], club) for club, pos_list in positions.items()])
-for club, pos_list in positions.items():
-    x_pos = 11.5  # Slightly to the right of the last column
-    y_pos = pos_list[-1]
-    plt.text(x_pos, y_pos, club, va='center', ha='left', fontsize=13, color='green' if club == 'Zelengaj' else 'gray', fontweight='bold' if club == 'Zelengaj' else 'normal')
 
-plt.xlim(1, 12.7)
-plt.tight_layout()
-plt.show()
+if __name__ == '__main__':
+    create_rank_trajectory_chart(compute_positions())
@@ -1,4 +1,8 @@
-import pandas as pd
+from standings import Standings
+from workbook_cache import load_results
+
+# Prvih 98 redova podataka u Excelu (jesenski dio) već je uračunato u current_table
+FIRST_NEW_ROW = 98
 
 # Postojeća tablica s podacima za prvih 8 kola
 current_table = {
@@ -16,48 +20,14 @@ current_table = {
     "Obres": {"O": 9, "P": 2, "N": 0, "I": 7, "GF": 8, "GA": 19, "Bod": 6}
 }
 
-# Učitaj Excel (preskače prvih 99 redova)
-df = pd.read_excel(r"result2425.xlsx", header=None, skiprows=99)
-
-df.columns = ["Domacin", "Gost", "Datum", "GolDomacin", "GolGost"]
-
-# Klupske statistike u koje ćemo zbrajati postojeće i nove rezultate
-tablica = {}
-
-# Učitaj postojeću tablicu u tablica dict
-for klub, stats in current_table.items():
-    tablica[klub] = stats.copy()
-
-def update_team(team, scored, conceded, win, draw, loss):
-    if team not in tablica:
-        tablica[team] = {"O": 0, "P": 0, "N": 0, "I": 0, "GF": 0, "GA": 0, "Bod": 0}
-    tablica[team]["O"] += 1
-    tablica[team]["GF"] += int(scored)
-    tablica[team]["GA"] += int(conceded)
-    tablica[team]["P"] += win
-    tablica[team]["N"] += draw
-    tablica[team]["I"] += loss
-    tablica[team]["Bod"] += win * 3 + draw
-
-# Ažuriraj statistike novim rezultatima iz Excela
-for row in df.itertuples():
-    if pd.isna(row.Domacin) or pd.isna(row.Gost):
-        continue
-    home, away = row.Domacin, row.Gost
-    g_home, g_away = row.GolDomacin, row.GolGost
-
-    if g_home > g_away:
-        update_team(home, g_home, g_away, 1, 0, 0)
-        update_team(away, g_away, g_home, 0, 0, 1)
-    elif g_home < g_away:
-        update_team(home, g_home, g_away, 0, 0, 1)
-        update_team(away, g_away, g_home, 1, 0, 0)
-    else: # neriješeno
-        update_team(home, g_home, g_away, 0, 1, 0)
-        update_team(away, g_away, g_home, 0, 1, 0)
+# Učitaj rezultate iz cachea (bez ponovnog parsiranja Excela), samo nove redove
+df = load_results("result2425.xlsx")
+df = df[df["row"] >= FIRST_NEW_ROW]
 
-# Sortiraj finalnu tablicu po bodovima i gol razlici
-sorted_tablica = sorted(tablica.items(), key=lambda x: (x[1]["Bod"], x[1]["GF"] - x[1]["GA"]), reverse=True)
+# Postojeća tablica je početni snapshot, rezultati iz Excela dodaju se kao jedno kolo
+standings = Standings(base=current_table)
+standings.apply_round(1, df)
+sorted_tablica = standings.table()
 
 # Printaj tablicu u formatu markdown
 print("| Poz | Klub             | O  | P  | N  | I  | GF:GA  | +/−  | Bod |")
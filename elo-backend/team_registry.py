@@ -0,0 +1,92 @@
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Kanonska imena (kao u runELO) s fiksnim ID-om i poznatim varijantama imena
+# iz Excela, CSV kola, tablica2025 i gledanost.html
+CANONICAL_TEAMS = [
+    (1, "Beretinec", ["NK Beretinec"]),
+    (2, "Drava", ["ŠNK Drava"]),
+    (3, "Dubravka", ["Dubravka-Zagorac", "NK Dubravka-Zagorac"]),
+    (4, "Mladost SL", ["ŠNK Mladost Sigetec Ludbreški", "Mladost Sigetec Ludbreški", "Mladost Sigetec"]),
+    (5, "Mladost VT", ["ŠNK Mladost Varaždinske Toplice", "Mladost Varaždinske Toplice"]),
+    (6, "Nova Ves", ["NK Nova Ves"]),
+    (7, "Obres", ["Obreš", "NK Obreš"]),
+    (8, "Plitvica", ["Plitvica (S)", "NK Plitvica (S)"]),
+    (9, "Semovec", ["Šemovec", "Mladost (Š)", "Mladost Šemovec", "ŠNK Mladost Šemovec"]),
+    (10, "Sloboda", ["Sloboda Tužno", "NK Sloboda Tužno"]),
+    (11, "Zadrugar", ["ŠNK Zadrugar"]),
+    (12, "Zelengaj", ["NK Zelengaj"]),
+    (13, "Mladost VŽ", []),
+    (14, "Polet", []),
+]
+
+
+def clean_name(x):
+    """Stari std_name: skida prefikse kluba i interpunkciju"""
+    return str(x).strip().replace('ŠNK ','').replace('NK ','').replace('(S)','').replace('(C)','').replace('.','').replace(',','')
+
+
+def _key(name):
+    """Ključ za usporedbu: bez prefiksa, interpunkcije, dijakritika i razlike u velikim slovima"""
+    text = clean_name(name).replace('(', ' ').replace(')', ' ').replace('-', ' ')
+    text = text.replace('Đ', 'D').replace('đ', 'd')
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(text.casefold().split())
+
+
+# ---- HASH TABLES ----
+_names = {}    # id -> kanonsko ime
+_ids = {}      # kanonsko ime -> id
+_aliases = {}  # ključ -> id
+
+for _team_id, _name, _variants in CANONICAL_TEAMS:
+    _names[_team_id] = _name
+    _ids[_name] = _team_id
+    for _variant in [_name] + _variants:
+        _aliases[_key(_variant)] = _team_id
+
+
+@lru_cache(maxsize=None)
+def team_id(name):
+    """ID kluba za bilo koju varijantu imena; nepoznati klubovi dobivaju novi ID"""
+    key = _key(name)
+    found = _aliases.get(key)
+    if found is None:
+        found = max(_names) + 1
+        canonical = clean_name(name)
+        _names[found] = canonical
+        _ids[canonical] = found
+        _aliases[key] = found
+    return found
+
+
+def canonical_name(name):
+    return _names[team_id(name)]
+
+
+def team_name(team_id_):
+    return _names[team_id_]
+
+
+def all_teams():
+    """{id: kanonsko ime} za sve poznate klubove"""
+    return dict(_names)
+
+
+# ---- VECTORIZED ----
+def team_ids(values):
+    """ID-ovi za cijeli stupac: svako različito ime razrješava se samo jednom"""
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+    lookup = np.array([team_id(u) for u in uniques] + [-1], dtype=np.int32)
+    return lookup[codes]
+
+
+def canonical_names(values):
+    """Kanonska imena za cijeli stupac (Series ili lista)"""
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values)
+    lookup = np.array([canonical_name(u) for u in uniques] + [None], dtype=object)
+    return pd.Series(lookup[codes], index=values.index)
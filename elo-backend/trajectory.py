@@ -0,0 +1,37 @@
+import numpy as np
+
+from standings import current_standings
+
+
+def rank_trajectory(cumulative, tiebreak=None):
+    """
+    Pozicije svih timova u svim kolima jednim lexsortom.
+    cumulative: tenzor (kola x timovi x [bodovi, gol razlika]), npr. Standings.cumulative()
+    tiebreak: dodatni kriterij nakon gol razlike, veće je bolje (timovi ili kola x timovi);
+    potpuno izjednačeni timovi ostaju u redoslijedu stupaca
+    Vraća polje (kola x timovi) s pozicijama od 1.
+    """
+    cumulative = np.asarray(cumulative)
+    num_rounds, num_teams = cumulative.shape[:2]
+
+    keys = [-cumulative[..., 1].ravel(), -cumulative[..., 0].ravel(), np.repeat(np.arange(num_rounds), num_teams)]
+    if tiebreak is not None:
+        keys.insert(0, -np.broadcast_to(tiebreak, (num_rounds, num_teams)).ravel())
+
+    # Zadnji ključ je primarni: kolo, pa bodovi, gol razlika i tiebreak (lexsort je stabilan)
+    order = np.lexsort(keys).reshape(num_rounds, num_teams) % num_teams
+
+    positions = np.empty((num_rounds, num_teams), dtype=np.int32)
+    positions[np.arange(num_rounds)[:, None], order] = np.arange(1, num_teams + 1)
+    return positions
+
+
+def team_trajectories(standings=None):
+    """
+    Kretanje po tablici za svaki klub iz snapshotova tablice.
+    Vraća (brojevi kola, {klub: [pozicija po kolu]}).
+    """
+    standings = current_standings() if standings is None else standings
+    # Postignuti golovi kao treći kriterij, kao u Standings.table()
+    positions = rank_trajectory(standings.cumulative(), tiebreak=standings.cumulative_goals())
+    return standings.rounds[1:], {team: positions[:, i].tolist() for i, team in enumerate(standings.teams)}
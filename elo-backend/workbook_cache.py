@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from elo_history import parse_match_dates
+from jit_kernel import pool_context
+from team_registry import canonical_names
+
+# ---- CONFIG ----
+CACHE_DIR = '.cache'
+MANIFEST_FILE = 'manifest.json'
+CACHE_VERSION = 2  # bump when normalization below changes
+
+COLUMNS = ['homeTeam', 'awayTeam', 'dateOfMatch', 'homeScore', 'awayScore']
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    CACHE_FORMAT = 'pkl'
+
+
+# ---- NORMALIZATION ----
+def normalize_sheet(t, sheet_name=''):
+    """Normalizes one sheet to homeTeam, awayTeam, dateOfMatch, homeScore, awayScore (+ sheet, row)"""
+    t = t.dropna(axis=1, how='all')
+    t.columns = [str(c).strip().replace(" ", "").replace("score", "Score") for c in t.columns]
+    # Normalize headers
+    rename = {}
+    for c in t.columns:
+        if c.lower() == "hometeam": rename[c] = "homeTeam"
+        if c.lower() == "awayteam": rename[c] = "awayTeam"
+        if c.lower().startswith("date"): rename[c] = "dateOfMatch"
+        if c.lower().startswith("homescore"): rename[c] = "homeScore"
+        if c.lower().startswith("awayscore"): rename[c] = "awayScore"
+    t = t.rename(columns=rename)
+    # select, keeping the original data row so callers can slice by position in the sheet
+    t = t[COLUMNS].copy()
+    t['sheet'] = str(sheet_name)
+    t['row'] = t.index
+    t = t.dropna(how='all', subset=COLUMNS)
+    t = t[t['homeTeam'].notnull() & t['awayTeam'].notnull() & t['homeScore'].notnull() & t['awayScore'].notnull()]
+    t = t[t['homeTeam'] != 'homeTeam']
+    t = t[t['awayTeam'] != 'awayTeam']
+    return t
+
+
+def parse_workbook(path):
+    """Reads every sheet with openpyxl and returns one typed, normalized frame (slow path)"""
+    sheets = pd.read_excel(path, sheet_name=None)
+    result = pd.concat([normalize_sheet(t, name) for name, t in sheets.items()], ignore_index=True)
+    # Fix team name variants through the shared registry
+    for c in ['homeTeam', 'awayTeam']:
+        result[c] = canonical_names(result[c])
+    result['homeScore'] = pd.to_numeric(result['homeScore'], errors='coerce')
+    result['awayScore'] = pd.to_numeric(result['awayScore'], errors='coerce')
+    result = result.dropna(subset=['homeScore', 'awayScore'])
+    result['dateOfMatch'] = pd.to_datetime(parse_match_dates(result['dateOfMatch']))
+    result['row'] = result['row'].astype('int64')
+    return result.reset_index(drop=True)
+
+
+# ---- CACHE ----
+def _file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _read_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(cache_dir, manifest):
+    path = os.path.join(cache_dir, MANIFEST_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(path + '.tmp', path)
+
+
+def _cache_path(cache_dir, digest):
+    return os.path.join(cache_dir, f"workbook-{digest[:20]}-v{CACHE_VERSION}.{CACHE_FORMAT}")
+
+
+def _write_frame(df, path):
+    tmp_path = path + '.tmp'
+    if CACHE_FORMAT == 'parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _read_frame(path):
+    if CACHE_FORMAT == 'parquet':
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _lookup(path, manifest, cache_dir):
+    """Returns (cache file, digest, signature). The hash is only recomputed when mtime/size change."""
+    st = os.stat(path)
+    signature = [st.st_mtime_ns, st.st_size]
+    entry = manifest.get(os.path.abspath(path))
+    if entry and entry['signature'] == signature:
+        digest = entry['sha256']
+    else:
+        digest = _file_hash(path)
+    return _cache_path(cache_dir, digest), digest, signature
+
+
+_memory = {}
+
+
+def load_results(path, cache_dir=CACHE_DIR):
+    """
+    Fast loader for a season workbook. The first call parses the Excel file and
+    writes a normalized columnar cache keyed by content hash; later calls (and
+    later processes) read the cache, until the file's mtime/size and hash change.
+    """
+    return load_workbooks([path], cache_dir=cache_dir)[path]
+
+
+def load_workbooks(paths, cache_dir=CACHE_DIR, max_workers=None):
+    """
+    Loads several workbooks (e.g. season archives) through the cache.
+    Workbooks that are not cached yet are parsed in parallel worker processes.
+    Returns {path: frame}.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = _read_manifest(cache_dir)
+
+    frames = {}
+    missing = []
+    changed = False
+    for path in paths:
+        cache_file, digest, signature = _lookup(path, manifest, cache_dir)
+        entry = {'signature': signature, 'sha256': digest}
+        if manifest.get(os.path.abspath(path)) != entry:
+            manifest[os.path.abspath(path)] = entry
+            changed = True
+        memo = _memory.get(cache_file)
+        if memo is not None:
+            frames[path] = memo
+        elif os.path.exists(cache_file):
+            frames[path] = _memory[cache_file] = _read_frame(cache_file)
+        else:
+            missing.append((path, cache_file))
+
+    if missing:
+        # Identical archives share one cache file, parse each content once
+        unique = list({cache_file: path for path, cache_file in missing}.items())
+        if len(unique) == 1:
+            parsed = [parse_workbook(unique[0][1])]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=pool_context()) as pool:
+                parsed = list(pool.map(parse_workbook, [p for _, p in unique]))
+        for (cache_file, _), df in zip(unique, parsed):
+            _write_frame(df, cache_file)
+            _memory[cache_file] = df
+        for path, cache_file in missing:
+            frames[path] = _memory[cache_file]
+
+    if changed:
+        _write_manifest(cache_dir, manifest)
+    return {path: frames[path].copy() for path in paths}